@@ -4,18 +4,20 @@ This bot will randomly move around the map,
 use abilities and print the map to the console.
 """
 
-import os
 import random
 
 from hackathon_bot import *
 
+# Moves the cursor to the top left corner and clears the terminal
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+
 
 class ExampleBot(StereoTanksBot):
 
     grid_dimension: int
 
     def on_lobby_data_received(self, lobby_data: LobbyData) -> None:
-        print(f"Lobby data received: {lobby_data}")
+        self.logger.info("Lobby data received: %s", lobby_data)
         self.grid_dimension = lobby_data.server_settings.grid_dimension
 
     def next_move(self, game_state: GameState) -> ResponseAction:
@@ -33,42 +35,21 @@ class ExampleBot(StereoTanksBot):
         return self._get_random_action()
 
     def on_game_ended(self, game_result: GameResult) -> None:
-        print(f"Game ended: {game_result}")
+        self.logger.info("Game ended: %s", game_result)
 
     def on_warning_received(self, warning: WarningType, message: str | None) -> None:
-        print(f"Warning received: {warning} - {message}")
+        self.logger.warning("Warning received: %s - %s", warning, message)
 
     def _find_my_tank(self, game_state: GameState) -> Tank | None:
         """Finds the agent in the game state."""
-        for row in game_state.map.tiles:
-            for tile in row:
-                if tile.entities:
-                    entity = tile.entities[0]
-                    if isinstance(entity, Tank) and entity.owner_id == game_state.my_id:
-                        return entity
-        return None
+        return game_state.my_tank
 
     def _find_teammate_tank(self, game_state: GameState) -> Tank | None:
-        """Finds the agent in the game state."""
-
-        team = next(
-            t
-            for t in game_state.teams
-            if any(map(lambda x: x.id == game_state.my_id, t.players))
-        )
-
-        teammate = next((p for p in team.players if p.id != game_state.my_id), None)
-
-        if teammate is None:
+        """Finds the teammate in the game state."""
+        teammate_id = game_state.teammate_id
+        if teammate_id is None:
             return None
-
-        for row in game_state.map.tiles:
-            for tile in row:
-                if tile.entities:
-                    entity = tile.entities[0]
-                    if isinstance(entity, Tank) and entity.owner_id == teammate.id:
-                        return entity
-        return None
+        return game_state.tank_by_owner.get(teammate_id)
 
     def _get_random_action(self):
         return random.choice(
@@ -116,57 +97,65 @@ class ExampleBot(StereoTanksBot):
     def _print_map(
         self, game_map: Map, my_tank: Tank | None, teammate_tank: Tank | None
     ):
-        os.system("cls" if os.name == "nt" else "clear")
-        end = " "
+        # The map is logged as one message, which also clears the screen
+        lines = []
+
+        masks = [
+            tank.visibility
+            for tank in (my_tank, teammate_tank)
+            if tank and tank.visibility
+        ]
+        visibility = masks[0].union(*masks[1:]) if masks else None
 
         for y, row in enumerate(game_map.tiles):
+            symbols = []
             for x, tile in enumerate(row):
-                entity = tile.entities[0] if tile.entities else None
-
-                is_visible_by_my_tank = (
-                    my_tank and my_tank.visibility and my_tank.visibility[y][x]
-                )
-                is_visible_by_teammate_tank = (
-                    teammate_tank
-                    and teammate_tank.visibility
-                    and teammate_tank.visibility[y][x]
-                )
-                is_visible = is_visible_by_my_tank or is_visible_by_teammate_tank
-
-                if isinstance(entity, Wall):
-                    print("#" if entity.type is WallType.SOLID else "%", end=end)
-                elif isinstance(entity, Laser):
-                    if entity.orientation is Orientation.HORIZONTAL:
-                        print("|", end=end)
-                    elif entity.orientation is Orientation.VERTICAL:
-                        print("-", end=end)
-                elif isinstance(entity, Bullet):
-                    if entity.direction is Direction.UP:
-                        print("⇈" if entity.type is BulletType.DOUBLE else "↑", end=end)
-                    elif entity.direction is Direction.RIGHT:
-                        print("⇉" if entity.type is BulletType.DOUBLE else "→", end=end)
-                    elif entity.direction is Direction.DOWN:
-                        print("⇊" if entity.type is BulletType.DOUBLE else "↓", end=end)
-                    elif entity.direction is Direction.LEFT:
-                        print("⇇" if entity.type is BulletType.DOUBLE else "←", end=end)
-                elif isinstance(entity, Tank):
-                    if entity == my_tank:
-                        print("M", end=end)
-                    elif entity == teammate_tank:
-                        print("T", end=end)
+                is_visible = visibility is not None and visibility.is_visible(x, y)
+
+                wall = tile.wall
+                tank = tile.tank
+                bullet = tile.bullet
+                mine = tile.mine
+                laser = tile.laser
+
+                symbol = " "
+                if wall is not None:
+                    symbol = "#" if wall.type is WallType.SOLID else "%"
+                elif tank is not None:
+                    if tank == my_tank:
+                        symbol = "M"
+                    elif tank == teammate_tank:
+                        symbol = "T"
                     else:
-                        print("P", end=end)
-                elif isinstance(entity, Mine):
-                    print("x" if entity.exploded else "X", end=end)
+                        symbol = "P"
+                elif bullet is not None:
+                    if bullet.direction is Direction.UP:
+                        symbol = "⇈" if bullet.type is BulletType.DOUBLE else "↑"
+                    elif bullet.direction is Direction.RIGHT:
+                        symbol = "⇉" if bullet.type is BulletType.DOUBLE else "→"
+                    elif bullet.direction is Direction.DOWN:
+                        symbol = "⇊" if bullet.type is BulletType.DOUBLE else "↓"
+                    elif bullet.direction is Direction.LEFT:
+                        symbol = "⇇" if bullet.type is BulletType.DOUBLE else "←"
+                elif mine is not None:
+                    symbol = "x" if mine.exploded else "X"
+                elif laser is not None:
+                    if laser.orientation is Orientation.HORIZONTAL:
+                        symbol = "|"
+                    elif laser.orientation is Orientation.VERTICAL:
+                        symbol = "-"
                 elif tile.zone:
                     index = chr(tile.zone.index)
-                    index = index.upper() if is_visible else index.lower()
-                    print(index, end=end)
+                    symbol = index.upper() if is_visible else index.lower()
                 elif is_visible:
-                    print(".", end=end)
-                else:
-                    print(" ", end=end)
-            print()
+                    symbol = "."
+                symbols.append(symbol)
+            lines.append(" ".join(symbols))
+
+        # Printed on every tick, so it is not rate limited
+        self.logger.info(
+            "%s%s", CLEAR_SCREEN, "\n".join(lines), extra={"rate_limit": False}
+        )
 
 
 if __name__ == "__main__":
@@ -14,4 +14,6 @@ __version__ = "1.0.1"
 from .actions import *
 from .enums import *
 from .hackathon_bot import StereoTanksBot  # type: ignore[no-redef]
+from .log import *
 from .protocols import *
+from .state_diff import *
@@ -19,6 +19,7 @@ import sys
 from dataclasses import dataclass
 
 from .enums import TankType
+from .json_codecs import available_codecs
 
 
 @dataclass(slots=True, frozen=True)
@@ -37,6 +38,23 @@ class Arguments:
         The name of the team.
     tank_type: :class:`.TankType`
         The type of tank to use.
+    json_codec: :class:`str`
+        The name of the JSON codec to use.
+    profile: :class:`str` | None
+        The path of the collapsed stack file written by the profiler,
+        or `None` if the decisions are not profiled.
+    profile_interval: :class:`float`
+        The sampling interval of the profiler in milliseconds.
+    profile_slow_tick: :class:`float` | None
+        The shortest decision profiled in milliseconds,
+        or `None` to profile all decisions.
+    log_level: :class:`str`
+        The lowest level of the logged messages.
+    log_json: :class:`str` | None
+        The path of the file the messages are appended to as JSON lines.
+    record: :class:`str` | None
+        The path of the file the match is recorded to,
+        or `None` if the match is not recorded.
     """
 
     host: str
@@ -44,6 +62,13 @@ class Arguments:
     code: str | None
     team_name: str
     tank_type: TankType
+    json_codec: str = "auto"
+    profile: str | None = None
+    profile_interval: float = 5.0
+    profile_slow_tick: float | None = None
+    log_level: str = "INFO"
+    log_json: str | None = None
+    record: str | None = None
 
 
 def _tank_type_from_string(value: str) -> TankType:
@@ -109,6 +134,62 @@ def get_args() -> Arguments:
         help="Tank type (required) [LIGHT or HEAVY]",
     )
 
+    parser.add_argument(
+        "--json-codec",
+        type=str,
+        choices=("auto", *available_codecs()),
+        default="auto",
+        help="JSON codec to use (default: auto, the fastest available)",
+    )
+
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Profile the decisions and write the collapsed stacks to PATH",
+    )
+
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=5.0,
+        metavar="MS",
+        help="Sampling interval of the profiler in milliseconds (default: 5)",
+    )
+
+    parser.add_argument(
+        "--profile-slow-tick",
+        type=float,
+        default=None,
+        metavar="MS",
+        help="Profile only the decisions that take at least MS milliseconds",
+    )
+
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+        default="INFO",
+        help="Lowest level of the logged messages (default: INFO)",
+    )
+
+    parser.add_argument(
+        "--log-json",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Also append the logged messages to PATH as JSON lines",
+    )
+
+    parser.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Record the received and sent frames of the match to PATH",
+    )
+
     try:
         args = parser.parse_args()
     except SystemExit:
@@ -121,4 +202,11 @@ def get_args() -> Arguments:
         code=args.code,
         team_name=args.team_name,
         tank_type=args.tank_type,
+        json_codec=args.json_codec,
+        profile=args.profile,
+        profile_interval=args.profile_interval,
+        profile_slow_tick=args.profile_slow_tick,
+        log_level=args.log_level,
+        log_json=args.log_json,
+        record=args.record,
     )
@@ -0,0 +1,231 @@
+"""This module contains the NumPy array view of the game state.
+
+The array view represents each layer of the map as a compact grid,
+so neighbourhood scans, ray walks and distance computations can be
+vectorized instead of looping over the tiles.
+
+NumPy is an optional dependency of the library.
+It must be installed to use this module.
+
+Classes
+-------
+MapArrays
+    Represents the layers of the map as NumPy arrays.
+
+Examples
+--------
+::
+
+    arrays = game_state.as_arrays()
+    x, y = game_state.position_of(game_state.my_id)
+
+    # Tiles around the tank with a wall
+    arrays.neighbourhood(arrays.walls, x, y) >= 0
+
+    # Tiles in the line of fire of the turret
+    xs, ys = arrays.ray(x, y, game_state.my_tank.turret.direction)
+    enemies = arrays.tanks[ys, xs]
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "NumPy is required for the array view of the map. "
+        "Install it with `pip install numpy`."
+    ) from e
+
+from .enums import Direction, WallType
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from .models import GameStateModel, ZoneGrid
+
+__all__ = ("MapArrays",)
+
+_EMPTY = -1
+
+
+def _zones_array(zone_grid: ZoneGrid) -> NDArray[np.int8]:
+    """Returns the zones array, kept on the grid that is reused during a game."""
+    # pylint: disable=protected-access
+    array = zone_grid._array
+    if array is None:
+        array = np.array(zone_grid.cells, dtype=np.int8).reshape(
+            zone_grid.height, zone_grid.width
+        )
+        array.flags.writeable = False
+        object.__setattr__(zone_grid, "_array", array)
+    return array
+
+
+def _walls_layer(
+    game_state: GameStateModel, shape: tuple[int, int]
+) -> NDArray[np.int8]:
+    """Creates the walls layer from the tiles, since walls are not indexed."""
+    walls = [
+        (x, y, wall.type)
+        for y, row in enumerate(game_state.map.tiles)
+        for x, tile in enumerate(row)
+        if (wall := tile.wall) is not None
+    ]
+    return _layer(shape, walls)
+
+
+def _layer(
+    shape: tuple[int, int], items: list[tuple[int, int, int]]
+) -> NDArray[np.int8]:
+    """Creates a layer filled with the (x, y, value) items."""
+    layer = np.full(shape, _EMPTY, dtype=np.int8)
+    if items:
+        xs, ys, values = zip(*items)
+        layer[ys, xs] = values
+    return layer
+
+
+@dataclass(slots=True, frozen=True)
+class MapArrays:  # pylint: disable=too-many-instance-attributes
+    """Represents the layers of the map as NumPy arrays.
+
+    All grids are indexed as `[y, x]`. Empty tiles are `-1`.
+
+    Attributes
+    ----------
+    owners: tuple[:class:`str`, ...]
+        The player IDs by their tank slots.
+    walls: NDArray[int8]
+        The :class:`WallType` of the walls.
+    tanks: NDArray[int8]
+        The slots of the tank owners (see `owners`).
+    tank_directions: NDArray[int8]
+        The :class:`Direction` of the tanks.
+    bullets: NDArray[int8]
+        The :class:`Direction` of the bullets.
+    bullet_types: NDArray[int8]
+        The :class:`BulletType` of the bullets.
+    mines: NDArray[int8]
+        `0` for armed mines and `1` for exploded mines.
+    lasers: NDArray[int8]
+        The :class:`Orientation` of the lasers.
+    zones: NDArray[int8]
+        The positions of the zones in `Map.zones`. This array is read-only.
+    visibility: NDArray[bool]
+        The visibility of each tank by its slot, indexed as `[slot, y, x]`.
+        It is `False` everywhere for the tanks with unknown visibility.
+    """
+
+    owners: tuple[str, ...]
+    walls: NDArray[np.int8]
+    tanks: NDArray[np.int8]
+    tank_directions: NDArray[np.int8]
+    bullets: NDArray[np.int8]
+    bullet_types: NDArray[np.int8]
+    mines: NDArray[np.int8]
+    lasers: NDArray[np.int8]
+    zones: NDArray[np.int8]
+    visibility: NDArray[np.bool_]
+
+    @classmethod
+    def from_game_state(cls, game_state: GameStateModel) -> MapArrays:
+        """Creates the array view from the entity index of a game state.
+
+        The walls are not in the index, so their layer is built
+        from the tiles. On a lazy map, this builds all tiles.
+        """
+        index = game_state.map.index
+        zone_grid = game_state.map.zone_grid
+        shape = (zone_grid.height, zone_grid.width)
+
+        owners = [p.id for t in game_state.teams for p in t.players]
+        owners += [o for o in index.tanks if o not in owners]
+        slots = {o: i for i, o in enumerate(owners)}
+
+        tanks = [(*index.positions[o], slots[o]) for o in index.tanks]
+        directions = [(*index.positions[o], t.direction) for o, t in index.tanks.items()]
+
+        visibility = np.zeros((len(owners), *shape), dtype=np.bool_)
+        for owner_id, tank in index.tanks.items():
+            if tank.visibility is not None:
+                visibility[slots[owner_id]] = tank.visibility.to_numpy()
+
+        return cls(
+            owners=tuple(owners),
+            walls=_walls_layer(game_state, shape),
+            tanks=_layer(shape, tanks),
+            tank_directions=_layer(shape, directions),
+            bullets=_layer(shape, [(x, y, b.direction) for x, y, b in index.bullets]),
+            bullet_types=_layer(shape, [(x, y, b.type) for x, y, b in index.bullets]),
+            mines=_layer(shape, [(x, y, m.exploded) for x, y, m in index.mines]),
+            lasers=_layer(shape, [(x, y, l.orientation) for x, y, l in index.lasers]),
+            zones=_zones_array(zone_grid),
+            visibility=visibility,
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """The (height, width) of the map."""
+        return self.walls.shape  # type: ignore[return-value]
+
+    def slot_of(self, owner_id: str) -> int:
+        """Returns the tank slot of the player."""
+        return self.owners.index(owner_id)
+
+    def manhattan_distances(self, x: int, y: int) -> NDArray[np.int_]:
+        """Returns the Manhattan distances from the (x, y) tile to every tile."""
+        ys, xs = np.ogrid[: self.shape[0], : self.shape[1]]
+        return np.abs(ys - y) + np.abs(xs - x)
+
+    def neighbourhood(
+        self, layer: NDArray[np.generic], x: int, y: int, radius: int = 1
+    ) -> NDArray[np.generic]:
+        """Returns a view of the layer around the (x, y) tile.
+
+        The view is clipped at the edges of the map.
+        """
+        return layer[
+            max(y - radius, 0) : y + radius + 1,
+            max(x - radius, 0) : x + radius + 1,
+        ]
+
+    def ray(
+        self, x: int, y: int, direction: Direction
+    ) -> tuple[NDArray[np.int_], NDArray[np.int_]]:
+        """Returns the tiles from the (x, y) tile in the given direction.
+
+        The ray starts at the next tile and ends before
+        the first solid wall or at the edge of the map.
+
+        Returns
+        -------
+        tuple[NDArray, NDArray]
+            The x and y coordinates of the tiles, in order.
+        """
+        height, width = self.shape
+        if direction == Direction.UP:
+            ys = np.arange(y - 1, -1, -1)
+            xs = np.full(ys.shape, x)
+        elif direction == Direction.DOWN:
+            ys = np.arange(y + 1, height)
+            xs = np.full(ys.shape, x)
+        elif direction == Direction.LEFT:
+            xs = np.arange(x - 1, -1, -1)
+            ys = np.full(xs.shape, y)
+        else:
+            xs = np.arange(x + 1, width)
+            ys = np.full(xs.shape, y)
+
+        solid = self.walls[ys, xs] == WallType.SOLID
+        if solid.any():
+            end = int(solid.argmax())
+            xs, ys = xs[:end], ys[:end]
+        return xs, ys
+
+    def visible_to(self, *owner_ids: str) -> NDArray[np.bool_]:
+        """Returns the union of the visibility of the given tanks."""
+        return self.visibility[[self.slot_of(o) for o in owner_ids]].any(axis=0)
@@ -0,0 +1,214 @@
+"""A micro-benchmark comparing the JSON codecs on GAME_STATE frames.
+
+The frames are read from files containing one recorded frame per line.
+If no files are given, a synthetic frame is generated
+for the requested grid dimension.
+
+Examples
+--------
+Compare all codecs available on this host on recorded frames:
+
+::
+
+    python -m hackathon_bot.codec_benchmark frames.jsonl
+
+Compare the codecs on a synthetic 50x50 map:
+
+::
+
+    python -m hackathon_bot.codec_benchmark --grid-dimension 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Any
+
+from .enums import PacketType
+from .json_codecs import JsonCodec, available_codecs, get_codec
+from .models import GameStateModel
+
+
+def synthetic_frame(grid_dimension: int, seed: int = 0) -> bytes:
+    """Generates a synthetic GAME_STATE frame.
+
+    The map contains walls on about a fifth of the tiles,
+    four tanks with visibility masks and a few bullets.
+    """
+
+    rng = random.Random(seed)
+    tiles: list[list[list[dict[str, Any]]]] = [
+        [[] for _ in range(grid_dimension)] for _ in range(grid_dimension)
+    ]
+
+    for column in tiles:
+        for tile in column:
+            if rng.random() < 0.2:
+                tile.append({"type": "wall", "payload": {"type": rng.randint(0, 1)}})
+
+    visibility = [
+        "".join(rng.choice("01") for _ in range(grid_dimension))
+        for _ in range(grid_dimension)
+    ]
+
+    for i in range(4):
+        tiles[rng.randrange(grid_dimension)][rng.randrange(grid_dimension)] = [
+            {
+                "type": "tank",
+                "payload": {
+                    "ownerId": f"player-{i}",
+                    "type": i % 2,
+                    "direction": rng.randint(0, 3),
+                    "turret": {"direction": rng.randint(0, 3), "bulletCount": 3},
+                    "health": 100,
+                    "visibility": visibility,
+                },
+            }
+        ]
+
+    for i in range(grid_dimension // 2):
+        tiles[rng.randrange(grid_dimension)][rng.randrange(grid_dimension)] = [
+            {
+                "type": "bullet",
+                "payload": {"id": i, "speed": 2, "direction": rng.randint(0, 3), "type": 0},
+            }
+        ]
+
+    zone_size = max(grid_dimension // 5, 1)
+    zone_start = (grid_dimension - zone_size) // 2
+    packet = {
+        "type": PacketType.GAME_STATE.value,
+        "payload": {
+            "id": "synthetic",
+            "tick": 1,
+            "playerId": "player-0",
+            "teams": [
+                {
+                    "name": f"team-{t}",
+                    "color": t,
+                    "players": [
+                        {"id": f"player-{t * 2 + p}", "ping": 0} for p in range(2)
+                    ],
+                }
+                for t in range(2)
+            ],
+            "map": {
+                "tiles": tiles,
+                "zones": [
+                    {
+                        "x": zone_start,
+                        "y": zone_start,
+                        "width": zone_size,
+                        "height": zone_size,
+                        "index": 65,
+                        "shares": {},
+                    }
+                ],
+            },
+        },
+    }
+
+    return json.dumps(packet).encode()
+
+
+def load_frames(paths: list[str]) -> list[bytes]:
+    """Loads the GAME_STATE frames from files with one frame per line."""
+
+    frames = []
+    for path in paths:
+        with open(path, "rb") as file:
+            for line in file:
+                line = line.strip()
+                if line and json.loads(line)["type"] == PacketType.GAME_STATE:
+                    frames.append(line)
+    return frames
+
+
+def _measure(func: Any, frames: list[Any], repeat: int) -> float:
+    """Returns the best mean time per frame in microseconds."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            func(frame)
+        best = min(best, (time.perf_counter() - start) / len(frames))
+    return best * 1e6
+
+
+def benchmark(codec: JsonCodec, frames: list[bytes], repeat: int) -> dict[str, float]:
+    """Benchmarks a codec on the given frames.
+
+    Returns
+    -------
+    dict[str, float]
+        The best mean time per frame in microseconds for decoding,
+        decoding with building the models, and encoding an action packet.
+    """
+
+    # Frames are given to the codec as they would come from the websocket
+    inputs = frames if codec.decodes_bytes else [f.decode() for f in frames]
+    action = {
+        "type": PacketType.MOVEMENT.value,
+        "payload": {"gameStateId": "synthetic", "direction": 0},
+    }
+
+    return {
+        "loads": _measure(codec.loads, inputs, repeat),
+        "loads+models": _measure(
+            lambda f: GameStateModel.from_json(codec.loads(f)["payload"]),
+            inputs,
+            repeat,
+        ),
+        "dumps": _measure(codec.dumps, [action] * len(frames), repeat),
+    }
+
+
+def main() -> None:
+    """Runs the benchmark from the command line."""
+
+    parser = argparse.ArgumentParser(description="JSON codec micro-benchmark")
+    parser.add_argument(
+        "frames",
+        nargs="*",
+        help="Files with one recorded frame per line (default: synthetic frame)",
+    )
+    parser.add_argument(
+        "-g",
+        "--grid-dimension",
+        type=int,
+        default=20,
+        help="Grid dimension of the synthetic frame (default: 20)",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=20,
+        help="Number of repetitions, the best one is reported (default: 20)",
+    )
+    args = parser.parse_args()
+
+    if args.frames:
+        frames = load_frames(args.frames)
+    else:
+        frames = [synthetic_frame(args.grid_dimension)]
+
+    if not frames:
+        parser.error("No GAME_STATE frames found")
+
+    print(f"{len(frames)} frame(s), mean size {sum(map(len, frames)) // len(frames)} B")
+    print(f"{'codec':<10}{'loads':>12}{'loads+models':>16}{'dumps':>12}  (us/frame)")
+    for name in available_codecs():
+        results = benchmark(get_codec(name), frames, args.repeat)
+        print(
+            f"{name:<10}{results['loads']:>12.1f}"
+            f"{results['loads+models']:>16.1f}{results['dumps']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""This module contains the helpers for the decision deadlines.
+
+The deadline of a decision is the time the game state was received
+plus the broadcast interval of the server, minus a safety margin.
+The margin includes the measured latency of sending a response,
+so the response sent at the deadline still reaches the server in time.
+
+Classes
+-------
+LatencyEstimator
+    Estimates an upper bound of the send latency.
+"""
+
+from __future__ import annotations
+
+__all__ = ("LatencyEstimator",)
+
+
+class LatencyEstimator:
+    """Estimates an upper bound of the send latency.
+
+    The estimate is the smoothed latency plus four times its smoothed
+    deviation, the same as the retransmission timeout of TCP.
+
+    Attributes
+    ----------
+    smoothed: :class:`float`
+        The smoothed latency in seconds.
+    deviation: :class:`float`
+        The smoothed deviation of the latency in seconds.
+    """
+
+    __slots__ = ("smoothed", "deviation", "_samples")
+
+    # Weights of the new sample, as recommended in RFC 6298
+    _ALPHA = 1 / 8
+    _BETA = 1 / 4
+
+    def __init__(self) -> None:
+        self.smoothed = 0.0
+        self.deviation = 0.0
+        self._samples = 0
+
+    @property
+    def estimate(self) -> float:
+        """The estimated upper bound of the latency in seconds."""
+        return self.smoothed + 4 * self.deviation
+
+    def update(self, sample: float) -> None:
+        """Updates the estimate with a measured latency in seconds."""
+        if self._samples == 0:
+            self.smoothed = sample
+            self.deviation = sample / 2
+        else:
+            self.deviation += self._BETA * (abs(self.smoothed - sample) - self.deviation)
+            self.smoothed += self._ALPHA * (sample - self.smoothed)
+        self._samples += 1
@@ -0,0 +1,52 @@
+"""This module contains the decoder of the game state packets.
+
+The decoder keeps the data that does not change during a game
+and reuses it when decoding the following game states.
+
+Classes
+-------
+GameStateDecoder
+    Decodes GAME_STATE payloads into game state models.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .models import GameStateModel, TileModel, ZoneGrid
+
+
+class GameStateDecoder:
+    """Decodes GAME_STATE payloads into game state models.
+
+    Attributes
+    ----------
+    lazy: :class:`bool`
+        Whether the tiles of the map are built only when accessed.
+    """
+
+    __slots__ = ("lazy", "_zone_grid", "_wall_tiles")
+
+    def __init__(self, lazy: bool = False) -> None:
+        self.lazy = lazy
+        self._zone_grid: ZoneGrid | None = None
+        self._wall_tiles: dict[int, TileModel] = {}
+
+    def reset(self) -> None:
+        """Clears the data cached from the previous game."""
+        self._zone_grid = None
+        self._wall_tiles = {}
+
+    def decode(self, json_data: dict[str, Any]) -> GameStateModel:
+        """Creates a game state from a camelCase GAME_STATE payload.
+
+        The static wall layer is cached on the first game state
+        and its tiles are reused by the following ones. The payload
+        of each game state is still the source of truth, so a tile
+        is rebuilt whenever it no longer has the same single wall.
+        """
+        game_state = GameStateModel.from_json(
+            json_data, self.lazy, self._zone_grid, self._wall_tiles
+        )
+        self._zone_grid = game_state.map.zone_grid
+        return game_state
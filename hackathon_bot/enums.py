@@ -22,6 +22,12 @@ PacketType
     Represents a type of a packet.
 WarningType
     Represents a type of a warning.
+EntityKind
+    Represents a kind of an entity on the tile.
+MailboxPolicy
+    Represents a policy for the game states waiting for a decision.
+FrameDirection
+    Represents a direction of a recorded frame.
 """
 
 from enum import IntEnum
@@ -37,6 +43,9 @@ __all__ = (
     "WarningType",
     "WallType",
     "BulletType",
+    "EntityKind",
+    "MailboxPolicy",
+    "FrameDirection",
 )
 
 
@@ -158,6 +167,33 @@ class BulletType(IntEnum):
     STUN = 3
 
 
+class EntityKind(IntEnum):
+    """Represents a kind of an entity on the tile.
+
+    Each entity model has the `kind` class attribute,
+    so its kind can be checked with a single comparison.
+
+    Attributes
+    ----------
+    TANK: :class:`int`
+        Represents a tank.
+    WALL: :class:`int`
+        Represents a wall.
+    BULLET: :class:`int`
+        Represents a bullet.
+    LASER: :class:`int`
+        Represents a laser.
+    MINE: :class:`int`
+        Represents a mine.
+    """
+
+    TANK = 0
+    WALL = 1
+    BULLET = 2
+    LASER = 3
+    MINE = 4
+
+
 class Ability(IntEnum):
     """Represents an ability.
 
@@ -334,3 +370,40 @@ class WarningType(IntEnum):
     PLAYER_ALREADY_MADE_ACTION = PacketType.PLAYER_ALREADY_MADE_ACTION_WARNING
     ACTION_IGNORED_DUE_TO_DEAD = PacketType.ACTION_IGNORED_DUE_TO_DEAD_WARNING
     SLOW_RESPONSE = PacketType.SLOW_RESPONSE_WARNING
+
+
+class MailboxPolicy(IntEnum):
+    """Represents a policy for the game states waiting for a decision.
+
+    The policy decides what happens to a game state
+    that arrives while the previous one is still processed.
+
+    Attributes
+    ----------
+    LATEST_WINS: :class:`int`
+        Only the newest waiting game state is kept.
+        The older waiting one is superseded.
+    QUEUE: :class:`int`
+        All game states are processed in order.
+    DROP_IF_BUSY: :class:`int`
+        The game state is dropped if another one is processed or waiting.
+    """
+
+    LATEST_WINS = 0
+    QUEUE = 1
+    DROP_IF_BUSY = 2
+
+
+class FrameDirection(IntEnum):
+    """Represents a direction of a recorded frame.
+
+    Attributes
+    ----------
+    RECEIVED: :class:`int`
+        The frame was received from the server.
+    SENT: :class:`int`
+        The frame was sent to the server.
+    """
+
+    RECEIVED = 0
+    SENT = 1
@@ -37,32 +37,46 @@ Then, create an instance of the bot and run it using the `run` method.
 """
 
 import asyncio
-import json
-import threading
-import traceback
+import functools
+import inspect
+import logging
+import time
 from abc import ABC, abstractmethod
-from dataclasses import asdict
-from typing import Any, final
+from typing import Any, Awaitable, Callable, final
 
 import humps
 import websockets
-from websockets import WebSocketClientProtocol as WebSocket
+from websockets.asyncio.client import ClientConnection as WebSocket
+from websockets.asyncio.client import connect
 
 from . import argparser
 from .actions import Pass, ResponseAction
-from .enums import PacketType, WarningType
+from .deadline import LatencyEstimator
+from .decoder import GameStateDecoder
+from .enums import MailboxPolicy, PacketType, WarningType
+from .json_codecs import JsonCodec, StdlibJsonCodec, get_codec
+from .latency import LatencyTracker, TickTimestamps
+from .log import get_logger, setup_logging
 from .models import GameResultModel, GameStateModel, LobbyDataModel
+from .packets import coalesce_game_states, has_buffered_message, peek_packet_type
 from .payloads import (
     ConnectionRejectedPayload,
     GameEndPayload,
-    GameStatePayload,
     LobbyDataPayload,
     Payload,
 )
+from .process_worker import DecisionProcess
+from .profiler import SamplingProfiler
+from .recorder import MatchRecorder
 from .protocols import GameResult, GameState, LobbyData
+from .serializers import PacketSerializer
+from .state_diff import StateDiff
+from .worker import AsyncDecisionWorker, DecisionWorker
 
 __all__ = ("StereoTanksBot",)
 
+_logger = logging.getLogger(__name__)
+
 
 class StereoTanksBot(ABC):
     """Represents the hackathon bot.
@@ -118,11 +132,154 @@ class StereoTanksBot(ABC):
                 print("The game is starting.")
                 print("We are ready to go!")
                 # See method documentation for more information
+
+    If your bot only looks at a small part of the map each tick,
+    you can enable the lazy map mode. The tiles are then built
+    only when they are accessed, which makes each tick cheaper.
+    The tank, bullet, mine and laser lookups still scan the whole
+    map once, on their first use in a tick.
+
+    ::
+
+        class MyBot(StereoTanksBot):
+
+            lazy_map = True
+
+    To react to the changes between consecutive game states,
+    attach a :class:`StateDiff` and subscribe to its events.
+    It is updated with every game state before `next_move` is called.
+
+    ::
+
+        class MyBot(StereoTanksBot):
+
+            def __init__(self) -> None:
+                self.state_diff = StateDiff()
+                self.state_diff.subscribe(TankMoved, self.on_tank_moved)
+
+    The game states are processed one at a time by a decision worker.
+    If a game state arrives while `next_move` is still running,
+    it waits in a mailbox. By default only the newest waiting
+    game state is kept, which can be changed with `mailbox_policy`.
+
+    ::
+
+        class MyBot(StereoTanksBot):
+
+            # Process every game state in order
+            mailbox_policy = MailboxPolicy.QUEUE
+
+    If `next_move` is CPU-heavy, enable the process mode.
+    The bot then runs in a separate process, so it does not block
+    the connection with the server. Its attributes persist across
+    the ticks, but they are not shared with the main process.
+    The callbacks other than `next_move` run in that process too.
+    The process is started with `spawn` from a pickled copy of the bot,
+    so the bot must be picklable and its script must start it under
+    `if __name__ == "__main__"`, as `main.py` does.
+
+    ::
+
+        class MyBot(StereoTanksBot):
+
+            process_mode = True
+
+    The callbacks can also be coroutines. They are then awaited
+    on the event loop of the bot instead of running on a thread,
+    so the bot can overlap its own I/O with the other work.
+
+    ::
+
+        class MyBot(StereoTanksBot):
+
+            async def next_move(self, game_state: GameState) -> ResponseAction:
+                hint = await self.model_client.ask(game_state.tick)
+                return Movement(hint)
+
+    Do not block the event loop in a coroutine callback,
+    use a regular method for CPU-heavy work instead.
+
+    The `next_move` method can check how much time is left
+    before the deadline with `time_remaining`. An anytime search
+    can publish its best action so far with `propose`. If `next_move`
+    has not returned by the deadline, the proposed action is sent,
+    or the `deadline_fallback` action if nothing was proposed.
+
+    ::
+
+        class MyBot(StereoTanksBot):
+
+            def next_move(self, game_state: GameState) -> ResponseAction:
+                depth = 1
+                while self.time_remaining() > 0.01:
+                    self.propose(self.search(game_state, depth))
+                    depth += 1
+                return self.search(game_state, depth)
+
+    To find out which stage of a decision is slow, enable
+    the latency tracking. The time spent receiving, parsing,
+    building the models, in `next_move`, encoding and sending
+    is then summarized every `latency_report_interval` decisions
+    and at the end of the game.
+
+    ::
+
+        class MyBot(StereoTanksBot):
+
+            track_latency = True
+            latency_report_interval = 100
+
+    Use `logger` instead of `print` in the callbacks. The messages
+    are written by a background thread, so logging does not slow
+    down the decisions, and repeated messages are rate limited,
+    unless they are logged with `extra={"rate_limit": False}`.
+
+    ::
+
+        class MyBot(StereoTanksBot):
+
+            def on_warning_received(self, warning: WarningType, message: str | None) -> None:
+                self.logger.warning("Warning received: %s - %s", warning, message)
     """
 
+    lazy_map: bool = False
+    state_diff: StateDiff | None = None
+    mailbox_policy: MailboxPolicy = MailboxPolicy.LATEST_WINS
+    process_mode: bool = False
+    safety_margin: float = 0.01
+    deadline_fallback: ResponseAction | None = None
+    track_latency: bool = False
+    latency_report_interval: int = 0
+    logger: logging.Logger = get_logger("bot")
+
     _lobby_data: LobbyDataModel = None  # type: ignore[assignment]
-    _is_processing: bool = False
+    _worker: DecisionWorker[Any] | AsyncDecisionWorker[Any] | None = None
+    _process: DecisionProcess | None = None
     _loop: asyncio.AbstractEventLoop
+    _codec: JsonCodec = StdlibJsonCodec()
+    _serializer: PacketSerializer = PacketSerializer(_codec)
+    _decoder: GameStateDecoder | None = None
+    _send_latency: LatencyEstimator
+    _deadline_timers: dict[int, asyncio.TimerHandle]
+    _sent_at_deadline: set[int]
+    _deadline: float | None = None
+    _game_state_id: str | None = None
+    _received_game_states: int = 0
+    _decoded: tuple[int, str] | None = None
+    _provisional: tuple[int, str] | None = None
+    _provisional_sink: Callable[[str], None] | None = None
+    _control_handlers: dict[int, Callable[[WebSocket, websockets.Data], Awaitable[None]]]
+    _stale_game_states: int = 0
+    _latency: LatencyTracker | None = None
+    _timestamps: TickTimestamps | None = None
+    _profile_path: str | None = None
+    _profile_interval: float = 0.005
+    _profile_slow_tick: float | None = None
+    _profiler: SamplingProfiler | None = None
+    _record_path: str | None = None
+    _recorder: MatchRecorder | None = None
+    _log_level: str = "INFO"
+    _log_json: str | None = None
 
     def _get_server_url(self, args: argparser.Arguments) -> str:
         url = (
@@ -193,6 +350,9 @@ class StereoTanksBot(ABC):
         Notes
         -----
         If the method returns `None`, the bot will respond with `Pass` action.
+
+        The method can be defined with `async def`. It is then awaited on the
+        event loop of the bot and must not block it.
         """
 
     @abstractmethod
@@ -228,7 +388,7 @@ class StereoTanksBot(ABC):
         finishing the game start process. Therefore, it is recommended to keep
         this method as short as possible.
 
-        By default, this method prints a message that the game is starting.
+        By default, this method logs a message that the game is starting.
 
         This method is not called when joining a game running in sandbox mode.
 
@@ -250,7 +410,44 @@ class StereoTanksBot(ABC):
                     print("I am ready to fight!")
         """
 
-        print("The game is starting...")
+        self.logger.info("The game is starting...")
+
+    @property
+    def deadline(self) -> float | None:
+        """The deadline of the current decision.
+
+        It is a :func:`time.monotonic` timestamp, already reduced
+        by the safety margin. It is `None` if the broadcast
+        interval of the server is not known yet.
+        """
+        return self._deadline
+
+    @final
+    def time_remaining(self) -> float:
+        """Returns the seconds left before the deadline of the current decision.
+
+        Returns infinity if the deadline is not known.
+        """
+        if self._deadline is None:
+            return float("inf")
+        return max(self._deadline - time.monotonic(), 0.0)
+
+    @final
+    def propose(self, response_action: ResponseAction) -> None:
+        """Publishes the best response action found so far.
+
+        If `next_move` does not return before the deadline,
+        the last proposed action is sent instead.
+        It can be called from `next_move` any number of times.
+        """
+        game_state_id = self._game_state_id
+        if game_state_id is None:
+            return
+        packet = self._serializer.encode_action(response_action, game_state_id)
+        if self._provisional_sink is not None:
+            self._provisional_sink(packet)
+        elif self._decoded is not None:
+            self._provisional = (self._decoded[0], packet)
 
     @final
     async def _send_packet(
@@ -259,57 +456,351 @@ class StereoTanksBot(ABC):
         packet_type: PacketType,
         payload: Payload | None = None,
     ):
-        packet: dict[str, Any] = {"type": packet_type.value}
+        await self._send_frame(websocket, self._serializer.encode(packet_type, payload))
 
-        if payload is not None:
-            packet["payload"] = humps.camelize(asdict(payload))
+    @final
+    async def _send_frame(self, websocket: WebSocket, frame: str) -> None:
+        await websocket.send(frame)
+        if self._recorder is not None:
+            self._recorder.record_sent(frame)
 
-        await websocket.send(json.dumps(packet))
+    @final
+    async def _handle_ping_packet(
+        self, websocket: WebSocket, _message: websockets.Data
+    ) -> None:
+        # The PONG packet is encoded once by the serializer
+        await self._send_frame(websocket, self._serializer.encode(PacketType.PONG))
 
     @final
-    def _handle_ping_packet(self, websocket: WebSocket) -> None:
-        asyncio.run_coroutine_threadsafe(
-            self._send_packet(websocket, PacketType.PONG),
-            self._loop,
-        )
+    def _begin_profiled_tick(self) -> None:
+        """Starts profiling a decision on the current thread, if enabled."""
+        if self._profile_path is None:
+            return
+        if self._profiler is None:
+            # Created where the decisions are made, also in the decision process
+            self._profiler = SamplingProfiler(
+                self._profile_interval, self._profile_slow_tick
+            )
+            self._profiler.start()
+        self._profiler.begin_tick()
 
     @final
-    def _handle_next_move(
-        self, websocket: WebSocket, game_state: GameStateModel
-    ) -> None:
-        if self._is_processing:
-            print("Skipping next game state due to ongoing processing!")
+    def _end_profiled_tick(self) -> None:
+        if self._profiler is not None:
+            self._profiler.end_tick()
+
+    @final
+    def _write_profile(self) -> None:
+        """Writes the profile of the game and starts a new one."""
+        if self._profiler is None or self._profile_path is None:
             return
+        try:
+            self._profiler.write(self._profile_path)
+        except OSError as e:
+            _logger.error("Could not write the profile: %s", e)
+        else:
+            _logger.info("Profile written to %s", self._profile_path)
+        _logger.info("%s", self._profiler.summary())
+        self._profiler.reset()
 
-        self._is_processing = True
+    @final
+    def _decode_game_state(self, message: websockets.Data) -> GameStateModel:
+        """Decodes a GAME_STATE frame, off the event loop."""
+        if self._decoder is None:
+            self._decoder = GameStateDecoder(self.lazy_map)
+        timestamps = self._timestamps
+        data = self._codec.loads(message)
+        if timestamps is not None:
+            timestamps.parsed = time.monotonic()
+        game_state = self._decoder.decode(data["payload"])
+        if timestamps is not None:
+            timestamps.built = time.monotonic()
+        return game_state
 
+    @final
+    def _decide(
+        self, game_state: GameStateModel, deadline: float | None = None
+    ) -> str | None:
+        """Returns the encoded response action to the game state."""
         try:
+            self._prepare_decision(game_state, deadline)
             response_action = self.next_move(game_state)  # type: ignore[assignment]
         except KeyboardInterrupt as e:
             raise e
         except Exception as e:  # pylint: disable=broad-except
-            print(f"An error occurred during next move: {e}")
-            print(traceback.format_exc())
-            return
-        finally:
-            self._is_processing = False
+            self._log_decision_error(e)
+            return None
+        return self._finish_decision(response_action, game_state)
 
-        if response_action is None:  # type: ignore[assignment]
+    @final
+    async def _decide_async(
+        self, game_state: GameStateModel, deadline: float | None = None
+    ) -> str | None:
+        """Returns the encoded response action of the `async def` next move."""
+        try:
+            self._prepare_decision(game_state, deadline)
+            response_action = await self.next_move(game_state)  # type: ignore[misc]
+        except KeyboardInterrupt as e:
+            raise e
+        except Exception as e:  # pylint: disable=broad-except
+            self._log_decision_error(e)
+            return None
+        return self._finish_decision(response_action, game_state)
+
+    @final
+    def _prepare_decision(
+        self, game_state: GameStateModel, deadline: float | None
+    ) -> None:
+        """Updates the state before `next_move` is called."""
+        self._deadline = deadline
+        self._game_state_id = game_state.id
+        if self.state_diff is not None:
+            self.state_diff.update(game_state)
+        if self._timestamps is not None:
+            self._timestamps.started = time.monotonic()
+
+    @final
+    def _log_decision_error(self, error: Exception) -> None:
+        _logger.exception("An error occurred during next move: %s", error)
+
+    @final
+    def _finish_decision(
+        self, response_action: ResponseAction | None, game_state: GameStateModel
+    ) -> str:
+        """Encodes the response action returned by `next_move`."""
+        timestamps = self._timestamps
+        if timestamps is None:
+            return self._encode_response_action(response_action, game_state)
+        timestamps.finished = time.monotonic()
+        packet = self._encode_response_action(response_action, game_state)
+        timestamps.encoded = time.monotonic()
+        return packet
+
+    @final
+    def _encode_response_action(
+        self, response_action: ResponseAction | None, game_state: GameStateModel
+    ) -> str:
+        if response_action is None:
             response_action = Pass()
+        return self._serializer.encode_action(response_action, game_state.id)
 
-        payload = response_action.to_payload(game_state.id)
-        asyncio.run_coroutine_threadsafe(
-            self._send_packet(websocket, response_action.packet_type, payload),
-            self._loop,
-        )
+    @final
+    def _handle_next_move(
+        self,
+        websocket: WebSocket,
+        item: tuple[websockets.Data, int, float | None, TickTimestamps | None],
+    ) -> None:
+        message, sequence, deadline, timestamps = item
+        self._timestamps = timestamps
+        if timestamps is not None:
+            timestamps.dequeued = time.monotonic()
+        packet = None
+        self._begin_profiled_tick()
+        try:
+            game_state = self._decode_game_state(message)
+            self._decoded = (sequence, game_state.id)
+            packet = self._decide(game_state, deadline)
+        finally:
+            self._end_profiled_tick()
+            self._loop.call_soon_threadsafe(
+                self._complete_decision,
+                websocket,
+                sequence,
+                packet,
+                time.monotonic(),
+                timestamps,
+            )
 
     @final
-    def _send_ready_to_receive_game_state(self, websocket: WebSocket) -> None:
-        asyncio.run_coroutine_threadsafe(
-            self._send_packet(websocket, PacketType.READY_TO_RECEIVE_GAME_STATE),
-            self._loop,
+    async def _handle_next_move_async(
+        self,
+        websocket: WebSocket,
+        item: tuple[websockets.Data, int, float | None, TickTimestamps | None],
+    ) -> None:
+        message, sequence, deadline, timestamps = item
+        self._timestamps = timestamps
+        if timestamps is not None:
+            timestamps.dequeued = time.monotonic()
+        packet = None
+        try:
+            # Decoded in a thread, so the event loop keeps answering the server
+            game_state = await self._loop.run_in_executor(
+                None, self._decode_game_state, message
+            )
+            self._decoded = (sequence, game_state.id)
+            # Only the event loop thread is profiled, without the decoding
+            self._begin_profiled_tick()
+            try:
+                packet = await self._decide_async(game_state, deadline)
+            finally:
+                self._end_profiled_tick()
+        finally:
+            self._complete_decision(
+                websocket, sequence, packet, time.monotonic(), timestamps
+            )
+
+    @final
+    def _handle_next_move_in_process(
+        self,
+        websocket: WebSocket,
+        item: tuple[websockets.Data, int, float | None, TickTimestamps | None],
+    ) -> None:
+        message, sequence, deadline, timestamps = item
+        if timestamps is not None:
+            timestamps.dequeued = time.monotonic()
+
+        def on_decoded(game_state_id: str) -> None:
+            self._decoded = (sequence, game_state_id)
+
+        def on_provisional(packet: str) -> None:
+            self._provisional = (sequence, packet)
+
+        process = self._process
+        packet = None
+        try:
+            if process is None or process.failed:
+                return
+            try:
+                packet = process.decide(
+                    message, deadline, on_decoded, on_provisional, timestamps
+                )
+            except (EOFError, OSError) as e:
+                _logger.error("The decision process is not available: %s", e)
+                if process.restart():
+                    _logger.warning("The decision process was restarted.")
+                else:
+                    _logger.error(
+                        "The decision process failed, the bot stops deciding."
+                    )
+        finally:
+            self._loop.call_soon_threadsafe(
+                self._complete_decision,
+                websocket,
+                sequence,
+                packet,
+                time.monotonic(),
+                timestamps,
+            )
+
+    @final
+    def _deadline_for(self, received_at: float) -> float | None:
+        """Returns the deadline of a game state received at the given time."""
+        if self._lobby_data is None:  # type: ignore[assignment]
+            return None
+        interval = self._lobby_data.server_settings.broadcast_interval / 1000
+        return received_at + interval - self.safety_margin - self._send_latency.estimate
+
+    @final
+    def _arm_deadline(
+        self, websocket: WebSocket, sequence: int, deadline: float | None
+    ) -> None:
+        if deadline is None:
+            return
+        # The loop clock is time.monotonic, the same as the deadline
+        self._deadline_timers[sequence] = self._loop.call_at(
+            deadline, self._on_deadline, websocket, sequence
         )
 
+    @final
+    def _on_deadline(self, websocket: WebSocket, sequence: int) -> None:
+        """Sends the proposed or fallback action if no decision was made.
+
+        The game states are numbered in the order they are received,
+        because their IDs are known only after they are decoded.
+        No action is sent if the game state has not been decoded yet.
+        """
+        self._deadline_timers.pop(sequence, None)
+
+        packet = self._deadline_packet(sequence)
+        if packet is None:
+            return
+
+        # The decision made later is not sent
+        self._sent_at_deadline.add(sequence)
+        self._loop.create_task(self._send_action(websocket, packet, time.monotonic()))
+
+    @final
+    def _deadline_packet(self, sequence: int) -> str | None:
+        """Returns the proposed or fallback action to the game state, if any."""
+        provisional = self._provisional
+        decoded = self._decoded
+        if provisional is not None and provisional[0] == sequence:
+            return provisional[1]
+        if (
+            self.deadline_fallback is not None
+            and decoded is not None
+            and decoded[0] == sequence
+        ):
+            return self._serializer.encode_action(self.deadline_fallback, decoded[1])
+        return None
+
+    @final
+    def _complete_decision(  # pylint: disable=too-many-arguments
+        self,
+        websocket: WebSocket,
+        sequence: int,
+        packet: str | None,
+        created_at: float,
+        timestamps: TickTimestamps | None = None,
+    ) -> None:
+        """Sends the decision unless an action was already sent at the deadline.
+
+        It is called once for each decided game state, also when
+        the decision failed. Then `packet` is `None`, and the proposed
+        or fallback action is sent instead, if there is one.
+        """
+        timer = self._deadline_timers.pop(sequence, None)
+        if timer is not None:
+            timer.cancel()
+        if sequence in self._sent_at_deadline:
+            self._sent_at_deadline.discard(sequence)
+            return
+        if packet is None:
+            packet = self._deadline_packet(sequence)
+            if packet is None:
+                return
+        self._loop.create_task(self._send_action(websocket, packet, created_at, timestamps))
+
+    @final
+    async def _send_action(
+        self,
+        websocket: WebSocket,
+        packet: str,
+        created_at: float,
+        timestamps: TickTimestamps | None = None,
+    ) -> None:
+        await self._send_frame(websocket, packet)
+        sent_at = time.monotonic()
+        self._send_latency.update(sent_at - created_at)
+        if timestamps is not None and self._latency is not None:
+            timestamps.sent = sent_at
+            self._record_latency(self._latency, timestamps)
+
+    @final
+    def _record_latency(self, latency: LatencyTracker, timestamps: TickTimestamps) -> None:
+        latency.record(timestamps)
+        interval = self.latency_report_interval
+        if interval > 0 and latency.count % interval == 0:
+            self._print_latency_summary()
+
+    @final
+    def _print_latency_summary(self) -> None:
+        if self._latency is not None and self._latency.count > 0:
+            _logger.info("Decision latency (ms):\n%s", self._latency.summary())
+
+    @final
+    def _reset_deadlines(self) -> None:
+        for timer in self._deadline_timers.values():
+            timer.cancel()
+        self._deadline_timers.clear()
+        self._sent_at_deadline.clear()
+        self._decoded = None
+        self._provisional = None
+
+    @final
+    async def _send_ready_to_receive_game_state(self, websocket: WebSocket) -> None:
+        await self._send_packet(websocket, PacketType.READY_TO_RECEIVE_GAME_STATE)
+
     @final
     def send_lobby_data_request(self, websocket: WebSocket) -> None:
         """Sends a lobby data request to the server."""
@@ -319,106 +810,307 @@ class StereoTanksBot(ABC):
         )
 
     @final
-    def _send_game_status_request(self, websocket: WebSocket) -> None:
-        asyncio.run_coroutine_threadsafe(
-            self._send_packet(websocket, PacketType.GAME_STATUS_REQUEST),
-            self._loop,
-        )
+    async def _send_game_status_request(self, websocket: WebSocket) -> None:
+        await self._send_packet(websocket, PacketType.GAME_STATUS_REQUEST)
 
     @final
-    def _handle_messages(  # pylint: disable=too-many-return-statements, too-many-branches
+    async def _handle_messages(
         self, websocket: WebSocket, message: websockets.Data
     ) -> None:
-        data = humps.decamelize(json.loads(message))
+        received_at = time.monotonic()
 
-        packet_number = data["type"]
+        # The type is read from the raw frame, the payload is decoded
+        # later and only by the handlers of the packets that need it
+        packet_number = peek_packet_type(message)
+        if packet_number is None:
+            packet_number = self._codec.loads(message)["type"]
 
-        if packet_number & 0xF0 == PacketType.ERROR_GROUP:
-            payload: dict[str, Any] = data.get("payload")
-            if error_message := payload.get("message") if payload else None:
-                print(f"Error: {error_message}")
-            else:
-                print(f"Error: {packet_number} ({hex(packet_number)})")
+        if packet_number == PacketType.GAME_STATE:
+            self._handle_game_state_packet(websocket, message, received_at)
             return
 
-        packet_type = PacketType(data["type"])
+        handler = self._control_handlers.get(packet_number)
+        if handler is not None:
+            await handler(websocket, message)
+        elif packet_number & 0xF0 == PacketType.ERROR_GROUP:
+            self._handle_error_packet(message, packet_number)
 
-        if packet_type == PacketType.PING:
-            self._handle_ping_packet(websocket)
-            return
+    @final
+    def _create_control_handlers(
+        self,
+    ) -> dict[int, Callable[[WebSocket, websockets.Data], Awaitable[None]]]:
+        """Returns the handlers of the packets other than the game state."""
+        return {
+            PacketType.PING: self._handle_ping_packet,
+            PacketType.LOBBY_DATA: self._handle_callbacks_packet,
+            PacketType.CUSTOM_WARNING: self._handle_callbacks_packet,
+            PacketType.PLAYER_ALREADY_MADE_ACTION_WARNING: self._handle_callbacks_packet,
+            PacketType.ACTION_IGNORED_DUE_TO_DEAD_WARNING: self._handle_callbacks_packet,
+            PacketType.SLOW_RESPONSE_WARNING: self._handle_callbacks_packet,
+            PacketType.GAME_ENDED: self._handle_game_ended_packet,
+            PacketType.GAME_STARTED: self._handle_game_started_packet,
+            PacketType.GAME_STARTING: self._handle_game_starting_packet,
+            PacketType.CONNECTION_ACCEPTED: self._handle_connection_accepted_packet,
+            PacketType.CONNECTION_REJECTED: self._handle_connection_rejected_packet,
+            PacketType.GAME_IN_PROGRESS: self._handle_game_in_progress_packet,
+        }
+
+    @final
+    def _decode_packet(self, message: websockets.Data) -> dict[str, Any]:
+        """Returns the decamelized packet.
 
-        if packet_type == PacketType.GAME_STATE:
-            payload = GameStatePayload.from_json(data["payload"])
-            game_state = GameStateModel.from_payload(payload)
-            threading.Thread(
-                target=self._handle_next_move, args=(websocket, game_state)
-            ).start()
+        The packets without a payload are not decoded.
+        """
+        packet_number = peek_packet_type(message)
+        if packet_number is not None and not packet_number & PacketType.HAS_PAYLOAD:
+            return {"type": packet_number}
+        return humps.decamelize(self._codec.loads(message))
+
+    @final
+    def _handle_game_state_packet(
+        self, websocket: WebSocket, message: websockets.Data, received_at: float
+    ) -> None:
+        if self._worker is None:
+            self._worker = self._create_worker(websocket)
+            self._worker.start()
+        # The frame is decoded by the decision worker,
+        # so the size of the map does not delay the other packets
+        self._received_game_states += 1
+        sequence = self._received_game_states
+        deadline = self._deadline_for(received_at)
+        self._arm_deadline(websocket, sequence, deadline)
+        timestamps = TickTimestamps(received_at) if self._latency is not None else None
+        self._worker.submit((message, sequence, deadline, timestamps))
+
+    @final
+    def _handle_error_packet(self, message: websockets.Data, packet_number: int) -> None:
+        # The error types are not listed, so their payload flag is not relied on
+        data = humps.decamelize(self._codec.loads(message))
+        payload: dict[str, Any] | None = data.get("payload")
+        if error_message := payload.get("message") if payload else None:
+            _logger.error("Error: %s", error_message)
+        else:
+            _logger.error("Error: %d (%s)", packet_number, hex(packet_number))
+
+    @final
+    async def _handle_callbacks_packet(
+        self, _websocket: WebSocket, message: websockets.Data
+    ) -> None:
+        await self._dispatch_callbacks(message)
+
+    @final
+    async def _handle_game_ended_packet(
+        self, _websocket: WebSocket, message: websockets.Data
+    ) -> None:
+        self._print_worker_summary()
+        self._print_latency_summary()
+        await self._dispatch_callbacks(message)
+
+    @final
+    async def _handle_game_started_packet(
+        self, _websocket: WebSocket, _message: websockets.Data
+    ) -> None:
+        _logger.info("The game has started.")
+
+    @final
+    async def _handle_game_starting_packet(
+        self, websocket: WebSocket, message: websockets.Data
+    ) -> None:
+        if self._worker is not None:
+            self._worker.reset_counters()
+        self._reset_deadlines()
+        self._stale_game_states = 0
+        if self._latency is not None:
+            self._latency.reset()
+        await self._dispatch_callbacks(message)
+        if self._lobby_data is None:  # type: ignore[assignment]
+            await self._send_packet(websocket, PacketType.LOBBY_DATA_REQUEST)
+        await self._send_ready_to_receive_game_state(websocket)
+
+    @final
+    async def _handle_connection_accepted_packet(
+        self, websocket: WebSocket, _message: websockets.Data
+    ) -> None:
+        _logger.info("Connected to the server.")
+        await self._send_game_status_request(websocket)
+
+    @final
+    async def _handle_connection_rejected_packet(
+        self, _websocket: WebSocket, message: websockets.Data
+    ) -> None:
+        data = self._decode_packet(message)
+        payload = ConnectionRejectedPayload.from_json(data["payload"])
+        _logger.error("Connection rejected: %s", payload.reason)
+
+    @final
+    async def _handle_game_in_progress_packet(
+        self, websocket: WebSocket, _message: websockets.Data
+    ) -> None:
+        await self._send_packet(websocket, PacketType.LOBBY_DATA_REQUEST)
+        await self._send_ready_to_receive_game_state(websocket)
+
+    @final
+    def _create_worker(
+        self, websocket: WebSocket
+    ) -> DecisionWorker[Any] | AsyncDecisionWorker[Any]:
+        if self._process is not None:
+            handler: Any = self._handle_next_move_in_process
+        elif inspect.iscoroutinefunction(self.next_move):
+            return AsyncDecisionWorker(
+                functools.partial(self._handle_next_move_async, websocket),
+                self.mailbox_policy,
+            )
+        else:
+            handler = self._handle_next_move
+        return DecisionWorker(functools.partial(handler, websocket), self.mailbox_policy)
+
+    @final
+    async def _dispatch_callbacks(self, message: websockets.Data) -> None:
+        """Runs the callbacks of a packet here or in the decision process."""
+        if self._process is None:
+            await self._handle_callbacks(self._decode_packet(message))
             return
 
+        self._process.notify(message)
+        if peek_packet_type(message) == PacketType.LOBBY_DATA:
+            # Kept here as well to request the lobby data only when needed
+            data = self._decode_packet(message)
+            payload = LobbyDataPayload.from_json(data["payload"])
+            self._lobby_data = LobbyDataModel.from_payload(payload)
+
+    @final
+    async def _handle_callbacks(self, data: dict[str, Any]) -> None:
+        """Runs the callbacks of a decamelized packet.
+
+        The callbacks defined with `async def` are awaited.
+        """
+        packet_type = PacketType(data["type"])
+        result: Any = None
+
         if packet_type == PacketType.LOBBY_DATA:
             payload = LobbyDataPayload.from_json(data["payload"])
             lobby_data = LobbyDataModel.from_payload(payload)
             self._lobby_data = lobby_data
-            self.on_lobby_data_received(lobby_data)  # type: ignore[assignment]
-            return
+            result = self.on_lobby_data_received(lobby_data)  # type: ignore[arg-type]
 
-        if packet_type & 0xF0 == PacketType.WARNING_GROUP:
+        elif packet_type & 0xF0 == PacketType.WARNING_GROUP:
             has_payload = packet_type & PacketType.HAS_PAYLOAD
             warning_message = data["payload"] if has_payload else None
-            self.on_warning_received(WarningType(packet_type), warning_message)
-            return
+            result = self.on_warning_received(WarningType(packet_type), warning_message)
 
-        if packet_type == PacketType.GAME_ENDED:
+        elif packet_type == PacketType.GAME_ENDED:
             payload = GameEndPayload.from_json(data["payload"])
             game_result = GameResultModel.from_payload(payload)
-            self.on_game_ended(game_result)  # type: ignore[assignment]
-            return
+            self._write_profile()
+            result = self.on_game_ended(game_result)  # type: ignore[arg-type]
 
-        if packet_type == PacketType.GAME_STARTED:
-            print("The game has started.")
-            return
-
-        if packet_type == PacketType.GAME_STARTING:
-            self.on_game_starting()
-            if self._lobby_data is None:  # type: ignore[assignment]
-                self.send_lobby_data_request(websocket)
-            self._send_ready_to_receive_game_state(websocket)
-            return
+        elif packet_type == PacketType.GAME_STARTING:
+            if self._worker is None:
+                self._reset_game_caches()
+            else:
+                # The decoder and the state diff are used by the worker
+                self._worker.call(self._reset_game_caches)
+            result = self.on_game_starting()
 
-        if packet_type == PacketType.CONNECTION_ACCEPTED:
-            print("Connected to the server.")
-            self._send_game_status_request(websocket)
-            return
+        if inspect.isawaitable(result):
+            await result
 
-        if packet_type == PacketType.CONNECTION_REJECTED:
-            payload = ConnectionRejectedPayload.from_json(data["payload"])
-            print(f"Connection rejected: {payload.reason}")
-            return
+    @final
+    def _reset_game_caches(self) -> None:
+        """Forgets the game states of the previous game."""
+        if self._decoder is not None:
+            self._decoder.reset()
+        if self.state_diff is not None:
+            self.state_diff.reset()
 
-        if packet_type == PacketType.GAME_IN_PROGRESS:
-            self.send_lobby_data_request(websocket)
-            self._send_ready_to_receive_game_state(websocket)
-            return
+    @final
+    def _print_worker_summary(self) -> None:
+        worker = self._worker
+        if worker is not None and (
+            worker.superseded or worker.dropped or self._stale_game_states
+        ):
+            _logger.info(
+                "Processed %d game states, superseded %d, dropped %d, skipped %d stale.",
+                worker.processed,
+                worker.superseded,
+                worker.dropped,
+                self._stale_game_states,
+            )
 
     @final
     async def _start_loop(self, server_url: str) -> None:
+        if not get_logger().handlers:
+            setup_logging(self._log_level, self._log_json)
+        if self.process_mode:
+            # Started before the loop is stored, so the bot can be pickled
+            process = DecisionProcess(self)
+            process.start()
+            self._process = process
         self._loop = asyncio.get_event_loop()
-        async with websockets.connect(server_url) as websocket:
-            while True:
-                try:
-                    message = await websocket.recv()
-                    self._handle_messages(websocket, message)
-                except websockets.exceptions.ConnectionClosedOK as e:
-                    reason = e.rcvd.reason if e.rcvd and e.rcvd.reason else "unknown"
-                    print(f"Connection closed by the server: {reason}")
-                    break
-                except websockets.exceptions.ConnectionClosedError as e:
-                    reason = e.rcvd.reason if e.rcvd and e.rcvd.reason else "unknown"
-                    print(f"Connection closed with an error: {reason}")
-                    break
-                except Exception as e:  # pylint: disable=broad-except
-                    print(f"An error occurred: {e}")  # pragma: no cover
-                    print(traceback.format_exc())  # pragma: no cover
+        self._send_latency = LatencyEstimator()
+        self._deadline_timers = {}
+        self._sent_at_deadline = set()
+        self._control_handlers = self._create_control_handlers()
+        self._latency = LatencyTracker() if self.track_latency else None
+        if self._record_path is not None:
+            self._recorder = MatchRecorder(self._record_path)
+            self._recorder.start()
+        # Codecs that decode bytes natively get the raw text frame
+        decode = False if self._codec.decodes_bytes else None
+        async with connect(server_url) as websocket:
+            try:
+                await self._receive_messages(websocket, decode)
+            finally:
+                if self._worker is not None:
+                    self._worker.stop(timeout=1.0)
+                    self._worker = None
+                if self._process is not None:
+                    self._process.stop(timeout=1.0)
+                    self._process = None
+                if self._profiler is not None:
+                    self._profiler.stop()
+                if self._recorder is not None:
+                    self._recorder.close()
+                    self._recorder = None
+
+    @final
+    async def _receive_batch(
+        self, websocket: WebSocket, decode: bool | None
+    ) -> list[websockets.Data]:
+        """Receives the next message and all the messages buffered after it.
+
+        Only the newest game state of the batch is kept,
+        because the older ones would not be acted on anyway.
+        """
+        messages = [await websocket.recv(decode=decode)]
+        while has_buffered_message(websocket):
+            messages.append(await websocket.recv(decode=decode))
+
+        if self._recorder is not None:
+            for message in messages:
+                self._recorder.record_received(message)
+
+        if len(messages) > 1:
+            messages, stale = coalesce_game_states(messages)
+            self._stale_game_states += stale
+        return messages
+
+    @final
+    async def _receive_messages(self, websocket: WebSocket, decode: bool | None) -> None:
+        while True:
+            try:
+                for message in await self._receive_batch(websocket, decode):
+                    await self._handle_messages(websocket, message)
+            except websockets.exceptions.ConnectionClosedOK as e:
+                reason = e.rcvd.reason if e.rcvd and e.rcvd.reason else "unknown"
+                _logger.info("Connection closed by the server: %s", reason)
+                break
+            except websockets.exceptions.ConnectionClosedError as e:
+                reason = e.rcvd.reason if e.rcvd and e.rcvd.reason else "unknown"
+                _logger.error("Connection closed with an error: %s", reason)
+                break
+            except Exception as e:  # pylint: disable=broad-except
+                _logger.exception("An error occurred: %s", e)  # pragma: no cover
 
     @final
     def run(self) -> None:
@@ -438,5 +1130,16 @@ class StereoTanksBot(ABC):
         """
 
         args = argparser.get_args()
+        self._log_level = args.log_level
+        self._log_json = args.log_json
+        setup_logging(self._log_level, self._log_json)
         server_url = self._get_server_url(args)
+        self._codec = get_codec(args.json_codec)
+        self._serializer = PacketSerializer(self._codec)
+        self._record_path = args.record
+        if args.profile is not None:
+            self._profile_path = args.profile
+            self._profile_interval = args.profile_interval / 1000
+            if args.profile_slow_tick is not None:
+                self._profile_slow_tick = args.profile_slow_tick / 1000
         asyncio.run(self._start_loop(server_url))
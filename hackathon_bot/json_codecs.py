@@ -0,0 +1,203 @@
+"""This module contains the JSON codecs used to encode and decode packets.
+
+The codec is chosen once at startup. The standard library `json` module
+is always available and is used as the fallback. Faster third-party
+backends are used only if they are installed.
+
+Classes
+-------
+JsonCodec
+    Base class for JSON codecs.
+StdlibJsonCodec
+    JSON codec backed by the standard library.
+OrjsonCodec
+    JSON codec backed by `orjson`.
+MsgspecCodec
+    JSON codec backed by `msgspec`.
+UjsonCodec
+    JSON codec backed by `ujson`.
+
+Functions
+---------
+available_codecs
+    Returns the names of the codecs that can be used on this host.
+get_codec
+    Returns a codec by its name.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar
+
+__all__ = (
+    "JsonCodec",
+    "StdlibJsonCodec",
+    "OrjsonCodec",
+    "MsgspecCodec",
+    "UjsonCodec",
+    "available_codecs",
+    "get_codec",
+)
+
+
+class JsonCodec(ABC):
+    """Base class for JSON codecs.
+
+    Attributes
+    ----------
+    name: :class:`str`
+        The name of the codec used to select it from the command line.
+    module: :class:`str` | `None`
+        The name of the module required by the codec.
+        `None` if the codec has no third-party dependencies.
+    decodes_bytes: :class:`bool`
+        Whether the codec decodes UTF-8 bytes natively.
+        If `True`, text frames are received from the websocket
+        as `bytes`, skipping the creation of an intermediate `str`.
+    """
+
+    name: ClassVar[str]
+    module: ClassVar[str | None] = None
+    decodes_bytes: ClassVar[bool] = False
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether the codec can be used on this host."""
+        return cls.module is None or importlib.util.find_spec(cls.module) is not None
+
+    @abstractmethod
+    def loads(self, data: str | bytes) -> Any:
+        """Decodes a JSON document."""
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> str:
+        """Encodes an object to a JSON document."""
+
+
+class StdlibJsonCodec(JsonCodec):
+    """JSON codec backed by the standard library."""
+
+    name = "json"
+
+    def loads(self, data: str | bytes) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj)
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec backed by `orjson`."""
+
+    name = "orjson"
+    module = "orjson"
+    decodes_bytes = True
+
+    def __init__(self) -> None:
+        import orjson  # pylint: disable=import-outside-toplevel
+
+        self._loads = orjson.loads
+        self._dumps = orjson.dumps
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self._dumps(obj).decode()
+
+
+class MsgspecCodec(JsonCodec):
+    """JSON codec backed by `msgspec`."""
+
+    name = "msgspec"
+    module = "msgspec"
+    decodes_bytes = True
+
+    def __init__(self) -> None:
+        import msgspec  # pylint: disable=import-outside-toplevel
+
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self._encoder.encode(obj).decode()
+
+
+class UjsonCodec(JsonCodec):
+    """JSON codec backed by `ujson`."""
+
+    name = "ujson"
+    module = "ujson"
+    decodes_bytes = True
+
+    def __init__(self) -> None:
+        import ujson  # pylint: disable=import-outside-toplevel
+
+        self._loads = ujson.loads
+        self._dumps = ujson.dumps
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self._dumps(obj)
+
+
+# Ordered from the fastest to the slowest backend
+_CODECS: tuple[type[JsonCodec], ...] = (
+    OrjsonCodec,
+    MsgspecCodec,
+    UjsonCodec,
+    StdlibJsonCodec,
+)
+
+
+def available_codecs() -> tuple[str, ...]:
+    """Returns the names of the codecs that can be used on this host.
+
+    The names are ordered from the fastest to the slowest backend.
+    """
+    return tuple(c.name for c in _CODECS if c.is_available())
+
+
+def get_codec(name: str = "auto") -> JsonCodec:
+    """Returns a codec by its name.
+
+    Parameters
+    ----------
+    name: :class:`str`
+        The name of the codec. If `auto`, the fastest
+        codec available on this host is returned.
+
+    Returns
+    -------
+    JsonCodec
+        The codec instance.
+
+    Raises
+    ------
+    ValueError
+        If the codec is unknown or its backend is not installed.
+    """
+
+    if name == "auto":
+        return next(c for c in _CODECS if c.is_available())()
+
+    codec = next((c for c in _CODECS if c.name == name), None)
+
+    if codec is None:
+        raise ValueError(
+            f"Unknown JSON codec: {name}. Valid options are: "
+            f"auto, {', '.join(c.name for c in _CODECS)}"
+        )
+
+    if not codec.is_available():
+        raise ValueError(f"JSON codec {name} requires the {codec.module} package")
+
+    return codec()
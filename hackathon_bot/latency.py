@@ -0,0 +1,239 @@
+"""This module contains the latency instrumentation of the decisions.
+
+Each decision is timestamped at the boundaries of its stages,
+from the moment the game state is received to the moment the response
+action is written to the socket. The durations of the stages
+are counted in histograms, so the summary shows which stage is slow
+without storing every tick.
+
+Classes
+-------
+LatencyHistogram
+    Counts the latencies in buckets with a bounded relative error.
+TickTimestamps
+    Holds the timestamps of the stages of one decision.
+LatencyTracker
+    Collects the stage latencies of the decisions.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+__all__ = ("LatencyHistogram", "TickTimestamps", "LatencyTracker")
+
+# The stages of a decision, in order
+STAGES = (
+    "queue",
+    "parse",
+    "build",
+    "prepare",
+    "next_move",
+    "encode",
+    "send",
+    "total",
+)
+
+# The percentiles shown in the summary
+_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+class LatencyHistogram:
+    """Counts the latencies in buckets with a bounded relative error.
+
+    The latencies are counted in microseconds. The values below
+    128 µs have their own buckets, the larger ones share each power
+    of two between 64 buckets, like in an HDR histogram.
+    The relative error of the percentiles is below 1/64.
+
+    Attributes
+    ----------
+    count: :class:`int`
+        The number of recorded latencies.
+    total: :class:`float`
+        The sum of the recorded latencies in seconds.
+    max: :class:`float`
+        The largest recorded latency in seconds.
+    """
+
+    __slots__ = ("count", "total", "max", "_counts")
+
+    _SUB_BUCKET_BITS = 7
+    _SUB_BUCKET_MASK = (1 << _SUB_BUCKET_BITS) - 1
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._counts: dict[int, int] = {}
+
+    def record(self, seconds: float) -> None:
+        """Records a latency in seconds."""
+        if seconds < 0.0:
+            seconds = 0.0
+        index = self._index(int(seconds * 1_000_000))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percentile: float) -> float:
+        """Returns the latency in seconds below which the given percent of them are.
+
+        The result is the upper bound of the bucket of the percentile.
+        Returns `0.0` if no latency was recorded.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(percentile / 100 * self.count, 1.0)
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(self._upper_bound(index) / 1_000_000, self.max)
+        return self.max
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """Adds the latencies recorded by another histogram."""
+        for index, count in other._counts.items():  # pylint: disable=protected-access
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def reset(self) -> None:
+        """Removes all the recorded latencies."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._counts.clear()
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        shift = value.bit_length() - cls._SUB_BUCKET_BITS
+        if shift <= 0:
+            return value
+        return (shift << cls._SUB_BUCKET_BITS) | (value >> shift)
+
+    @classmethod
+    def _upper_bound(cls, index: int) -> int:
+        shift = index >> cls._SUB_BUCKET_BITS
+        if shift == 0:
+            return index
+        return (((index & cls._SUB_BUCKET_MASK) + 1) << shift) - 1
+
+
+class TickTimestamps:  # pylint: disable=too-many-instance-attributes
+    """Holds the timestamps of the stages of one decision.
+
+    All timestamps are :func:`time.monotonic` values.
+    The ones that were not reached are `0.0`.
+
+    Attributes
+    ----------
+    received: :class:`float`
+        The game state was received.
+    dequeued: :class:`float`
+        The decision worker took the game state from the mailbox.
+    parsed: :class:`float`
+        The JSON frame was parsed.
+    built: :class:`float`
+        The models were built.
+    started: :class:`float`
+        `next_move` was called.
+    finished: :class:`float`
+        `next_move` returned.
+    encoded: :class:`float`
+        The response action was encoded.
+    sent: :class:`float`
+        The response action was written to the socket.
+    """
+
+    __slots__ = (
+        "received",
+        "dequeued",
+        "parsed",
+        "built",
+        "started",
+        "finished",
+        "encoded",
+        "sent",
+    )
+
+    def __init__(self, received: float) -> None:
+        self.received = received
+        self.dequeued = 0.0
+        self.parsed = 0.0
+        self.built = 0.0
+        self.started = 0.0
+        self.finished = 0.0
+        self.encoded = 0.0
+        self.sent = 0.0
+
+    def durations(self) -> tuple[float, ...]:
+        """Returns the durations of the stages in seconds, in the order of `STAGES`."""
+        return (
+            self.dequeued - self.received,
+            self.parsed - self.dequeued,
+            self.built - self.parsed,
+            self.started - self.built,
+            self.finished - self.started,
+            self.encoded - self.finished,
+            self.sent - self.encoded,
+            self.sent - self.received,
+        )
+
+
+class LatencyTracker:
+    """Collects the stage latencies of the decisions.
+
+    The decisions are recorded after their response action is sent,
+    so all histograms are updated from the event loop.
+
+    Attributes
+    ----------
+    histograms: dict[:class:`str`, :class:`LatencyHistogram`]
+        The histograms of the stages, in the order of `STAGES`.
+    """
+
+    __slots__ = ("histograms",)
+
+    def __init__(self) -> None:
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+
+    @property
+    def count(self) -> int:
+        """The number of recorded decisions."""
+        return self.histograms["total"].count
+
+    def record(self, timestamps: TickTimestamps) -> None:
+        """Records the stage latencies of a sent decision."""
+        for stage, duration in zip(STAGES, timestamps.durations()):
+            self.histograms[stage].record(duration)
+
+    def merge(self, other: LatencyTracker) -> None:
+        """Adds the latencies collected by another tracker."""
+        for stage, histogram in self.histograms.items():
+            histogram.merge(other.histograms[stage])
+
+    def reset(self) -> None:
+        """Removes all the recorded latencies."""
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def summary(self, stages: Iterable[str] | None = None) -> str:
+        """Returns a table of the stage latencies in milliseconds.
+
+        Only the given stages are shown, by default all of them.
+        """
+        header = ["stage", "count", *(f"p{p:g}" for p in _PERCENTILES), "max"]
+        lines = ["{:<10}{:>8}{:>9}{:>9}{:>9}{:>9}".format(*header)]
+        for stage in STAGES if stages is None else stages:
+            histogram = self.histograms[stage]
+            values = [histogram.percentile(p) for p in _PERCENTILES] + [histogram.max]
+            lines.append(
+                f"{stage:<10}{histogram.count:>8}"
+                + "".join(f"{v * 1000:>9.3f}" for v in values)
+            )
+        return "\n".join(lines)
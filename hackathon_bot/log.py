@@ -0,0 +1,204 @@
+"""This module contains the logging of the library.
+
+The records are written by a background thread. The thread that logs
+only puts the record into an unbounded queue, which never blocks,
+so the decisions and the event loop never wait for the standard output.
+
+The messages logged repeatedly from the same place are rate limited,
+unless they are logged with `extra={"rate_limit": False}`,
+and the records can also be written to a file as JSON lines.
+
+Functions
+---------
+get_logger
+    Returns a logger of the library.
+setup_logging
+    Starts writing the records of the library in the background.
+shutdown_logging
+    Writes the waiting records and stops the background writer.
+
+Classes
+-------
+RateLimitFilter
+    Drops the records logged too often from the same place.
+JsonLinesFormatter
+    Formats the records as JSON objects, one per line.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import queue
+import re
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+__all__ = (
+    "get_logger",
+    "setup_logging",
+    "shutdown_logging",
+    "RateLimitFilter",
+    "JsonLinesFormatter",
+)
+
+_ROOT = "hackathon_bot"
+
+_listener: QueueListener | None = None
+
+# The terminal control sequences, such as clearing the screen
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
+
+
+def get_logger(name: str | None = None) -> logging.Logger:
+    """Returns a logger of the library.
+
+    Parameters
+    ----------
+    name: :class:`str` | None
+        The name of the child logger, for example `"bot"`.
+        If `None`, the root logger of the library is returned.
+    """
+    logger = logging.getLogger(_ROOT)
+    return logger.getChild(name) if name else logger
+
+
+class RateLimitFilter(logging.Filter):
+    """Drops the records logged too often from the same place.
+
+    At most `burst` records from the same line of code are kept
+    in each period. The number of dropped records is appended
+    to the first record kept in the next period.
+
+    The records logged with `extra={"rate_limit": False}` are always kept,
+    for example a map printed on every tick:
+
+    ::
+
+        self.logger.info("%s", rendered_map, extra={"rate_limit": False})
+
+    Attributes
+    ----------
+    period: :class:`float`
+        The length of the period in seconds.
+    burst: :class:`int`
+        The number of records kept in each period.
+    """
+
+    def __init__(self, period: float = 1.0, burst: int = 5) -> None:
+        super().__init__()
+        self.period = period
+        self.burst = burst
+        # The start of the period, the kept and the dropped records
+        self._windows: dict[tuple[str, int], list[float | int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "rate_limit", True):
+            return True
+        key = (record.pathname, record.lineno)
+        now = record.created
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.period:
+            dropped = window[2] if window is not None else 0
+            self._windows[key] = [now, 1, 0]
+            if dropped:
+                record.msg = f"{record.msg} ({dropped} similar messages suppressed)"
+            return True
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats the records as JSON objects, one per line.
+
+    The terminal control sequences are removed from the messages.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": _ANSI_ESCAPE.sub("", record.getMessage()),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _QueueHandler(QueueHandler):
+    """Puts the records into the queue with their message merged.
+
+    The traceback is formatted by the background writer,
+    so logging an exception is cheap for the thread that logs it.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def setup_logging(
+    level: int | str = logging.INFO,
+    json_path: str | None = None,
+    rate_limit: RateLimitFilter | None = None,
+) -> None:
+    """Starts writing the records of the library in the background.
+
+    The messages are written to the standard output as they are.
+    It can be called again to change the configuration.
+
+    Parameters
+    ----------
+    level: :class:`int` | :class:`str`
+        The lowest level of the written records.
+    json_path: :class:`str` | None
+        The path of the file the records are appended to as JSON lines.
+    rate_limit: :class:`RateLimitFilter` | None
+        The rate limit of the repeated messages.
+        By default 5 messages per second from the same line of code.
+    """
+    global _listener  # pylint: disable=global-statement
+    shutdown_logging()
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    handler.addFilter(rate_limit if rate_limit is not None else RateLimitFilter())
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    handlers: list[logging.Handler] = [console]
+    if json_path is not None:
+        file = logging.FileHandler(json_path, mode="a", encoding="utf-8")
+        file.setFormatter(JsonLinesFormatter())
+        handlers.append(file)
+
+    logger = get_logger()
+    for old_handler in logger.handlers[:]:
+        logger.removeHandler(old_handler)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    _listener = QueueListener(records, *handlers)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Writes the waiting records and stops the background writer."""
+    global _listener  # pylint: disable=global-statement
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(shutdown_logging)
@@ -7,15 +7,26 @@ which serve as interfaces for these models with enhanced clarity.
 Some of the models contain weird attributes like __instancecheck_something__.
 These are used to distinguish between different classes that have the same
 data structure. This is necessary to allow using isinstance() with protocols.
+
+The entity models also have the `kind` class attribute,
+which is used by isinstance() as a fast path.
 """
 
 from __future__ import annotations
 
 from abc import ABC
-from dataclasses import asdict, dataclass
-from typing import TYPE_CHECKING, Any
-
-from .enums import BulletType, Direction, Orientation, TankType, WallType
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, overload
+
+from .enums import (
+    BulletType,
+    Direction,
+    EntityKind,
+    Orientation,
+    TankType,
+    WallType,
+)
 from .payloads import (
     GameEndPayload,
     GameStatePayload,
@@ -34,6 +45,14 @@ from .payloads import (
 )
 
 
+# Enum members indexed by their values, cheaper than calling the enum
+_DIRECTIONS = tuple(Direction)
+_TANK_TYPES = tuple(TankType)
+_WALL_TYPES = tuple(WallType)
+_BULLET_TYPES = tuple(BulletType)
+_ORIENTATIONS = tuple(Orientation)
+
+
 @dataclass(slots=True, frozen=True)
 class TeamModel:
     """Represents a team model."""
@@ -50,6 +69,14 @@ class TeamModel:
         players = [PlayerModel.from_raw(p) for p in raw.players]
         return cls(data["name"], data["color"], players, data.get("score", None))
 
+    @classmethod
+    def from_json(cls, json_data: dict[str, Any]) -> TeamModel:
+        """Creates a team from a camelCase JSON dictionary."""
+        players = [PlayerModel.from_json(p) for p in json_data["players"]]
+        return cls(
+            json_data["name"], json_data["color"], players, json_data.get("score")
+        )
+
 
 @dataclass(slots=True, frozen=True)
 class PlayerModel:  # pylint: disable=too-many-instance-attributes
@@ -68,6 +95,18 @@ class PlayerModel:  # pylint: disable=too-many-instance-attributes
         data["ticks_to_regenerate"] = data.pop("ticks_to_regen", None)
         return cls(**data)
 
+    @classmethod
+    def from_json(cls, json_data: dict[str, Any]) -> PlayerModel:
+        """Creates a player from a camelCase JSON dictionary."""
+        get = json_data.get
+        return cls(
+            json_data["id"],
+            get("tankType"),
+            get("kills"),
+            get("ping"),
+            get("ticksToRegen"),
+        )
+
 
 @dataclass(slots=True, frozen=True)
 class TurretModel:
@@ -88,12 +127,130 @@ class TurretModel:
         data["direction"] = Direction(data["direction"])
         return cls(**data)
 
+    @classmethod
+    def from_json(cls, json_data: dict[str, Any]) -> TurretModel:
+        """Creates a turret from a camelCase JSON dictionary."""
+        get = json_data.get
+        return cls(
+            _DIRECTIONS[json_data["direction"]],
+            get("bulletCount"),
+            get("ticksToBullet"),
+            get("ticksToDoubleBullet"),
+            get("ticksToHealingBullet"),
+            get("ticksToStunBullet"),
+            get("ticksToLaser"),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class VisibilityMask:
+    """Represents the visibility of a tank as a bitset.
+
+    The bit `y * width + x` of `bits` is set if the (x, y) tile is visible.
+    Indexing as `mask[y][x]` is supported for compatibility,
+    but :meth:`is_visible` avoids building the row.
+
+    Attributes
+    ----------
+    width: :class:`int`
+        The width of the map.
+    height: :class:`int`
+        The height of the map.
+    bits: :class:`int`
+        The packed visibility bits.
+    """
+
+    width: int
+    height: int
+    bits: int
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[str]) -> VisibilityMask:
+        """Creates a mask from the rows of `0` and `1` characters."""
+        width = len(rows[0]) if rows else 0
+        # The first character must be the least significant bit
+        bits = int("".join(rows)[::-1] or "0", 2)
+        return cls(width, len(rows), bits)
+
+    def is_visible(self, x: int, y: int) -> bool:
+        """Whether the (x, y) tile is visible.
+
+        Raises
+        ------
+        IndexError
+            If the tile is outside the map.
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("visibility tile out of range")
+        return bool(self.bits >> (y * self.width + x) & 1)
+
+    def popcount(self) -> int:
+        """Returns the number of visible tiles."""
+        return self.bits.bit_count()
+
+    def union(self, *others: VisibilityMask) -> VisibilityMask:
+        """Returns the tiles visible in any of the masks."""
+        bits = self.bits
+        for other in others:
+            bits |= other.bits
+        return VisibilityMask(self.width, self.height, bits)
+
+    def intersection(self, *others: VisibilityMask) -> VisibilityMask:
+        """Returns the tiles visible in all of the masks."""
+        bits = self.bits
+        for other in others:
+            bits &= other.bits
+        return VisibilityMask(self.width, self.height, bits)
+
+    def __or__(self, other: VisibilityMask) -> VisibilityMask:
+        return self.union(other)
+
+    def __and__(self, other: VisibilityMask) -> VisibilityMask:
+        return self.intersection(other)
+
+    def __len__(self) -> int:
+        return self.height
+
+    @overload
+    def __getitem__(self, y: int) -> tuple[bool, ...]: ...
+
+    @overload
+    def __getitem__(self, y: slice) -> tuple[tuple[bool, ...], ...]: ...
+
+    def __getitem__(
+        self, y: int | slice
+    ) -> tuple[bool, ...] | tuple[tuple[bool, ...], ...]:
+        if isinstance(y, slice):
+            return tuple(self[i] for i in range(*y.indices(self.height)))
+        if not -self.height <= y < self.height:
+            raise IndexError("visibility row out of range")
+        y %= self.height
+        row = self.bits >> (y * self.width) & ((1 << self.width) - 1)
+        return tuple(bool(row >> x & 1) for x in range(self.width))
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield self[y]
+
+    def to_numpy(self) -> NDArray[np.bool_]:
+        """Returns the mask as a NumPy bool array indexed as `[y, x]`.
+
+        Requires NumPy to be installed.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        size = self.width * self.height
+        packed = np.frombuffer(self.bits.to_bytes((size + 7) // 8, "little"), np.uint8)
+        bits = np.unpackbits(packed, count=size, bitorder="little")
+        return bits.reshape(self.height, self.width).astype(np.bool_)
+
 
 @dataclass(slots=True, frozen=True)
 class TankModel:  # pylint: disable=too-many-instance-attributes
     """Represents a tank model."""
 
     __instancecheck_tank__ = True
+    kind: ClassVar[EntityKind] = EntityKind.TANK
 
     owner_id: str
     type: TankType
@@ -103,7 +260,7 @@ class TankModel:  # pylint: disable=too-many-instance-attributes
     ticks_to_mine: int | None = None
     ticks_to_radar: int | None = None
     is_using_radar: bool | None = None
-    visibility: tuple[tuple[bool, ...], ...] | None = None
+    visibility: VisibilityMask | None = None
 
     @classmethod
     def from_raw(cls, raw: RawTank) -> TankModel:
@@ -113,17 +270,35 @@ class TankModel:  # pylint: disable=too-many-instance-attributes
         data["direction"] = Direction(data["direction"])
         data["turret"] = TurretModel.from_raw(raw.turret)
         if raw.visibility is not None:
-            data["visibility"] = tuple(
-                tuple(c == "1" for c in row) for row in raw.visibility
-            )
+            data["visibility"] = VisibilityMask.from_rows(raw.visibility)
         return cls(**data)
 
+    @classmethod
+    def from_json(cls, json_data: dict[str, Any]) -> TankModel:
+        """Creates a tank from a camelCase JSON dictionary."""
+        get = json_data.get
+        visibility = get("visibility")
+        if visibility is not None:
+            visibility = VisibilityMask.from_rows(visibility)
+        return cls(
+            json_data["ownerId"],
+            _TANK_TYPES[json_data["type"]],
+            _DIRECTIONS[json_data["direction"]],
+            TurretModel.from_json(json_data["turret"]),
+            get("health"),
+            get("ticksToMine"),
+            get("ticksToRadar"),
+            get("isUsingRadar"),
+            visibility,
+        )
+
 
 @dataclass(slots=True, frozen=True)
 class WallModel:
     """Represents a wall model."""
 
     __instancecheck_wall__ = True
+    kind: ClassVar[EntityKind] = EntityKind.WALL
 
     type: WallType
 
@@ -134,12 +309,25 @@ class WallModel:
         data["type"] = WallType(data["type"])
         return cls(**data)
 
+    @classmethod
+    def from_json(cls, json_data: dict[str, Any]) -> WallModel:
+        """Creates a wall from a camelCase JSON dictionary.
+
+        Walls are immutable and only differ by type,
+        so a shared instance is returned for each type.
+        """
+        return _WALLS[json_data["type"]]
+
+
+_WALLS = tuple(WallModel(t) for t in WallType)
+
 
 @dataclass(slots=True, frozen=True)
 class BulletModel:
     """Represents a bullet model."""
 
     __instancecheck_bullet__ = True
+    kind: ClassVar[EntityKind] = EntityKind.BULLET
 
     id: int
     speed: float
@@ -155,12 +343,23 @@ class BulletModel:
         data["type"] = BulletType(data["type"])
         return cls(**data)
 
+    @classmethod
+    def from_json(cls, json_data: dict[str, Any]) -> BulletModel:
+        """Creates a bullet from a camelCase JSON dictionary."""
+        return cls(
+            json_data["id"],
+            json_data["speed"],
+            _DIRECTIONS[json_data["direction"]],
+            _BULLET_TYPES[json_data["type"]],
+        )
+
 
 @dataclass(slots=True, frozen=True)
 class LaserModel:
     """Represents a laser model."""
 
     __instancecheck_laser__ = True
+    kind: ClassVar[EntityKind] = EntityKind.LASER
 
     id: int
     orientation: Orientation
@@ -172,12 +371,18 @@ class LaserModel:
         data["orientation"] = Orientation(data["orientation"])
         return cls(**data)
 
+    @classmethod
+    def from_json(cls, json_data: dict[str, Any]) -> LaserModel:
+        """Creates a laser from a camelCase JSON dictionary."""
+        return cls(json_data["id"], _ORIENTATIONS[json_data["orientation"]])
+
 
 @dataclass(slots=True, frozen=True)
 class MineModel:
     """Represents a mine model."""
 
     __instancecheck_mine__ = True
+    kind: ClassVar[EntityKind] = EntityKind.MINE
 
     id: int
     explosion_remaining_ticks: int | None
@@ -192,6 +397,11 @@ class MineModel:
         """Creates a mine from a raw mine payload."""
         return cls(**asdict(raw))
 
+    @classmethod
+    def from_json(cls, json_data: dict[str, Any]) -> MineModel:
+        """Creates a mine from a camelCase JSON dictionary."""
+        return cls(json_data["id"], json_data.get("explosionRemainingTicks"))
+
 
 @dataclass(slots=True, frozen=True)
 class ZoneModel(ABC):  # pylint: disable=too-many-instance-attributes
@@ -211,6 +421,124 @@ class ZoneModel(ABC):  # pylint: disable=too-many-instance-attributes
         data["shares"] = data.get("shares", {})
         return ZoneModel(**data)
 
+    @classmethod
+    def from_json(cls, json_data: dict[str, Any]) -> ZoneModel:
+        """Creates a zone from a camelCase JSON dictionary."""
+        return ZoneModel(
+            json_data["x"],
+            json_data["y"],
+            json_data["width"],
+            json_data["height"],
+            json_data["index"],
+            json_data.get("shares") or {},
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class ZoneGrid:
+    """Represents the zone membership of the map tiles.
+
+    Zones do not move during a game, so the grid can be computed once
+    and reused for every game state with the same zone layout.
+
+    Attributes
+    ----------
+    width: :class:`int`
+        The width of the map.
+    height: :class:`int`
+        The height of the map.
+    layout: tuple[tuple[:class:`int`, :class:`int`, :class:`int`, :class:`int`], ...]
+        The (x, y, width, height) of each zone the grid was built for.
+    cells: tuple[:class:`int`, ...]
+        The position of the zone in the zones tuple for each tile,
+        in row-major order, or -1 if the tile is not in a zone.
+    zone_tiles: tuple[tuple[tuple[:class:`int`, :class:`int`], ...], ...]
+        The (x, y) coordinates of the tiles in each zone.
+    """
+
+    width: int
+    height: int
+    layout: tuple[tuple[int, int, int, int], ...]
+    cells: tuple[int, ...]
+    zone_tiles: tuple[tuple[tuple[int, int], ...], ...]
+    # The read-only array of `cells`, built by the array view on first use
+    _array: NDArray[np.int8] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @staticmethod
+    def layout_of(zones: Sequence[ZoneModel]) -> tuple[tuple[int, int, int, int], ...]:
+        """Returns the layout of the zones used to validate the grid."""
+        return tuple((z.x, z.y, z.width, z.height) for z in zones)
+
+    @classmethod
+    def from_zones(
+        cls, zones: Sequence[ZoneModel], width: int, height: int
+    ) -> ZoneGrid:
+        """Creates a zone grid for the map of the given size.
+
+        If the zones overlap, the tile belongs to the first one.
+        """
+        cells = [-1] * (width * height)
+        zone_tiles: list[tuple[tuple[int, int], ...]] = []
+        for position, zone in enumerate(zones):
+            tiles = []
+            for y in range(max(zone.y, 0), min(zone.y + zone.height, height)):
+                for x in range(max(zone.x, 0), min(zone.x + zone.width, width)):
+                    tiles.append((x, y))
+                    if cells[y * width + x] == -1:
+                        cells[y * width + x] = position
+            zone_tiles.append(tuple(tiles))
+        return cls(width, height, cls.layout_of(zones), tuple(cells), tuple(zone_tiles))
+
+    def matches(self, zones: Sequence[ZoneModel], width: int, height: int) -> bool:
+        """Whether the grid can be used for the given zones and map size."""
+        return (
+            self.width == width
+            and self.height == height
+            and self.layout == self.layout_of(zones)
+        )
+
+    def position_at(self, x: int, y: int) -> int:
+        """Returns the position of the zone containing the (x, y) tile, or -1."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[y * self.width + x]
+        return -1
+
+
+class _ZoneLookupMixin:  # pylint: disable=too-few-public-methods
+    """Provides zone lookups for the map models."""
+
+    __slots__ = ()
+
+    zones: tuple[ZoneModel, ...]
+    zone_grid: ZoneGrid
+
+    def zone_at(self, x: int, y: int) -> ZoneModel | None:
+        """Returns the zone containing the (x, y) tile, if any."""
+        position = self.zone_grid.position_at(x, y)
+        return self.zones[position] if position >= 0 else None
+
+    def in_zone(self, x: int, y: int) -> bool:
+        """Whether the (x, y) tile is in any zone."""
+        return self.zone_grid.position_at(x, y) >= 0
+
+    def zone_tiles(self, position: int) -> tuple[tuple[int, int], ...]:
+        """Returns the (x, y) coordinates of the tiles in a zone.
+
+        The `position` is the position of the zone in `zones`.
+        """
+        return self.zone_grid.zone_tiles[position]
+
+
+def _zone_grid_for(
+    zones: tuple[ZoneModel, ...], width: int, height: int, cached: ZoneGrid | None
+) -> ZoneGrid:
+    """Returns the cached zone grid if it matches the zones, or a new one."""
+    if cached is not None and cached.matches(zones, width, height):
+        return cached
+    return ZoneGrid.from_zones(zones, width, height)
+
 
 @dataclass(slots=True, frozen=True)
 class LobbyDataModel:
@@ -234,28 +562,186 @@ class LobbyDataModel:
 
 
 if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+    from .arrays import MapArrays
+
     TileEntity = TankModel | WallModel | BulletModel | LaserModel | MineModel
 
+_TILE_ENTITY_DECODERS: dict[str, Callable[[dict[str, Any]], TileEntity]] = {
+    "tank": TankModel.from_json,
+    "wall": WallModel.from_json,
+    "bullet": BulletModel.from_json,
+    "laser": LaserModel.from_json,
+    "mine": MineModel.from_json,
+}
+
 
 @dataclass(slots=True, frozen=True)
 class TileModel:
     """Represents a tile model on the map."""
 
-    entities: list[TileEntity]
+    entities: Sequence[TileEntity]
     zone: ZoneModel | None
 
+    @property
+    def tank(self) -> TankModel | None:
+        """The tank on the tile or `None`."""
+        for entity in self.entities:
+            if entity.kind is EntityKind.TANK:
+                return entity  # type: ignore[return-value]
+        return None
+
+    @property
+    def wall(self) -> WallModel | None:
+        """The wall on the tile or `None`."""
+        for entity in self.entities:
+            if entity.kind is EntityKind.WALL:
+                return entity  # type: ignore[return-value]
+        return None
+
+    @property
+    def has_wall(self) -> bool:
+        """Whether the tile has a wall."""
+        for entity in self.entities:
+            if entity.kind is EntityKind.WALL:
+                return True
+        return False
+
+    @property
+    def bullet(self) -> BulletModel | None:
+        """The bullet on the tile or `None`."""
+        for entity in self.entities:
+            if entity.kind is EntityKind.BULLET:
+                return entity  # type: ignore[return-value]
+        return None
+
+    @property
+    def mine(self) -> MineModel | None:
+        """The mine on the tile or `None`."""
+        for entity in self.entities:
+            if entity.kind is EntityKind.MINE:
+                return entity  # type: ignore[return-value]
+        return None
+
+    @property
+    def laser(self) -> LaserModel | None:
+        """The laser on the tile or `None`."""
+        for entity in self.entities:
+            if entity.kind is EntityKind.LASER:
+                return entity  # type: ignore[return-value]
+        return None
+
+    @classmethod
+    def from_json(
+        cls, json_data: list[dict[str, Any]], zone: ZoneModel | None
+    ) -> TileModel:
+        """Creates a tile from a list of camelCase JSON tile objects."""
+        entities: list[Any] = []
+        for obj in json_data:
+            decoder = _TILE_ENTITY_DECODERS.get(obj["type"])
+            if decoder is None:
+                raise ValueError(f"Unknown tile type: {obj['type']}")
+            entities.append(decoder(obj.get("payload", {})))
+        return cls(entities, zone)
+
+    @classmethod
+    def from_json_cached(
+        cls,
+        json_data: list[dict[str, Any]],
+        zone: ZoneModel | None,
+        wall_tiles: dict[int, TileModel] | None,
+        cell: int,
+    ) -> TileModel:
+        """Creates a tile, reusing the cached tile if it only has a wall.
+
+        Walls are static, so a tile with a single wall and no zone is
+        the same every tick. It is cached in `wall_tiles` under the `cell`
+        key and reused as long as the payload reports the same wall.
+        Other tiles are always created from the payload.
+        """
+        if (
+            wall_tiles is None
+            or zone is not None
+            or len(json_data) != 1
+            or json_data[0]["type"] != "wall"
+        ):
+            return cls.from_json(json_data, zone)
+
+        wall = WallModel.from_json(json_data[0]["payload"])
+        tile = wall_tiles.get(cell)
+        if tile is None or tile.entities[0] is not wall:
+            tile = wall_tiles[cell] = cls([wall], None)
+        return tile
+
+
+@dataclass(slots=True)
+class EntityIndex:  # pylint: disable=too-many-instance-attributes
+    """Represents the index of the entities on the map.
+
+    The index is filled while the map is decoded, so the lookups
+    do not need to scan the tiles. Walls are static and not indexed.
+
+    Attributes
+    ----------
+    tanks: dict[:class:`str`, :class:`TankModel`]
+        The visible tanks by their owner IDs.
+    positions: dict[:class:`str`, tuple[:class:`int`, :class:`int`]]
+        The (x, y) positions of the visible tanks by their owner IDs.
+    bullets: list[tuple[:class:`int`, :class:`int`, :class:`BulletModel`]]
+        The visible bullets with their (x, y) positions.
+    mines: list[tuple[:class:`int`, :class:`int`, :class:`MineModel`]]
+        The visible mines with their (x, y) positions.
+    lasers: list[tuple[:class:`int`, :class:`int`, :class:`LaserModel`]]
+        The visible laser tiles with their (x, y) positions.
+    """
+
+    tanks: dict[str, TankModel] = field(default_factory=dict)
+    positions: dict[str, tuple[int, int]] = field(default_factory=dict)
+    bullets: list[tuple[int, int, BulletModel]] = field(default_factory=list)
+    mines: list[tuple[int, int, MineModel]] = field(default_factory=list)
+    lasers: list[tuple[int, int, LaserModel]] = field(default_factory=list)
+
+    def add(self, x: int, y: int, entities: Sequence[TileEntity]) -> None:
+        """Adds the entities of the (x, y) tile to the index, except walls."""
+        for entity in entities:
+            kind = entity.kind
+            if kind is EntityKind.TANK:
+                self.tanks[entity.owner_id] = entity  # type: ignore[union-attr]
+                self.positions[entity.owner_id] = (x, y)  # type: ignore[union-attr]
+            elif kind is EntityKind.BULLET:
+                self.bullets.append((x, y, entity))  # type: ignore[arg-type]
+            elif kind is EntityKind.MINE:
+                self.mines.append((x, y, entity))  # type: ignore[arg-type]
+            elif kind is EntityKind.LASER:
+                self.lasers.append((x, y, entity))  # type: ignore[arg-type]
+
+    @classmethod
+    def from_tiles(cls, tiles: Sequence[Sequence[TileModel]]) -> EntityIndex:
+        """Creates an index by scanning the tiles."""
+        index = cls()
+        for y, row in enumerate(tiles):
+            for x, tile in enumerate(row):
+                if tile.entities:
+                    index.add(x, y, tile.entities)
+        return index
+
 
 @dataclass(slots=True, frozen=True)
-class MapModel:
+class MapModel(_ZoneLookupMixin):
     """Represents a map model."""
 
     tiles: tuple[tuple[TileModel, ...], ...]
     zones: tuple[ZoneModel, ...]
+    zone_grid: ZoneGrid
+    index: EntityIndex
 
     @classmethod
     def from_raw(cls, raw: RawMap) -> MapModel:  # pylint: disable=too-many-locals
         """Creates a map from a raw map payload."""
         zones = tuple(ZoneModel.from_raw(z) for z in raw.zones)
+        zone_grid = ZoneGrid.from_zones(zones, len(raw.tiles), len(raw.tiles[0]))
 
         tiles: list[tuple[TileModel, ...]] = []
         for x, row in enumerate(raw.tiles):
@@ -277,14 +763,8 @@ class MapModel:
                     else:
                         raise ValueError(f"Unknown tile type: {obj.type}")
 
-                zone = next(
-                    (
-                        z
-                        for z in zones
-                        if z.x <= x < z.x + z.width and z.y <= y < z.y + z.height
-                    ),
-                    None,
-                )
+                position = zone_grid.position_at(x, y)
+                zone = zones[position] if position >= 0 else None
 
                 tab.append(TileModel(objects, zone))
             tiles.append(tuple(tab))
@@ -293,7 +773,160 @@ class MapModel:
             tuple(tiles[y][x] for y in range(len(tiles))) for x in range(len(tiles[0]))
         ]
 
-        return MapModel(tuple(tiles), tuple(zones))
+        tiles = tuple(tiles)
+        return MapModel(tiles, tuple(zones), zone_grid, EntityIndex.from_tiles(tiles))
+
+    @classmethod
+    def from_json(
+        cls,
+        json_data: dict[str, Any],
+        zone_grid: ZoneGrid | None = None,
+        wall_tiles: dict[int, TileModel] | None = None,
+    ) -> MapModel:
+        """Creates a map from a camelCase JSON dictionary.
+
+        The server sends the tiles column by column (`tiles[x][y]`),
+        so the rows are built directly in the `tiles[y][x]` order.
+
+        The `zone_grid` from a previous game state is reused
+        if the zones have not changed. If `wall_tiles` is given,
+        the tiles with only a wall are cached in it and reused
+        (see :meth:`TileModel.from_json_cached`).
+        """
+        zones = tuple(ZoneModel.from_json(z) for z in json_data["zones"])
+        columns = json_data["tiles"]
+        width, height = len(columns), len(columns[0]) if columns else 0
+        zone_grid = _zone_grid_for(zones, width, height, zone_grid)
+        cells = zone_grid.cells
+        tile_zones = (None, *zones)
+        from_json = TileModel.from_json_cached
+        index = EntityIndex()
+
+        rows: list[tuple[TileModel, ...]] = []
+        for y in range(height):
+            row: list[TileModel] = []
+            for x, column in enumerate(columns):
+                cell = y * width + x
+                objects = column[y]
+                tile = from_json(objects, tile_zones[cells[cell] + 1], wall_tiles, cell)
+                # Walls never share a tile, so the wall tiles are skipped
+                if objects and (len(objects) > 1 or objects[0]["type"] != "wall"):
+                    index.add(x, y, tile.entities)
+                row.append(tile)
+            rows.append(tuple(row))
+
+        return MapModel(tuple(rows), zones, zone_grid, index)
+
+
+class LazyTileRow(Sequence[TileModel]):
+    """Represents a row of the map with tiles built on demand.
+
+    The tiles are created from the parsed JSON when they are first
+    accessed and memoized, so each tile is built at most once.
+    """
+
+    __slots__ = ("_columns", "_y", "_zones", "_zone_grid", "_wall_tiles", "_tiles")
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        columns: list[list[Any]],
+        y: int,
+        zones: tuple[ZoneModel, ...],
+        zone_grid: ZoneGrid,
+        wall_tiles: dict[int, TileModel] | None = None,
+    ) -> None:
+        self._columns = columns
+        self._y = y
+        self._zones = zones
+        self._zone_grid = zone_grid
+        self._wall_tiles = wall_tiles
+        self._tiles: list[TileModel | None] = [None] * len(columns)
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    @overload
+    def __getitem__(self, index: int) -> TileModel: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[TileModel, ...]: ...
+
+    def __getitem__(self, index: int | slice) -> TileModel | tuple[TileModel, ...]:
+        if isinstance(index, slice):
+            return tuple(self[x] for x in range(*index.indices(len(self._tiles))))
+
+        tile = self._tiles[index]
+        if tile is None:
+            x = index if index >= 0 else index + len(self._tiles)
+            position = self._zone_grid.position_at(x, self._y)
+            zone = self._zones[position] if position >= 0 else None
+            tile = TileModel.from_json_cached(
+                self._columns[x][self._y],
+                zone,
+                self._wall_tiles,
+                self._y * len(self._tiles) + x,
+            )
+            self._tiles[x] = tile
+        return tile
+
+    def __iter__(self):
+        for x in range(len(self._tiles)):
+            yield self[x]
+
+    def __repr__(self) -> str:
+        return f"LazyTileRow(y={self._y})"
+
+
+@dataclass(slots=True, frozen=True)
+class LazyMapModel(_ZoneLookupMixin):
+    """Represents a map model with tiles built on demand.
+
+    It has the same interface as :class:`MapModel`, but keeps the parsed
+    JSON and creates each tile only when it is accessed.
+
+    The entity index is built on its first access. It still scans
+    every tile of the parsed JSON, but only the tiles with dynamic
+    entities are built for it.
+    """
+
+    tiles: tuple[LazyTileRow, ...]
+    zones: tuple[ZoneModel, ...]
+    zone_grid: ZoneGrid
+    _columns: list[list[Any]] = field(repr=False, compare=False)
+    _index: EntityIndex | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def index(self) -> EntityIndex:
+        """The index of the entities on the map."""
+        if self._index is None:
+            index = EntityIndex()
+            for y, row in enumerate(self.tiles):
+                for x, column in enumerate(self._columns):
+                    objects = column[y]
+                    if objects and (len(objects) > 1 or objects[0]["type"] != "wall"):
+                        index.add(x, y, row[x].entities)
+            object.__setattr__(self, "_index", index)
+        return self._index  # type: ignore[return-value]
+
+    @classmethod
+    def from_json(
+        cls,
+        json_data: dict[str, Any],
+        zone_grid: ZoneGrid | None = None,
+        wall_tiles: dict[int, TileModel] | None = None,
+    ) -> LazyMapModel:
+        """Creates a lazy map from a camelCase JSON dictionary."""
+        zones = tuple(ZoneModel.from_json(z) for z in json_data["zones"])
+        columns = json_data["tiles"]
+        width, height = len(columns), len(columns[0]) if columns else 0
+        zone_grid = _zone_grid_for(zones, width, height, zone_grid)
+        rows = tuple(
+            LazyTileRow(columns, y, zones, zone_grid, wall_tiles)
+            for y in range(height)
+        )
+        return cls(rows, zones, zone_grid, columns)
 
 
 @dataclass(slots=True, frozen=True)
@@ -304,13 +937,85 @@ class GameStateModel:
     tick: int
     player_id: str
     teams: tuple[TeamModel, ...]
-    map: MapModel
+    map: MapModel | LazyMapModel
+    _arrays: MapArrays | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def my_id(self) -> str:
         """Your player ID."""
         return self.player_id
 
+    @property
+    def tank_by_owner(self) -> dict[str, TankModel]:
+        """The visible tanks by their owner IDs."""
+        return self.map.index.tanks
+
+    @property
+    def my_tank(self) -> TankModel | None:
+        """Your tank, or `None` if it is dead."""
+        return self.map.index.tanks.get(self.player_id)
+
+    @property
+    def my_team(self) -> TeamModel:
+        """Your team.
+
+        Raises
+        ------
+        LookupError
+            If you are not a player of any team.
+        """
+        for team in self.teams:
+            if any(p.id == self.player_id for p in team.players):
+                return team
+        raise LookupError(f"Player {self.player_id!r} is not in any team")
+
+    @property
+    def teammate_id(self) -> str | None:
+        """The ID of your teammate, or `None` if you have no teammate."""
+        for team in self.teams:
+            if any(p.id == self.player_id for p in team.players):
+                return next(
+                    (p.id for p in team.players if p.id != self.player_id), None
+                )
+        return None
+
+    @property
+    def bullets(self) -> list[tuple[int, int, BulletModel]]:
+        """The visible bullets with their (x, y) positions."""
+        return self.map.index.bullets
+
+    @property
+    def mines(self) -> list[tuple[int, int, MineModel]]:
+        """The visible mines with their (x, y) positions."""
+        return self.map.index.mines
+
+    @property
+    def lasers(self) -> list[tuple[int, int, LaserModel]]:
+        """The visible laser tiles with their (x, y) positions."""
+        return self.map.index.lasers
+
+    def position_of(self, owner_id: str) -> tuple[int, int] | None:
+        """Returns the (x, y) position of the tank of the given owner.
+
+        Returns `None` if the tank is dead or not visible.
+        """
+        return self.map.index.positions.get(owner_id)
+
+    def as_arrays(self) -> MapArrays:
+        """Returns the NumPy array view of the map.
+
+        The arrays are built on the first call and cached
+        for this game state. Requires NumPy to be installed.
+        """
+        if self._arrays is None:
+            # pylint: disable-next=import-outside-toplevel
+            from .arrays import MapArrays
+
+            object.__setattr__(self, "_arrays", MapArrays.from_game_state(self))
+        return self._arrays  # type: ignore[return-value]
+
     @classmethod
     def from_payload(cls, payload: GameStatePayload) -> GameStateModel:
         """Creates a game state from a game state payload."""
@@ -325,6 +1030,35 @@ class GameStateModel:
             map=MapModel.from_raw(payload.map),
         )
 
+    @classmethod
+    def from_json(
+        cls,
+        json_data: dict[str, Any],
+        lazy: bool = False,
+        zone_grid: ZoneGrid | None = None,
+        wall_tiles: dict[int, TileModel] | None = None,
+    ) -> GameStateModel:
+        """Creates a game state from a camelCase GAME_STATE payload.
+
+        Unlike :meth:`from_payload`, this skips the raw payload layer
+        and builds the models straight from the parsed JSON.
+
+        If `lazy` is `True`, the map is a :class:`LazyMapModel`
+        and its tiles are built only when accessed.
+
+        The `zone_grid` from a previous game state is reused
+        if the zones have not changed. The `wall_tiles` cache is
+        shared between game states to reuse the tiles with only a wall.
+        """
+        map_model = LazyMapModel if lazy else MapModel
+        return cls(
+            id=json_data["id"],
+            tick=json_data["tick"],
+            player_id=json_data["playerId"],
+            teams=tuple(TeamModel.from_json(t) for t in json_data["teams"]),
+            map=map_model.from_json(json_data["map"], zone_grid, wall_tiles),
+        )
+
 
 @dataclass(slots=True, frozen=True)
 class GameResultModel:
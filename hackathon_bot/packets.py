@@ -0,0 +1,83 @@
+"""This module contains the helpers for the raw packet frames.
+
+The helpers look at the frames before they are decoded,
+so the receive loop can skip the work for the frames it does not need.
+
+Functions
+---------
+peek_packet_type
+    Returns the packet type of a frame without decoding it.
+has_buffered_message
+    Whether a complete message is already buffered by the websocket.
+coalesce_game_states
+    Removes the game states superseded by a newer one in the same batch.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from .enums import PacketType
+
+if TYPE_CHECKING:
+    import websockets
+    from websockets.asyncio.client import ClientConnection
+
+__all__ = ("peek_packet_type", "has_buffered_message", "coalesce_game_states")
+
+# The server sends the type as the first field of the packet
+_TYPE_PATTERN_STR = re.compile(r'\s*\{\s*"type"\s*:\s*(\d+)')
+_TYPE_PATTERN_BYTES = re.compile(rb'\s*\{\s*"type"\s*:\s*(\d+)')
+
+# Longest prefix of a frame that may contain the type
+_PEEK_LENGTH = 64
+
+
+def peek_packet_type(message: websockets.Data) -> int | None:
+    """Returns the packet type of a frame without decoding it.
+
+    Only the beginning of the frame is read.
+    Returns `None` if the type is not the first field of the packet.
+    """
+    if isinstance(message, str):
+        match = _TYPE_PATTERN_STR.match(message, 0, _PEEK_LENGTH)
+    else:
+        match = _TYPE_PATTERN_BYTES.match(message, 0, _PEEK_LENGTH)
+    return int(match.group(1)) if match else None
+
+
+def has_buffered_message(websocket: ClientConnection) -> bool:
+    """Whether a complete message is already buffered by the websocket.
+
+    If `True`, the next `recv` returns without waiting for the network.
+    It relies on the internals of `websockets` and returns `False`
+    if they are not as expected.
+    """
+    frames = getattr(getattr(websocket, "recv_messages", None), "frames", None)
+    queue = getattr(frames, "queue", None)
+    if not queue:
+        return False
+    # A fragmented message is complete only when its last frame is buffered
+    return any(frame.fin for frame in queue)
+
+
+def coalesce_game_states(
+    messages: list[websockets.Data],
+) -> tuple[list[websockets.Data], int]:
+    """Removes the game states superseded by a newer one in the same batch.
+
+    The other packets are kept in order.
+
+    Returns
+    -------
+    tuple[list[websockets.Data], int]
+        The remaining messages and the number of removed game states.
+    """
+    types = [peek_packet_type(m) for m in messages]
+    game_states = [i for i, t in enumerate(types) if t == PacketType.GAME_STATE]
+    if len(game_states) < 2:
+        return messages, 0
+
+    stale = set(game_states[:-1])
+    return [m for i, m in enumerate(messages) if i not in stale], len(stale)
@@ -0,0 +1,277 @@
+"""This module contains the decision process of the bot.
+
+In the process mode, the bot makes its decisions in a separate process,
+so a CPU-bound `next_move` does not hold the GIL of the process
+that answers the server. The main process only forwards the raw
+frames of the packets that need the bot, and sends the encoded
+response actions back to the server.
+
+The raw JSON frame is already a compact representation of the game state,
+so it is sent through a pipe as is and decoded in the decision process.
+The bot lives in the decision process for the whole connection,
+so the data stored in its attributes persists across the ticks.
+
+The decision process is always started with the `spawn` method,
+on every platform, because forking a process that runs threads
+may copy locks held by them. The bot is pickled once and the script
+of the bot must guard its entry point with `if __name__ == "__main__"`.
+If the decision process dies, it is started again from the same
+pickled bot, and the last lobby data is forwarded to it.
+
+Classes
+-------
+DecisionProcess
+    Runs the decisions of a bot in a separate process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import math
+import multiprocessing
+import pickle
+import struct
+import threading
+from typing import TYPE_CHECKING, Callable
+
+import humps
+
+from .decoder import GameStateDecoder
+from .enums import PacketType
+from .latency import TickTimestamps
+from .log import setup_logging, shutdown_logging
+from .packets import peek_packet_type
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+    import websockets
+
+    from .hackathon_bot import StereoTanksBot
+
+__all__ = ("DecisionProcess",)
+
+_logger = logging.getLogger(__name__)
+
+# The first byte of each frame sent to the decision process
+_DECIDE = b"d"
+_NOTIFY = b"n"
+_STOP = b"s"
+
+# The first byte of each frame sent back by the decision process
+_DECODED = b"i"
+_PROVISIONAL = b"p"
+_FINAL = b"f"
+
+# The deadline is sent before the GAME_STATE frame, NaN if unknown
+_DEADLINE = struct.Struct("<d")
+
+# The timestamps of the stages in the decision process
+# are sent before the response action, zeros if not tracked
+_TIMESTAMPS = struct.Struct("<5d")
+
+# Not `fork`, which copies the threads' locks of the main process
+_CONTEXT = multiprocessing.get_context("spawn")
+
+# The number of times a dead decision process is started again
+_MAX_RESTARTS = 3
+
+
+def _serve(pickled_bot: bytes, conn: Connection) -> None:
+    """Handles the frames sent to the decision process."""
+    # pylint: disable=protected-access
+    bot: StereoTanksBot = pickle.loads(pickled_bot)
+    # The background writer of the parent process is not copied
+    setup_logging(bot._log_level, bot._log_json)
+    bot._decoder = GameStateDecoder(bot.lazy_map)
+    codec = bot._codec
+    # Runs the callbacks defined with `async def`
+    loop = asyncio.new_event_loop()
+    is_async = inspect.iscoroutinefunction(bot.next_move)
+    bot._provisional_sink = lambda packet: conn.send_bytes(_PROVISIONAL + packet.encode())
+
+    try:
+        while True:
+            try:
+                frame = conn.recv_bytes()
+            except EOFError:
+                return
+
+            tag, message = frame[:1], frame[1:]
+
+            if tag == _STOP:
+                return
+
+            if tag == _DECIDE:
+                (deadline,) = _DEADLINE.unpack_from(message)
+                deadline = None if math.isnan(deadline) else deadline
+                timestamps = TickTimestamps(0.0) if bot.track_latency else None
+                bot._timestamps = timestamps
+                bot._begin_profiled_tick()
+                packet = None
+                try:
+                    game_state = bot._decode_game_state(message[_DEADLINE.size :])
+                    conn.send_bytes(_DECODED + game_state.id.encode())
+                    if is_async:
+                        packet = loop.run_until_complete(
+                            bot._decide_async(game_state, deadline)
+                        )
+                    else:
+                        packet = bot._decide(game_state, deadline)
+                except Exception:  # pylint: disable=broad-except
+                    # The main process still waits for the final reply
+                    _logger.exception("A game state failed in the decision process")
+                finally:
+                    bot._end_profiled_tick()
+                header = _pack_timestamps(timestamps)
+                body = packet.encode() if packet is not None else b""
+                conn.send_bytes(_FINAL + header + body)
+                continue
+
+            try:
+                data = humps.decamelize(codec.loads(message))
+                loop.run_until_complete(bot._handle_callbacks(data))
+            except Exception:  # pylint: disable=broad-except
+                _logger.exception("A callback failed in the decision process")
+    except KeyboardInterrupt:
+        return
+    finally:
+        loop.close()
+        shutdown_logging()
+
+
+class DecisionProcess:
+    """Runs the decisions of a bot in a separate process.
+
+    The bot is pickled when this object is created, and the decision
+    process starts from that copy, so the bot must be picklable.
+
+    Attributes
+    ----------
+    failed: :class:`bool`
+        Whether the decision process died more often than it can be restarted.
+    """
+
+    def __init__(self, bot: StereoTanksBot) -> None:
+        self._pickled_bot = pickle.dumps(bot)
+        self._conn, self._process = self._create()
+        self._lobby_data: bytes | None = None
+        self._restarts = 0
+        self.failed = False
+        # The frames may be sent from the receive loop and the decision worker
+        self._lock = threading.Lock()
+
+    def _create(self) -> tuple[Connection, multiprocessing.process.BaseProcess]:
+        conn, child_conn = _CONTEXT.Pipe()
+        process = _CONTEXT.Process(
+            target=_serve,
+            args=(self._pickled_bot, child_conn),
+            name="decision-process",
+            daemon=True,
+        )
+        return conn, process
+
+    def start(self) -> None:
+        """Starts the decision process."""
+        self._process.start()
+
+    def restart(self) -> bool:
+        """Replaces a dead decision process with a new one.
+
+        The new process starts from the bot as it was pickled,
+        and the last lobby data is forwarded to it.
+        Returns `False` and sets `failed` if the process
+        was already restarted too many times.
+        """
+        with self._lock:
+            if self._restarts >= _MAX_RESTARTS:
+                self.failed = True
+                return False
+            self._restarts += 1
+            if self._process.is_alive():
+                self._process.terminate()
+            self._conn.close()
+            self._conn, self._process = self._create()
+            self._process.start()
+            if self._lobby_data is not None:
+                self._conn.send_bytes(_NOTIFY + self._lobby_data)
+        return True
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stops the decision process."""
+        try:
+            with self._lock:
+                self._conn.send_bytes(_STOP)
+        except OSError:
+            pass
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._conn.close()
+
+    def decide(
+        self,
+        message: websockets.Data,
+        deadline: float | None,
+        on_decoded: Callable[[str], None],
+        on_provisional: Callable[[str], None],
+        timestamps: TickTimestamps | None = None,
+    ) -> str | None:
+        """Returns the encoded response action to a GAME_STATE frame.
+
+        The ID of the game state is passed to `on_decoded`
+        as soon as the frame is decoded, and the actions proposed
+        by the bot in the meantime are passed to `on_provisional`.
+        The stages timed in the decision process are stored in `timestamps`.
+        Returns `None` if the bot has not made a decision.
+        Only one frame is decided at a time.
+        """
+        header = _DEADLINE.pack(math.nan if deadline is None else deadline)
+        with self._lock:
+            self._conn.send_bytes(_DECIDE + header + _to_bytes(message))
+        while True:
+            reply = self._conn.recv_bytes()
+            tag, packet = reply[:1], reply[1:]
+            if tag == _PROVISIONAL:
+                on_provisional(packet.decode())
+                continue
+            if tag == _DECODED:
+                on_decoded(packet.decode())
+                continue
+            if timestamps is not None:
+                (
+                    timestamps.parsed,
+                    timestamps.built,
+                    timestamps.started,
+                    timestamps.finished,
+                    timestamps.encoded,
+                ) = _TIMESTAMPS.unpack_from(packet)
+            packet = packet[_TIMESTAMPS.size :]
+            return packet.decode() if packet else None
+
+    def notify(self, message: websockets.Data) -> None:
+        """Forwards a frame whose callbacks run in the decision process."""
+        data = _to_bytes(message)
+        if peek_packet_type(data) == PacketType.LOBBY_DATA:
+            # Kept to be forwarded to a restarted process
+            self._lobby_data = data
+        with self._lock:
+            self._conn.send_bytes(_NOTIFY + data)
+
+
+def _pack_timestamps(timestamps: TickTimestamps | None) -> bytes:
+    if timestamps is None:
+        return bytes(_TIMESTAMPS.size)
+    return _TIMESTAMPS.pack(
+        timestamps.parsed,
+        timestamps.built,
+        timestamps.started,
+        timestamps.finished,
+        timestamps.encoded,
+    )
+
+
+def _to_bytes(message: websockets.Data) -> bytes:
+    return message.encode() if isinstance(message, str) else bytes(message)
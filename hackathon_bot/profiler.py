@@ -0,0 +1,193 @@
+"""This module contains the sampling profiler of the decisions.
+
+The profiler samples the stack of the thread that makes the decision
+at a fixed interval, only while a decision is being made. The samples
+are aggregated across the whole game, so the overhead does not grow
+with the number of ticks and the bot does not have to be modified.
+
+Each sample is weighted by the time since the previous one,
+because a busy thread holding the GIL delays the sampling thread.
+The result is written in the collapsed stack format, one line per
+distinct stack with the frames separated by semicolons and followed
+by its time in microseconds. It can be turned into a flame graph with
+`flamegraph.pl` or opened directly in `speedscope`.
+
+Classes
+-------
+SamplingProfiler
+    Samples the stacks of the decisions.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+
+__all__ = ("SamplingProfiler",)
+
+# The deepest stack that is sampled, the frames above are cut off
+_MAX_DEPTH = 256
+
+
+class SamplingProfiler:  # pylint: disable=too-many-instance-attributes
+    """Samples the stacks of the decisions.
+
+    Each decision is marked with :meth:`begin_tick` and :meth:`end_tick`,
+    which must be called from the thread that makes the decision.
+    If `slow_tick_threshold` is set, only the decisions that took
+    at least that many seconds are kept.
+
+    Attributes
+    ----------
+    interval: :class:`float`
+        The sampling interval in seconds.
+    slow_tick_threshold: :class:`float` | None
+        The shortest decision that is kept in seconds,
+        or `None` to keep all decisions.
+    ticks: :class:`int`
+        The number of decisions made.
+    profiled_ticks: :class:`int`
+        The number of decisions whose samples were kept.
+    stacks: :class:`collections.Counter`
+        The sampled time of each stack in microseconds,
+        with the frames from the outermost one.
+    """
+
+    def __init__(
+        self, interval: float = 0.005, slow_tick_threshold: float | None = None
+    ) -> None:
+        self.interval = interval
+        self.slow_tick_threshold = slow_tick_threshold
+        self.ticks = 0
+        self.profiled_ticks = 0
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self._tick_stacks: Counter[tuple[str, ...]] = Counter()
+        self._tick_started = 0.0
+        self._sampled_at = 0.0
+        self._thread_id: int | None = None
+        self._labels: dict[CodeType, str] = {}
+        self._active = threading.Event()
+        self._stopped = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+
+    def start(self) -> None:
+        """Starts the sampling thread."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the sampling thread."""
+        self._stopped = True
+        self._active.set()
+
+    def begin_tick(self) -> None:
+        """Starts sampling the current thread."""
+        self._thread_id = threading.get_ident()
+        self._tick_started = time.monotonic()
+        self._active.set()
+
+    def end_tick(self) -> None:
+        """Stops sampling and keeps the samples if the decision was slow enough."""
+        self._active.clear()
+        duration = time.monotonic() - self._tick_started
+        with self._lock:
+            tick_stacks, self._tick_stacks = self._tick_stacks, Counter()
+            self.ticks += 1
+            threshold = self.slow_tick_threshold
+            if threshold is None or duration >= threshold:
+                self.stacks.update(tick_stacks)
+                self.profiled_ticks += 1
+
+    def reset(self) -> None:
+        """Removes all the samples."""
+        with self._lock:
+            self.ticks = 0
+            self.profiled_ticks = 0
+            self.stacks.clear()
+            self._tick_stacks.clear()
+
+    def function_times(self) -> list[tuple[str, float, float]]:
+        """Returns the estimated time spent in each function.
+
+        Returns
+        -------
+        list[tuple[:class:`str`, :class:`float`, :class:`float`]]
+            The function, its self time and its cumulative time
+            in seconds, sorted by the self time.
+        """
+        own: Counter[str] = Counter()
+        cumulative: Counter[str] = Counter()
+        with self._lock:
+            stacks = list(self.stacks.items())
+        for stack, micros in stacks:
+            own[stack[-1]] += micros
+            # A recursive function is counted once per sample
+            for label in set(stack):
+                cumulative[label] += micros
+        return sorted(
+            (
+                (label, own[label] / 1_000_000, micros / 1_000_000)
+                for label, micros in cumulative.items()
+            ),
+            key=lambda item: (-item[1], -item[2]),
+        )
+
+    def summary(self, limit: int = 15) -> str:
+        """Returns a table of the functions with the most self time."""
+        lines = [
+            f"{self.profiled_ticks} of {self.ticks} decisions profiled",
+            f"{'self (s)':>9}{'cum (s)':>9}  function",
+        ]
+        for label, own, cumulative in self.function_times()[:limit]:
+            lines.append(f"{own:>9.3f}{cumulative:>9.3f}  {label}")
+        return "\n".join(lines)
+
+    def write(self, path: str) -> None:
+        """Writes the samples in the collapsed stack format."""
+        with self._lock:
+            stacks = sorted(self.stacks.items())
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, micros in stacks:
+                file.write(f"{';'.join(stack)} {micros}\n")
+
+    def _run(self) -> None:
+        while True:
+            self._active.wait()
+            if self._stopped:
+                return
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(  # pylint: disable=protected-access
+                self._thread_id  # type: ignore[arg-type]
+            )
+            if frame is None:
+                continue
+            stack = self._stack(frame)
+            sampled_at = time.monotonic()
+            with self._lock:
+                # The decision may have ended during the sleep
+                if self._active.is_set():
+                    since = max(self._sampled_at, self._tick_started)
+                    self._tick_stacks[stack] += int((sampled_at - since) * 1_000_000)
+                    self._sampled_at = sampled_at
+
+    def _stack(self, frame: FrameType | None) -> tuple[str, ...]:
+        labels = []
+        while frame is not None and len(labels) < _MAX_DEPTH:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                filename = os.path.basename(code.co_filename)
+                # The semicolons separate the frames in the collapsed format
+                label = self._labels[code] = (
+                    f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+                )
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
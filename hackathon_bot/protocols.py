@@ -5,6 +5,10 @@ These are used to distinguish between different classes that have the same
 data structure. This is necessary to enable isinstance() to be used with protocols.
 To take advantage of this, the models should have the same weird attribute as the protocol.
 
+The entity protocols (Tank, Wall, Bullet, Laser and Mine) first check
+the `kind` attribute of the instance, so isinstance() is a single comparison
+for the models. Other objects are checked member by member as before.
+
 Notes
 -----
 Protocols are used to provide type hints for the classes
@@ -13,11 +17,15 @@ in the game state, lobby data, and game result.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Protocol, Sequence, runtime_checkable
+from typing import TYPE_CHECKING, Mapping, Protocol, Sequence, runtime_checkable
 
-from hackathon_bot.enums import TankType, WallType
+from hackathon_bot.enums import EntityKind, TankType, WallType
 
 if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+    from hackathon_bot.arrays import MapArrays
     from hackathon_bot.enums import BulletType, Direction, Orientation
 
 
@@ -29,6 +37,7 @@ __all__ = (
     "LobbyPlayer",
     "GameEndPlayer",
     "Turret",
+    "Visibility",
     "Tank",
     "Wall",
     "Bullet",
@@ -398,8 +407,96 @@ class Turret(Protocol):
         raise NotImplementedError
 
 
+class Visibility(Protocol):
+    """Represents the tiles visible by a tank.
+
+    The visibility is packed into bits, so checking a tile
+    and combining the visibility of several tanks is cheap.
+
+    Indexing as `visibility[y][x]` is also supported,
+    but it builds the whole row on each access.
+
+    Examples
+    --------
+    ::
+
+        visible = my_tank.visibility | teammate_tank.visibility
+        if visible.is_visible(x, y):
+            ...
+    """
+
+    @property
+    def width(self) -> int:
+        """The width of the map."""
+        raise NotImplementedError
+
+    @property
+    def height(self) -> int:
+        """The height of the map."""
+        raise NotImplementedError
+
+    def is_visible(self, x: int, y: int) -> bool:
+        """Whether the (x, y) tile is visible.
+
+        Raises
+        ------
+        IndexError
+            If the tile is outside the map.
+        """
+        raise NotImplementedError
+
+    def popcount(self) -> int:
+        """Returns the number of visible tiles."""
+        raise NotImplementedError
+
+    def union(self, *others: Visibility) -> Visibility:
+        """Returns the tiles visible in any of the masks."""
+        raise NotImplementedError
+
+    def intersection(self, *others: Visibility) -> Visibility:
+        """Returns the tiles visible in all of the masks."""
+        raise NotImplementedError
+
+    def __or__(self, other: Visibility) -> Visibility:
+        raise NotImplementedError
+
+    def __and__(self, other: Visibility) -> Visibility:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __getitem__(
+        self, y: int | slice
+    ) -> tuple[bool, ...] | tuple[tuple[bool, ...], ...]:
+        raise NotImplementedError
+
+    def to_numpy(self) -> NDArray[np.bool_]:
+        """Returns the visibility as a NumPy bool array indexed as `[y, x]`.
+
+        Requires NumPy to be installed.
+        """
+        raise NotImplementedError
+
+
+class _EntityProtocolMeta(type(Protocol)):  # type: ignore[misc]
+    """Metaclass of the entity protocols with a fast isinstance() path."""
+
+    def __instancecheck__(cls, instance: object) -> bool:
+        # The empty tiles are often checked as `None`
+        if instance is None:
+            return False
+        kind = getattr(type(instance), "kind", None)
+        expected = _ENTITY_KINDS.get(cls)
+        # The protocols derived by the users are checked structurally
+        # pylint: disable-next=unidiomatic-typecheck
+        if expected is not None and type(kind) is EntityKind:
+            return expected is kind
+        return super().__instancecheck__(instance)
+
+
 @runtime_checkable
-class Tank(Protocol):
+class Tank(Protocol, metaclass=_EntityProtocolMeta):
     """Represents a tank of a player.
 
     Attributes
@@ -414,6 +511,11 @@ class Tank(Protocol):
 
     __instancecheck_tank__: bool
 
+    @property
+    def kind(self) -> EntityKind:
+        """The kind of the entity, always :attr:`EntityKind.TANK`."""
+        raise NotImplementedError
+
     @property
     def owner_id(self) -> str:
         """The unique identifier of the owner."""
@@ -481,7 +583,7 @@ class Tank(Protocol):
         raise NotImplementedError
 
     @property
-    def visibility(self) -> tuple[tuple[bool, ...], ...] | None:
+    def visibility(self) -> Visibility | None:
         """The visibility of the tank.
 
         It is `None` for players in opposition team.
@@ -490,7 +592,7 @@ class Tank(Protocol):
 
 
 @runtime_checkable
-class Wall(Protocol):
+class Wall(Protocol, metaclass=_EntityProtocolMeta):
     """Represents a wall in the game.
 
     Attributes
@@ -501,6 +603,11 @@ class Wall(Protocol):
 
     __instancecheck_wall__: bool
 
+    @property
+    def kind(self) -> EntityKind:
+        """The kind of the entity, always :attr:`EntityKind.WALL`."""
+        raise NotImplementedError
+
     @property
     def type(self) -> WallType:
         """The type of the wall."""
@@ -508,7 +615,7 @@ class Wall(Protocol):
 
 
 @runtime_checkable
-class Bullet(Protocol):
+class Bullet(Protocol, metaclass=_EntityProtocolMeta):
     """Represents a bullet in the game.
 
     Attributes
@@ -525,6 +632,11 @@ class Bullet(Protocol):
 
     __instancecheck_bullet__: bool
 
+    @property
+    def kind(self) -> EntityKind:
+        """The kind of the entity, always :attr:`EntityKind.BULLET`."""
+        raise NotImplementedError
+
     @property
     def id(self) -> int:
         """The unique identifier of the bullet."""
@@ -547,7 +659,7 @@ class Bullet(Protocol):
 
 
 @runtime_checkable
-class Laser(Protocol):
+class Laser(Protocol, metaclass=_EntityProtocolMeta):
     """Represents a laser in the game.
 
     Attributes
@@ -560,6 +672,11 @@ class Laser(Protocol):
 
     __instancecheck_laser__: bool
 
+    @property
+    def kind(self) -> EntityKind:
+        """The kind of the entity, always :attr:`EntityKind.LASER`."""
+        raise NotImplementedError
+
     @property
     def id(self) -> int:
         """The unique identifier of the laser."""
@@ -572,7 +689,7 @@ class Laser(Protocol):
 
 
 @runtime_checkable
-class Mine(Protocol):
+class Mine(Protocol, metaclass=_EntityProtocolMeta):
     """Represents a mine in the game.
 
     Attributes
@@ -587,6 +704,11 @@ class Mine(Protocol):
 
     __instancecheck_mine__: bool
 
+    @property
+    def kind(self) -> EntityKind:
+        """The kind of the entity, always :attr:`EntityKind.MINE`."""
+        raise NotImplementedError
+
     @property
     def id(self) -> int:
         """The unique identifier of the mine."""
@@ -701,6 +823,14 @@ class LobbyData(Protocol):
         raise NotImplementedError
 
 
+_ENTITY_KINDS: dict[type, EntityKind] = {
+    Tank: EntityKind.TANK,
+    Wall: EntityKind.WALL,
+    Bullet: EntityKind.BULLET,
+    Laser: EntityKind.LASER,
+    Mine: EntityKind.MINE,
+}
+
 if TYPE_CHECKING:
     TileEntity = Tank | Wall | Bullet | Laser | Mine
 
@@ -710,16 +840,18 @@ class Tile(Protocol):
 
     Attributes
     ----------
-    entities: list[:class:`TileEntity`]
+    entities: Sequence[:class:`TileEntity`]
         The entities present on the tile.
     zone: :class:`Zone` | `None`
         The zone in the tile.
     """
 
     @property
-    def entities(self) -> list[TileEntity]:
+    def entities(self) -> Sequence[TileEntity]:
         """The entities present on the tile.
 
+        The sequence may be shared with other tiles, so it must not be modified.
+
         The entity can be one of the following types:
         - :class:`Wall`
         - :class:`Bullet`
@@ -759,9 +891,48 @@ class Tile(Protocol):
 
         Without checking the type of the entity, the linter may suggest
         all attributes of the entities in the tile, which can be misleading.
+
+        The `kind` attribute of the entities can be compared directly,
+        which is the cheapest way to dispatch on many entities.
+
+        ::
+
+            for entity in tile.entities:
+                if entity.kind is EntityKind.BULLET:
+                    # The entity is a bullet.
         """
         raise NotImplementedError
 
+    @property
+    def tank(self) -> Tank | None:
+        """The tank on the tile or `None`."""
+        raise NotImplementedError
+
+    @property
+    def wall(self) -> Wall | None:
+        """The wall on the tile or `None`."""
+        raise NotImplementedError
+
+    @property
+    def has_wall(self) -> bool:
+        """Whether the tile has a wall."""
+        raise NotImplementedError
+
+    @property
+    def bullet(self) -> Bullet | None:
+        """The bullet on the tile or `None`."""
+        raise NotImplementedError
+
+    @property
+    def mine(self) -> Mine | None:
+        """The mine on the tile or `None`."""
+        raise NotImplementedError
+
+    @property
+    def laser(self) -> Laser | None:
+        """The laser on the tile or `None`."""
+        raise NotImplementedError
+
     @property
     def zone(self) -> Zone | None:
         """The zone in the tile.
@@ -783,6 +954,18 @@ class Map(Protocol):
         and the second index is the x-coordinate.
     zones: Sequence[:class:`Zone`]
         The zones on the map.
+
+    Examples
+    --------
+    The zone membership of the tiles is computed once per game,
+    so the zone lookups below do not scan the zones.
+
+    ::
+
+        >>> game_state.map.in_zone(x, y)
+        >>> game_state.map.zone_at(x, y)
+        >>> for x, y in game_state.map.zone_tiles(0):
+        ...     tile = game_state.map.tiles[y][x]
     """
 
     @property
@@ -799,6 +982,25 @@ class Map(Protocol):
         """The zones on the map."""
         raise NotImplementedError
 
+    def zone_at(self, x: int, y: int) -> Zone | None:
+        """Returns the zone containing the (x, y) tile.
+
+        If the tile is not in a zone or is out of the map,
+        this method returns `None`.
+        """
+        raise NotImplementedError
+
+    def in_zone(self, x: int, y: int) -> bool:
+        """Whether the (x, y) tile is in any zone."""
+        raise NotImplementedError
+
+    def zone_tiles(self, position: int) -> tuple[tuple[int, int], ...]:
+        """Returns the (x, y) coordinates of the tiles in a zone.
+
+        The `position` is the position of the zone in `zones`.
+        """
+        raise NotImplementedError
+
 
 class GameState(Protocol):
     """Represents the game state.
@@ -815,6 +1017,25 @@ class GameState(Protocol):
         The sequence of teams in the game state.
     map: :class:`Map`
         The map of the game state.
+    tank_by_owner: Mapping[:class:`str`, :class:`Tank`]
+        The visible tanks by their owner identifiers.
+    my_tank: :class:`Tank` | `None`
+        Your tank.
+    my_team: :class:`GameStateTeam`
+        Your team.
+    teammate_id: :class:`str` | `None`
+        The unique identifier of your teammate.
+    bullets: Sequence[tuple[:class:`int`, :class:`int`, :class:`Bullet`]]
+        The visible bullets with their coordinates.
+    mines: Sequence[tuple[:class:`int`, :class:`int`, :class:`Mine`]]
+        The visible mines with their coordinates.
+    lasers: Sequence[tuple[:class:`int`, :class:`int`, :class:`Laser`]]
+        The visible laser tiles with their coordinates.
+
+    Notes
+    -----
+    The entity lookups are indexed while the game state is decoded,
+    so they do not scan the map.
     """
 
     @property
@@ -852,6 +1073,74 @@ class GameState(Protocol):
         """The map of the game state."""
         raise NotImplementedError
 
+    @property
+    def tank_by_owner(self) -> Mapping[str, Tank]:
+        """The visible tanks by their owner identifiers."""
+        raise NotImplementedError
+
+    @property
+    def my_tank(self) -> Tank | None:
+        """Your tank.
+
+        It is `None` if your tank is dead.
+        """
+        raise NotImplementedError
+
+    @property
+    def my_team(self) -> GameStateTeam:
+        """Your team.
+
+        Raises
+        ------
+        LookupError
+            If you are not a player of any team.
+        """
+        raise NotImplementedError
+
+    @property
+    def teammate_id(self) -> str | None:
+        """The unique identifier of your teammate.
+
+        It is `None` if you have no teammate or no team.
+        """
+        raise NotImplementedError
+
+    @property
+    def bullets(self) -> Sequence[tuple[int, int, Bullet]]:
+        """The visible bullets with their (x, y) coordinates."""
+        raise NotImplementedError
+
+    @property
+    def mines(self) -> Sequence[tuple[int, int, Mine]]:
+        """The visible mines with their (x, y) coordinates."""
+        raise NotImplementedError
+
+    @property
+    def lasers(self) -> Sequence[tuple[int, int, Laser]]:
+        """The visible laser tiles with their (x, y) coordinates.
+
+        A laser covers several tiles, each listed separately
+        with the same laser identifier.
+        """
+        raise NotImplementedError
+
+    def position_of(self, owner_id: str) -> tuple[int, int] | None:
+        """Returns the (x, y) coordinates of the tank of the given owner.
+
+        It is `None` if the tank is dead or not visible.
+        """
+        raise NotImplementedError
+
+    def as_arrays(self) -> MapArrays:
+        """Returns the layers of the map as NumPy arrays.
+
+        The arrays are built on the first call and cached
+        for this game state. Requires NumPy to be installed.
+
+        See :class:`hackathon_bot.arrays.MapArrays` for the available layers.
+        """
+        raise NotImplementedError
+
 
 class GameResult(Protocol):
     """Represents the game result.
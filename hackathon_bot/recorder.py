@@ -0,0 +1,374 @@
+"""This module contains the recorder of the matches.
+
+The recorder captures the raw frames received from and sent to
+the server, with their :func:`time.monotonic` timestamps.
+The frames are handed to a background thread, which compresses
+them in segments and appends them to the file, so recording
+never makes the bot wait for the disk.
+
+The file starts with a header, followed by the segments.
+Each segment is a zlib-compressed block of frames with its own header,
+so a file left without an index by a crash can still be read.
+When the recorder is closed, an index of the game states by game
+and tick and a footer pointing to it are appended, so a long match
+can be opened at any tick without decompressing the segments before it.
+The games of a recording are numbered from 0, and a new game starts
+with each GAME_STARTING packet received after a game state.
+
+Classes
+-------
+RecordedFrame
+    Represents a recorded frame.
+MatchRecorder
+    Records the frames of a match to a file.
+MatchReader
+    Reads the frames of a recorded match.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import queue
+import re
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, BinaryIO, Iterator
+
+from .enums import FrameDirection, PacketType
+from .packets import peek_packet_type
+
+if TYPE_CHECKING:
+    import websockets
+
+__all__ = ("RecordedFrame", "MatchRecorder", "MatchReader")
+
+# The magic, the format version and the wall clock time of the start
+_HEADER = struct.Struct("<8sHd")
+_MAGIC = b"STRECORD"
+_VERSION = 2
+
+# The magic, the compressed and the uncompressed size of a segment
+_SEGMENT = struct.Struct("<4sII")
+_SEGMENT_MAGIC = b"SEGM"
+
+# The timestamp, the direction and the size of a frame in a segment
+_FRAME = struct.Struct("<dBI")
+
+# The game, the tick, the offset of the segment and the offset in the segment
+_INDEX_ENTRY = struct.Struct("<IqQI")
+
+# The offset and the number of entries of the index
+_FOOTER = struct.Struct("<QI8s")
+_FOOTER_MAGIC = b"STRINDEX"
+
+_TICK_PATTERN = re.compile(rb'"tick"\s*:\s*(\d+)')
+
+
+@dataclass(slots=True, frozen=True)
+class RecordedFrame:
+    """Represents a recorded frame.
+
+    Attributes
+    ----------
+    timestamp: :class:`float`
+        The :func:`time.monotonic` time the frame was received or sent.
+    direction: :class:`FrameDirection`
+        Whether the frame was received or sent.
+    data: :class:`bytes`
+        The frame encoded as UTF-8.
+    """
+
+    timestamp: float
+    direction: FrameDirection
+    data: bytes
+
+    @property
+    def packet_type(self) -> int | None:
+        """The packet type of the frame, `None` if it cannot be read."""
+        return peek_packet_type(self.data)
+
+
+class MatchRecorder:  # pylint: disable=too-many-instance-attributes
+    """Records the frames of a match to a file.
+
+    The frames are compressed and written by a background thread.
+    A segment is written when it reaches `segment_size` bytes,
+    or when no frame was recorded for `flush_interval` seconds.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The path of the file. An existing file is overwritten.
+    segment_size: :class:`int`
+        The uncompressed size of a segment in bytes.
+    compression_level: :class:`int`
+        The zlib compression level of the segments.
+    flush_interval: :class:`float`
+        The longest time in seconds the recorded frames wait in memory.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        segment_size: int = 1 << 18,
+        compression_level: int = 6,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.segment_size = segment_size
+        self.compression_level = compression_level
+        self.flush_interval = flush_interval
+        self._frames: queue.SimpleQueue[
+            tuple[float, int, websockets.Data] | None
+        ] = queue.SimpleQueue()
+        self._file: BinaryIO | None = None
+        self._segment = bytearray()
+        self._segment_ticks: list[tuple[int, int, int]] = []
+        self._index: list[tuple[int, int, int, int]] = []
+        self._keys = _GameStateKeys()
+        self._thread = threading.Thread(
+            target=self._run, name="match-recorder", daemon=True
+        )
+
+    def start(self) -> None:
+        """Opens the file and starts the writer thread."""
+        # pylint: disable-next=consider-using-with
+        self._file = open(self.path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, time.time()))
+        self._thread.start()
+
+    def close(self, timeout: float | None = None) -> None:
+        """Writes the recorded frames and the index, then closes the file."""
+        if not self._thread.is_alive():
+            return
+        self._frames.put(None)
+        self._thread.join(timeout)
+
+    def record_received(
+        self, frame: websockets.Data, timestamp: float | None = None
+    ) -> None:
+        """Records a frame received from the server."""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self._frames.put((timestamp, FrameDirection.RECEIVED, frame))
+
+    def record_sent(self, frame: websockets.Data, timestamp: float | None = None) -> None:
+        """Records a frame sent to the server."""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self._frames.put((timestamp, FrameDirection.SENT, frame))
+
+    def _run(self) -> None:
+        file = self._file
+        assert file is not None
+        try:
+            while True:
+                try:
+                    item = self._frames.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    self._write_segment(file)
+                    continue
+                if item is None:
+                    break
+                self._append(*item)
+                if len(self._segment) >= self.segment_size:
+                    self._write_segment(file)
+
+            self._write_segment(file)
+            self._write_index(file)
+        finally:
+            file.close()
+
+    def _append(self, timestamp: float, direction: int, frame: websockets.Data) -> None:
+        data = frame.encode() if isinstance(frame, str) else bytes(frame)
+        key = self._keys.key(direction, data)
+        if key is not None:
+            self._segment_ticks.append((*key, len(self._segment)))
+        self._segment += _FRAME.pack(timestamp, direction, len(data))
+        self._segment += data
+
+    def _write_segment(self, file: BinaryIO) -> None:
+        if not self._segment:
+            return
+        offset = file.tell()
+        compressed = zlib.compress(self._segment, self.compression_level)
+        file.write(_SEGMENT.pack(_SEGMENT_MAGIC, len(compressed), len(self._segment)))
+        file.write(compressed)
+        file.flush()
+        self._index.extend(
+            (game, tick, offset, inner) for game, tick, inner in self._segment_ticks
+        )
+        self._segment = bytearray()
+        self._segment_ticks.clear()
+
+    def _write_index(self, file: BinaryIO) -> None:
+        offset = file.tell()
+        for entry in self._index:
+            file.write(_INDEX_ENTRY.pack(*entry))
+        file.write(_FOOTER.pack(offset, len(self._index), _FOOTER_MAGIC))
+        file.flush()
+
+
+class MatchReader:
+    """Reads the frames of a recorded match.
+
+    The index at the end of the file is used to find the ticks.
+    If the file has no index, because the recorder was not closed,
+    the index is rebuilt by reading all segments.
+
+    Attributes
+    ----------
+    started_at: :class:`float`
+        The wall clock time the recording started.
+    ticks: list[tuple[:class:`int`, :class:`int`]]
+        The (game, tick) of the recorded game states, in order.
+    """
+
+    def __init__(self, path: str) -> None:
+        # pylint: disable-next=consider-using-with
+        self._file = open(path, "rb")
+        try:
+            header = self._file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"{path} is not a match recording")
+            magic, version, self.started_at = _HEADER.unpack(header)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{path} is not a match recording")
+            self._end, entries = self._read_index()
+        except struct.error as e:
+            self._file.close()
+            raise ValueError(f"{path} is a corrupted match recording") from e
+        except BaseException:
+            self._file.close()
+            raise
+        entries.sort()
+        self.ticks = [(game, tick) for game, tick, _, _ in entries]
+        self._positions = [(offset, inner) for _, _, offset, inner in entries]
+
+    def __enter__(self) -> MatchReader:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[RecordedFrame]:
+        return self.frames()
+
+    def close(self) -> None:
+        """Closes the file."""
+        self._file.close()
+
+    def frames(
+        self, from_tick: int | None = None, game: int = 0
+    ) -> Iterator[RecordedFrame]:
+        """Returns the recorded frames in order.
+
+        Parameters
+        ----------
+        from_tick: :class:`int` | None
+            If set, the frames start at the first game state
+            of this tick, or of the next recorded one.
+        game: :class:`int`
+            The game of `from_tick`, counted from 0.
+        """
+        if from_tick is None:
+            yield from self._frames_from(_HEADER.size, 0)
+            return
+        position = bisect.bisect_left(self.ticks, (game, from_tick))
+        if position < len(self.ticks):
+            yield from self._frames_from(*self._positions[position])
+
+    def _frames_from(self, offset: int, inner: int) -> Iterator[RecordedFrame]:
+        while offset < self._end:
+            segment, offset = self._read_segment(offset)
+            while inner < len(segment):
+                timestamp, direction, size = _FRAME.unpack_from(segment, inner)
+                inner += _FRAME.size
+                data = bytes(segment[inner : inner + size])
+                inner += size
+                yield RecordedFrame(timestamp, FrameDirection(direction), data)
+            inner = 0
+
+    def _read_segment(self, offset: int) -> tuple[bytes, int]:
+        """Returns the decompressed segment and the offset of the next one."""
+        self._file.seek(offset)
+        magic, size, _ = _SEGMENT.unpack(self._file.read(_SEGMENT.size))
+        if magic != _SEGMENT_MAGIC:
+            raise ValueError(f"No segment at offset {offset}")
+        return zlib.decompress(self._file.read(size)), offset + _SEGMENT.size + size
+
+    def _read_index(self) -> tuple[int, list[tuple[int, int, int, int]]]:
+        """Returns the end of the segments and the entries of the index."""
+        size = self._file.seek(0, os.SEEK_END)
+        if size >= _HEADER.size + _FOOTER.size:
+            self._file.seek(size - _FOOTER.size)
+            offset, count, magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+            # A footer pointing outside the file is rebuilt like a missing one
+            if (
+                magic == _FOOTER_MAGIC
+                and offset + count * _INDEX_ENTRY.size == size - _FOOTER.size
+            ):
+                self._file.seek(offset)
+                data = self._file.read(count * _INDEX_ENTRY.size)
+                return offset, list(_INDEX_ENTRY.iter_unpack(data))
+        return self._rebuild_index(size)
+
+    def _rebuild_index(self, size: int) -> tuple[int, list[tuple[int, int, int, int]]]:
+        entries: list[tuple[int, int, int, int]] = []
+        keys = _GameStateKeys()
+        offset = _HEADER.size
+        while offset + _SEGMENT.size <= size:
+            try:
+                segment, next_offset = self._read_segment(offset)
+            except (ValueError, zlib.error, struct.error):
+                # The last segment was not written completely
+                break
+            inner = 0
+            while inner < len(segment):
+                _, direction, length = _FRAME.unpack_from(segment, inner)
+                data = segment[inner + _FRAME.size : inner + _FRAME.size + length]
+                key = keys.key(direction, data)
+                if key is not None:
+                    entries.append((*key, offset, inner))
+                inner += _FRAME.size + length
+            offset = next_offset
+        return offset, entries
+
+
+class _GameStateKeys:
+    """Numbers the games and finds the first game state of each tick."""
+
+    __slots__ = ("game", "_last_tick")
+
+    def __init__(self) -> None:
+        self.game = 0
+        self._last_tick = -1
+
+    def key(self, direction: int, data: bytes) -> tuple[int, int] | None:
+        """Returns the (game, tick) of the first received game state of a tick.
+
+        Returns `None` for the other frames.
+        """
+        if direction != FrameDirection.RECEIVED:
+            return None
+        packet_type = peek_packet_type(data)
+        if packet_type == PacketType.GAME_STARTING:
+            if self._last_tick >= 0:
+                self.game += 1
+                self._last_tick = -1
+            return None
+        if packet_type != PacketType.GAME_STATE:
+            return None
+        # The tick is read without decoding the frame
+        match = _TICK_PATTERN.search(data)
+        if match is None:
+            return None
+        tick = int(match.group(1))
+        if tick == self._last_tick:
+            return None
+        self._last_tick = tick
+        return self.game, tick
@@ -0,0 +1,234 @@
+"""Replays recorded matches to a bot at full speed.
+
+The received frames of each recording are fed to a new instance
+of the bot, without a websocket and without waiting between the ticks.
+The callbacks are called the same way as during a match, and the time
+spent decoding the game states and in `next_move` is measured.
+The recordings are replayed in parallel, one process per recording.
+
+The recordings are files written with `--record`, or files
+with one received frame per line, as used by the codec benchmark.
+
+Examples
+--------
+Replay two matches to the bot defined in `main.py`:
+
+::
+
+    python -m hackathon_bot.replay main:MyBot match-1.rec match-2.rec
+
+Replay all matches in a directory using four cores:
+
+::
+
+    python -m hackathon_bot.replay main:MyBot matches/*.rec --jobs 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import inspect
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator
+
+from .enums import FrameDirection, PacketType
+from .hackathon_bot import StereoTanksBot
+from .latency import LatencyTracker, TickTimestamps
+from .log import setup_logging, shutdown_logging
+from .packets import peek_packet_type
+from .recorder import MatchReader
+
+# The stages measured during a replay
+_STAGES = ("parse", "build", "prepare", "next_move", "encode", "total")
+
+# The packets whose callbacks are called
+_CALLBACK_PACKETS = (
+    PacketType.LOBBY_DATA,
+    PacketType.GAME_STARTING,
+    PacketType.GAME_ENDED,
+    PacketType.CUSTOM_WARNING,
+    PacketType.PLAYER_ALREADY_MADE_ACTION_WARNING,
+    PacketType.ACTION_IGNORED_DUE_TO_DEAD_WARNING,
+    PacketType.SLOW_RESPONSE_WARNING,
+)
+
+
+@dataclass(slots=True)
+class ReplayResult:
+    """Represents the result of a replay.
+
+    Attributes
+    ----------
+    path: :class:`str`
+        The path of the recording.
+    ticks: :class:`int`
+        The number of replayed game states.
+    seconds: :class:`float`
+        The wall time of the replay.
+    latency: :class:`LatencyTracker`
+        The latencies of the stages of the decisions.
+    """
+
+    path: str
+    ticks: int
+    seconds: float
+    latency: LatencyTracker
+
+    @property
+    def decode_rate(self) -> float:
+        """The number of game states decoded per second."""
+        histograms = self.latency.histograms
+        seconds = histograms["parse"].total + histograms["build"].total
+        return self.ticks / seconds if seconds else 0.0
+
+    @property
+    def next_move_rate(self) -> float:
+        """The number of `next_move` calls per second."""
+        seconds = self.latency.histograms["next_move"].total
+        return self.ticks / seconds if seconds else 0.0
+
+
+def load_bot_class(spec: str) -> type[StereoTanksBot]:
+    """Imports a bot class given as `module:Class` or `module.Class`."""
+    separator = ":" if ":" in spec else "."
+    module_name, _, class_name = spec.rpartition(separator)
+    if not module_name:
+        raise ValueError(f"Invalid bot class: {spec}")
+    bot_class = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(bot_class, type) and issubclass(bot_class, StereoTanksBot)):
+        raise TypeError(f"{spec} is not a StereoTanksBot subclass")
+    return bot_class
+
+
+def read_frames(path: str) -> Iterator[bytes]:
+    """Returns the received frames of a recording."""
+    try:
+        reader = MatchReader(path)
+    except ValueError:
+        # Not a recording, but a file with one frame per line
+        with open(path, "rb") as file:
+            for line in file:
+                line = line.strip()
+                if line:
+                    yield line
+        return
+
+    with reader:
+        for frame in reader:
+            if frame.direction == FrameDirection.RECEIVED:
+                yield frame.data
+
+
+def replay(bot: StereoTanksBot, frames: Iterator[bytes], path: str = "") -> ReplayResult:
+    """Replays the frames to a bot and measures its decisions."""
+    # pylint: disable=protected-access
+    loop = asyncio.new_event_loop()
+    is_async = inspect.iscoroutinefunction(bot.next_move)
+    latency = LatencyTracker()
+    ticks = 0
+    started = time.perf_counter()
+
+    try:
+        for frame in frames:
+            packet_type = peek_packet_type(frame)
+            if packet_type is None:
+                packet_type = bot._codec.loads(frame)["type"]
+
+            if packet_type in _CALLBACK_PACKETS:
+                loop.run_until_complete(bot._handle_callbacks(bot._decode_packet(frame)))
+                continue
+            if packet_type != PacketType.GAME_STATE:
+                continue
+
+            timestamps = TickTimestamps(time.monotonic())
+            timestamps.dequeued = timestamps.received
+            bot._timestamps = timestamps
+            game_state = bot._decode_game_state(frame)
+            if is_async:
+                packet = loop.run_until_complete(bot._decide_async(game_state))
+            else:
+                packet = bot._decide(game_state)
+            if packet is None:
+                # The error is already logged, the tick is not measured
+                continue
+            timestamps.sent = timestamps.encoded
+            latency.record(timestamps)
+            ticks += 1
+    finally:
+        bot._timestamps = None
+        loop.close()
+
+    return ReplayResult(path, ticks, time.perf_counter() - started, latency)
+
+
+def replay_file(bot_spec: str, path: str, log_level: str = "WARNING") -> ReplayResult:
+    """Replays a recording to a new instance of the bot."""
+    setup_logging(log_level)
+    try:
+        bot = load_bot_class(bot_spec)()
+        return replay(bot, read_frames(path), path)
+    finally:
+        # The worker processes exit without running the exit handlers
+        shutdown_logging()
+
+
+def main() -> None:
+    """Runs the replays from the command line."""
+
+    parser = argparse.ArgumentParser(description="Replay recorded matches to a bot")
+    parser.add_argument("bot", help="The bot class, for example main:MyBot")
+    parser.add_argument("recordings", nargs="+", help="The recorded matches")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of recordings replayed in parallel (default: number of cores)",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+        default="WARNING",
+        help="Lowest level of the messages logged by the bot (default: WARNING)",
+    )
+    args = parser.parse_args()
+
+    # Fails early if the bot cannot be imported
+    load_bot_class(args.bot)
+
+    jobs = max(min(args.jobs, len(args.recordings)), 1)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = list(
+            executor.map(
+                replay_file,
+                [args.bot] * len(args.recordings),
+                args.recordings,
+                [args.log_level] * len(args.recordings),
+            )
+        )
+    seconds = time.perf_counter() - started
+
+    print(f"{'recording':<30}{'ticks':>8}{'decode/s':>12}{'next_move/s':>14}")
+    latency = LatencyTracker()
+    for result in results:
+        latency.merge(result.latency)
+        name = os.path.basename(result.path)
+        print(
+            f"{name:<30}{result.ticks:>8}"
+            f"{result.decode_rate:>12.0f}{result.next_move_rate:>14.0f}"
+        )
+
+    ticks = sum(result.ticks for result in results)
+    print(f"\n{ticks} ticks in {seconds:.2f} s ({ticks / seconds:.0f} ticks/s, {jobs} jobs)")
+    print(f"Latency per tick (ms):\n{latency.summary(_STAGES)}")
+
+
+if __name__ == "__main__":
+    main()
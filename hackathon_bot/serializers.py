@@ -0,0 +1,176 @@
+"""This module contains the serializers of the outbound packets.
+
+Most of the packets sent by the bot are known in advance or differ
+only by the game state ID, so they are encoded once and reused.
+
+Classes
+-------
+PacketSerializer
+    Encodes the outbound packets with a JSON codec.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any, Callable
+
+import humps
+
+from .actions import (
+    AbilityUse,
+    CaptureZone,
+    GoTo,
+    Movement,
+    Pass,
+    ResponseAction,
+    Rotation,
+)
+from .enums import PacketType
+from .json_codecs import JsonCodec
+from .payloads import Payload
+
+__all__ = ("PacketSerializer",)
+
+# Packets without a payload that are sent during a game
+_CONSTANT_PACKETS = (
+    PacketType.PONG,
+    PacketType.READY_TO_RECEIVE_GAME_STATE,
+    PacketType.LOBBY_DATA_REQUEST,
+    PacketType.GAME_STATUS_REQUEST,
+)
+
+# Replaced by the game state ID in the packet templates
+_GAME_STATE_ID = "\x00gameStateId\x00"
+
+# The costs and penalties are usually reused, but they can be
+# built from arbitrary values, so their caches are bounded
+_FRAGMENT_CACHE_SIZE = 256
+
+
+class PacketSerializer:
+    """Encodes the outbound packets with a JSON codec.
+
+    The packets without a payload are encoded once.
+    The response actions that are fully defined by their
+    fields (all except :class:`GoTo`) are encoded once per
+    distinct action as a template around the game state ID.
+    The costs and penalties of :class:`GoTo` actions are encoded
+    once per distinct value and inserted into the packet.
+
+    Attributes
+    ----------
+    codec: :class:`JsonCodec`
+        The codec used to encode the packets.
+    """
+
+    __slots__ = (
+        "codec",
+        "_constants",
+        "_templates",
+        "_go_to_template",
+        "_costs",
+        "_penalties",
+        "_encoders",
+    )
+
+    def __init__(self, codec: JsonCodec) -> None:
+        self.codec = codec
+        self._constants: dict[PacketType, str] = {}
+        self._templates: dict[ResponseAction, tuple[str, str]] = {}
+        self._costs: dict[tuple[float, ...], str] = {}
+        self._penalties: dict[tuple[Any, ...], str] = {}
+        self._encoders: dict[type[ResponseAction], Callable[[Any, str], str]] = {
+            Movement: self._encode_templated,
+            Rotation: self._encode_templated,
+            AbilityUse: self._encode_templated,
+            CaptureZone: self._encode_templated,
+            Pass: self._encode_templated,
+            GoTo: self._encode_go_to,
+        }
+
+        for packet_type in _CONSTANT_PACKETS:
+            self.encode(packet_type)
+
+        # The other fields of GoTo are appended after the game state ID
+        self._go_to_template = self._split(
+            codec.dumps(
+                {
+                    "type": PacketType.GO_TO.value,
+                    "payload": {"gameStateId": _GAME_STATE_ID},
+                }
+            )
+        )
+
+    def encode(self, packet_type: PacketType, payload: Payload | None = None) -> str:
+        """Encodes a packet.
+
+        The packets without a payload are cached.
+        """
+        if payload is None:
+            packet = self._constants.get(packet_type)
+            if packet is None:
+                packet = self._constants[packet_type] = self.codec.dumps(
+                    {"type": packet_type.value}
+                )
+            return packet
+
+        return self.codec.dumps(
+            {"type": packet_type.value, "payload": humps.camelize(asdict(payload))}
+        )
+
+    def encode_action(self, action: ResponseAction, game_state_id: str) -> str:
+        """Encodes a response action to the game state with the given ID."""
+        encoder = self._encoders.get(type(action))
+        if encoder is None:
+            return self.encode(action.packet_type, action.to_payload(game_state_id))
+        return encoder(action, game_state_id)
+
+    def _split(self, packet: str) -> tuple[str, str]:
+        """Splits an encoded packet around the game state ID."""
+        prefix, suffix = packet.split(self.codec.dumps(_GAME_STATE_ID))
+        return prefix, suffix
+
+    def _encode_templated(self, action: ResponseAction, game_state_id: str) -> str:
+        template = self._templates.get(action)
+        if template is None:
+            packet = self.encode(action.packet_type, action.to_payload(_GAME_STATE_ID))
+            template = self._templates[action] = self._split(packet)
+        return template[0] + self.codec.dumps(game_state_id) + template[1]
+
+    def _encode_go_to(self, action: GoTo, game_state_id: str) -> str:
+        prefix, suffix = self._go_to_template
+        turret_rotation = action.turret_rotation
+        return (
+            f"{prefix}{self.codec.dumps(game_state_id)}"
+            f',"x":{int(action.x)},"y":{int(action.y)},"turretRotation":'
+            f"{'null' if turret_rotation is None else int(turret_rotation)}"
+            f',"costs":{self._encode_costs(action.costs)}'
+            f',"penalties":{self._encode_penalties(action.penalties)}{suffix}'
+        )
+
+    def _encode_costs(self, costs: GoTo.Costs) -> str:
+        key = (costs.forward, costs.backward, costs.rotate)
+        fragment = self._costs.get(key)
+        if fragment is None:
+            if len(self._costs) >= _FRAGMENT_CACHE_SIZE:
+                self._costs.clear()
+            fragment = self._costs[key] = self.codec.dumps(humps.camelize(asdict(costs)))
+        return fragment
+
+    def _encode_penalties(self, penalties: GoTo.Penalties) -> str:
+        key = (
+            penalties.blindly,
+            penalties.tank,
+            penalties.bullet,
+            penalties.mine,
+            penalties.laser,
+            tuple((t.x, t.y, t.penalty) for t in penalties.per_tile),
+        )
+        fragment = self._penalties.get(key)
+        if fragment is None:
+            if len(self._penalties) >= _FRAGMENT_CACHE_SIZE:
+                self._penalties.clear()
+            fragment = self._penalties[key] = self.codec.dumps(
+                humps.camelize(asdict(penalties))
+            )
+        return fragment
@@ -0,0 +1,953 @@
+"""A local stand-in for the game server.
+
+The server speaks the packet protocol of the game over a local
+websocket, so the bots can be tested on one machine without the real
+server. It accepts the players, sends the lobby data, starts the game
+when all of them are connected and broadcasts a game state to each
+of them every `broadcast_interval` milliseconds.
+
+The responses are checked like on the real server. A second action
+for the same game state gets a PLAYER_ALREADY_MADE_ACTION warning,
+and an action for a game state that was already superseded by
+the next one gets a SLOW_RESPONSE warning. The time from sending
+a game state to receiving its response is measured for each player.
+
+The game states are either synthetic, with a static random map,
+or replayed from a recorded match. The network can be degraded
+with a latency, a jitter, bursts of game states and dropped game states.
+
+Examples
+--------
+Serve 200 synthetic game states to two bots, with 20 ms of latency:
+
+::
+
+    python -m hackathon_bot.server --players 2 --ticks 200 --latency 20 --jitter 5
+
+Replay a recorded match, holding back some game states
+to deliver them in bursts:
+
+::
+
+    python -m hackathon_bot.server --replay match.rec --burst-rate 0.05
+
+Classes
+-------
+NetworkConditions
+    Represents the degradation of the network between the server and the bots.
+LocalPlayer
+    Represents a player connected to the local server.
+GameStateSource
+    Provides the game states served to the players.
+SyntheticGameStates
+    Serves game states of a static random map.
+RecordedGameStates
+    Serves the game states of a recorded match.
+LocalServer
+    Runs a game for the bots connected to a local websocket.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import re
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+import websockets
+from websockets.asyncio.server import ServerConnection, serve
+
+from .enums import PacketType, TankType
+from .json_codecs import JsonCodec, get_codec
+from .latency import LatencyHistogram
+from .log import get_logger, setup_logging
+from .packets import peek_packet_type
+from .replay import read_frames
+
+__all__ = (
+    "NetworkConditions",
+    "LocalPlayer",
+    "GameStateSource",
+    "SyntheticGameStates",
+    "RecordedGameStates",
+    "LocalServer",
+)
+
+# Named explicitly, because the module is also run as __main__
+_logger = get_logger("server")
+
+# The colors of the teams, in the order they join
+_TEAM_COLORS = (0xFFE57373, 0xFF64B5F6, 0xFF81C784, 0xFFFFD54F)
+
+# The number of superseded game states whose late responses are recognized
+_PREVIOUS_GAME_STATES = 8
+
+# The longest time the players have to get ready after the game starting packet
+_READY_TIMEOUT = 5.0
+
+_PLAYER_ID_PATTERN = re.compile(rb'"playerId"\s*:\s*"([^"]*)"')
+
+
+@dataclass(slots=True, frozen=True)
+class NetworkConditions:
+    """Represents the degradation of the network between the server and the bots.
+
+    The latency and the jitter delay the frames in both directions.
+    The frames are never reordered, like on a TCP connection.
+    The bursts and the drops only affect the game states.
+
+    Attributes
+    ----------
+    latency: :class:`float`
+        The one-way delay of each frame in seconds.
+    jitter: :class:`float`
+        The largest random delay added to each frame in seconds.
+    drop_rate: :class:`float`
+        The probability that a game state is not sent.
+    burst_rate: :class:`float`
+        The probability that a game state is held back and sent
+        together with the following ones.
+    burst_size: :class:`int`
+        The number of game states sent together in a burst.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    drop_rate: float = 0.0
+    burst_rate: float = 0.0
+    burst_size: int = 3
+
+    def delay(self, rng: random.Random) -> float:
+        """Returns the delay of a frame in seconds."""
+        if self.jitter <= 0.0:
+            return self.latency
+        return self.latency + rng.uniform(0.0, self.jitter)
+
+
+class _DelayedLink:
+    """Delivers the frames of one direction of a connection after a delay."""
+
+    def __init__(
+        self,
+        deliver: Callable[[Any], Awaitable[None]],
+        conditions: NetworkConditions,
+        rng: random.Random,
+    ) -> None:
+        self._deliver = deliver
+        self._conditions = conditions
+        self._rng = rng
+        self._frames: asyncio.Queue[tuple[float, Any]] = asyncio.Queue()
+        self._last_delivery = 0.0
+        self._burst: list[Any] = []
+        self._burst_remaining = 0
+        self.dropped = 0
+        self.bursts = 0
+
+    def put(self, frame: Any, game_state: bool = False) -> None:
+        """Schedules the delivery of a frame."""
+        if game_state:
+            conditions = self._conditions
+            if conditions.drop_rate > 0.0 and self._rng.random() < conditions.drop_rate:
+                self.dropped += 1
+                return
+            if self._burst_remaining == 0 and conditions.burst_rate > 0.0:
+                if self._rng.random() < conditions.burst_rate:
+                    self._burst_remaining = conditions.burst_size
+                    self.bursts += 1
+            if self._burst_remaining > 0:
+                self._burst.append(frame)
+                self._burst_remaining -= 1
+                if self._burst_remaining == 0:
+                    self.flush()
+                return
+        self._schedule(frame)
+
+    def flush(self) -> None:
+        """Schedules the game states held back in an unfinished burst."""
+        frames, self._burst = self._burst, []
+        self._burst_remaining = 0
+        for frame in frames:
+            self._schedule(frame)
+
+    def _schedule(self, frame: Any) -> None:
+        loop = asyncio.get_running_loop()
+        # A frame is never delivered before the previous one
+        delivery = max(loop.time() + self._conditions.delay(self._rng), self._last_delivery)
+        self._last_delivery = delivery
+        self._frames.put_nowait((delivery, frame))
+
+    async def run(self) -> None:
+        """Delivers the scheduled frames until the connection is closed."""
+        loop = asyncio.get_running_loop()
+        while True:
+            delivery, frame = await self._frames.get()
+            wait = delivery - loop.time()
+            if wait > 0.0:
+                await asyncio.sleep(wait)
+            try:
+                await self._deliver(frame)
+            except websockets.exceptions.ConnectionClosed:
+                return
+            except Exception:  # pylint: disable=broad-except
+                # A malformed frame must not stop the following ones
+                _logger.exception("A frame could not be handled")
+
+
+@dataclass(slots=True, eq=False)
+class LocalPlayer:  # pylint: disable=too-many-instance-attributes
+    """Represents a player connected to the local server.
+
+    Attributes
+    ----------
+    id: :class:`str`
+        The ID of the player.
+    team_name: :class:`str`
+        The name of the team of the player.
+    tank_type: :class:`TankType`
+        The type of the tank of the player.
+    ready: :class:`bool`
+        Whether the player is ready to receive the game states.
+    responses: :class:`int`
+        The number of game states the player responded to in time.
+    missed: :class:`int`
+        The number of game states the player did not respond to in time.
+    slow_responses: :class:`int`
+        The number of responses to superseded game states.
+    repeated_responses: :class:`int`
+        The number of responses to a game state that was already responded to.
+    ping: :class:`int`
+        The last measured round trip time in milliseconds.
+    latency: :class:`LatencyHistogram`
+        The times from sending a game state to receiving its response.
+    """
+
+    id: str
+    team_name: str
+    tank_type: TankType
+    websocket: ServerConnection = field(repr=False)
+    ready: bool = False
+    responses: int = 0
+    missed: int = 0
+    slow_responses: int = 0
+    repeated_responses: int = 0
+    ping: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram, repr=False)
+    # The game state waiting for a response, its send time and whether it was answered
+    game_state_id: str | None = field(default=None, repr=False)
+    game_state_sent_at: float = field(default=0.0, repr=False)
+    responded: bool = field(default=False, repr=False)
+    # The send times of the superseded game states, by their ID
+    previous_game_states: dict[str, float] = field(default_factory=dict, repr=False)
+    ping_sent_at: float | None = field(default=None, repr=False)
+    outbound: _DelayedLink | None = field(default=None, repr=False)
+    inbound: _DelayedLink | None = field(default=None, repr=False)
+
+    def send(self, frame: str, game_state: bool = False) -> None:
+        """Sends a frame through the degraded network."""
+        assert self.outbound is not None
+        self.outbound.put(frame, game_state)
+
+
+class GameStateSource(ABC):
+    """Provides the game states served to the players.
+
+    The payloads are camelCase dictionaries, like in the packets
+    sent by the real server. The server sets their `id` and `tick`.
+
+    Attributes
+    ----------
+    grid_dimension: :class:`int`
+        The dimension of the map.
+    """
+
+    grid_dimension: int = 20
+
+    def start(self, players: Sequence[LocalPlayer]) -> None:
+        """Prepares the game states of the players when the game starts."""
+
+    @abstractmethod
+    def game_state(self, tick: int, player: LocalPlayer) -> dict[str, Any] | None:
+        """Returns the payload of the game state of a player.
+
+        Returns `None` if there are no more game states.
+        """
+
+
+class SyntheticGameStates(GameStateSource):
+    """Serves game states of a static random map.
+
+    The map has walls on about a fifth of the tiles and two zones.
+    The tanks of the players are placed on random free tiles,
+    face random directions and see the whole map. Nothing moves,
+    so the game states differ only by their ID and tick.
+
+    Parameters
+    ----------
+    grid_dimension: :class:`int`
+        The dimension of the map.
+    seed: :class:`int`
+        The seed of the random map.
+    """
+
+    def __init__(self, grid_dimension: int = 20, seed: int = 0) -> None:
+        self.grid_dimension = grid_dimension
+        self.seed = seed
+        self._payloads: dict[str, dict[str, Any]] = {}
+
+    def start(self, players: Sequence[LocalPlayer]) -> None:
+        rng = random.Random(self.seed)
+        size = self.grid_dimension
+        walls: dict[tuple[int, int], dict[str, Any]] = {}
+        for x in range(size):
+            for y in range(size):
+                if rng.random() < 0.2:
+                    walls[x, y] = {"type": "wall", "payload": {"type": rng.randint(0, 1)}}
+
+        free = [(x, y) for x in range(size) for y in range(size) if (x, y) not in walls]
+        positions = dict(zip((p.id for p in players), rng.sample(free, len(players))))
+        directions = {p.id: (rng.randrange(4), rng.randrange(4)) for p in players}
+        visibility = ["1" * size] * size
+        zone_size = max(size // 5, 1)
+        zones = [
+            {
+                "x": max(center - zone_size // 2, 0),
+                "y": (size - zone_size) // 2,
+                "width": zone_size,
+                "height": zone_size,
+                "index": index,
+                "shares": {"neutral": 1.0},
+            }
+            for index, center in ((65, size // 4), (66, 3 * size // 4))
+        ]
+        teams = _game_state_teams(players)
+
+        self._payloads.clear()
+        for player in players:
+            tiles: list[list[list[dict[str, Any]]]] = [
+                [[walls[x, y]] if (x, y) in walls else [] for y in range(size)]
+                for x in range(size)
+            ]
+            for other in players:
+                x, y = positions[other.id]
+                direction, turret = directions[other.id]
+                tank: dict[str, Any] = {
+                    "ownerId": other.id,
+                    "type": other.tank_type.value,
+                    "direction": direction,
+                    "turret": {"direction": turret},
+                }
+                if other is player:
+                    tank["turret"].update(bulletCount=3, ticksToBullet=None)
+                    tank.update(health=100, ticksToMine=None, visibility=visibility)
+                    if player.tank_type == TankType.LIGHT:
+                        tank["turret"]["ticksToDoubleBullet"] = None
+                        tank.update(ticksToRadar=None, isUsingRadar=False)
+                    else:
+                        tank["turret"]["ticksToLaser"] = None
+                tiles[x][y] = [{"type": "tank", "payload": tank}]
+            self._payloads[player.id] = {
+                "playerId": player.id,
+                "teams": teams,
+                "map": {"tiles": tiles, "zones": zones},
+            }
+
+    def game_state(self, tick: int, player: LocalPlayer) -> dict[str, Any] | None:
+        # The server sets the ID and the tick, the map is shared
+        return dict(self._payloads[player.id])
+
+
+class RecordedGameStates(GameStateSource):
+    """Serves the game states of a recorded match.
+
+    The recording is a file written with `--record`, or a file
+    with one received frame per line. All players receive the game
+    states from the perspective of the recorded player, with its ID
+    replaced by their own, so the other players see the same map.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The path of the recording.
+    codec: :class:`JsonCodec` | None
+        The codec used to decode the frames.
+    """
+
+    def __init__(self, path: str, codec: JsonCodec | None = None) -> None:
+        self.path = path
+        self._codec = codec or get_codec()
+        self._frames = [
+            frame
+            for frame in read_frames(path)
+            if peek_packet_type(frame) == PacketType.GAME_STATE
+        ]
+        if not self._frames:
+            raise ValueError(f"{path} contains no game states")
+        match = _PLAYER_ID_PATTERN.search(self._frames[0])
+        self._recorded_id = match.group(1) if match is not None else None
+        self.grid_dimension = len(self._codec.loads(self._frames[0])["payload"]["map"]["tiles"])
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def game_state(self, tick: int, player: LocalPlayer) -> dict[str, Any] | None:
+        if tick >= len(self._frames):
+            return None
+        frame = self._frames[tick]
+        if self._recorded_id:
+            frame = frame.replace(b'"%s"' % self._recorded_id, b'"%s"' % player.id.encode())
+        return self._codec.loads(frame)["payload"]
+
+
+class LocalServer:  # pylint: disable=too-many-instance-attributes
+    """Runs a game for the bots connected to a local websocket.
+
+    The game starts when `players` bots are connected
+    and ends after `ticks` game states, or when the source
+    has no more game states. The server stops after the game.
+
+    Parameters
+    ----------
+    source: :class:`GameStateSource`
+        The source of the game states.
+    host: :class:`str`
+        The host address the server listens on.
+    port: :class:`int`
+        The port the server listens on.
+    players: :class:`int`
+        The number of players of the game.
+    broadcast_interval: :class:`int`
+        The interval between the game states in milliseconds.
+    ticks: :class:`int` | None
+        The number of game states, or `None` to serve all
+        the game states of the source.
+    eager_broadcast: :class:`bool`
+        Whether the next game state is sent as soon as
+        all players responded to the current one.
+    join_code: :class:`str` | None
+        The code the players must join with, if any.
+    conditions: :class:`NetworkConditions`
+        The degradation of the network.
+    seed: :class:`int` | None
+        The seed of the network degradation.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        source: GameStateSource,
+        host: str = "localhost",
+        port: int = 5000,
+        players: int = 1,
+        broadcast_interval: int = 100,
+        ticks: int | None = None,
+        eager_broadcast: bool = False,
+        join_code: str | None = None,
+        conditions: NetworkConditions = NetworkConditions(),
+        seed: int | None = None,
+    ) -> None:
+        self.source = source
+        self.host = host
+        self.port = port
+        self.number_of_players = players
+        self.broadcast_interval = broadcast_interval
+        self.ticks = ticks
+        self.eager_broadcast = eager_broadcast
+        self.join_code = join_code
+        self.conditions = conditions
+        self.players: list[LocalPlayer] = []
+        self.tick = 0
+        self._rng = random.Random(seed)
+        self._codec = get_codec()
+        self._started = False
+        self._all_ready: asyncio.Event | None = None
+        self._all_responded: asyncio.Event | None = None
+        self._game_over: asyncio.Event | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._packet_handlers: dict[int, Callable[[LocalPlayer, dict[str, Any]], None]] = {
+            PacketType.PONG: self._handle_pong,
+            PacketType.GAME_STATUS_REQUEST: self._handle_game_status_request,
+            PacketType.LOBBY_DATA_REQUEST: self._handle_lobby_data_request,
+            PacketType.READY_TO_RECEIVE_GAME_STATE: self._handle_ready,
+        }
+
+    async def serve(self) -> None:
+        """Runs the server until the game ends."""
+        self._all_ready = asyncio.Event()
+        self._all_responded = asyncio.Event()
+        self._game_over = asyncio.Event()
+        async with serve(self._handle_connection, self.host, self.port):
+            _logger.info(
+                "Listening on ws://%s:%d, waiting for %d players.",
+                self.host,
+                self.port,
+                self.number_of_players,
+            )
+            await self._game_over.wait()
+
+    def summary(self) -> str:
+        """Returns a table of the responses of the players.
+
+        The latencies are in milliseconds, from sending
+        a game state to receiving the response to it.
+        """
+        lines = [
+            f"{'player':<14}{'ok':>7}{'missed':>8}{'slow':>7}{'repeat':>8}"
+            f"{'dropped':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"
+        ]
+        for player in self.players:
+            latency = player.latency
+            dropped = player.outbound.dropped if player.outbound is not None else 0
+            values = [latency.percentile(p) for p in (50, 90, 99)] + [latency.max]
+            lines.append(
+                f"{player.team_name[:13]:<14}{player.responses:>7}{player.missed:>8}"
+                f"{player.slow_responses:>7}{player.repeated_responses:>8}{dropped:>9}"
+                + "".join(f"{v * 1000:>9.3f}" for v in values)
+            )
+        return "\n".join(lines)
+
+    def _encode(self, packet_type: PacketType, payload: Any = None) -> str:
+        if payload is None:
+            return self._codec.dumps({"type": packet_type.value})
+        return self._codec.dumps({"type": packet_type.value, "payload": payload})
+
+    def _broadcast(self, packet_type: PacketType, payload: Any = None) -> None:
+        frame = self._encode(packet_type, payload)
+        for player in self.players:
+            player.send(frame)
+
+    def _spawn(self, coroutine: Awaitable[None]) -> asyncio.Task[None]:
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _handle_connection(self, websocket: ServerConnection) -> None:
+        query = parse_qs(urlsplit(websocket.request.path).query)
+        tank_type = _parse_tank_type(query.get("tankType", ["0"])[0])
+        reason = None
+        if self._started or len(self.players) >= self.number_of_players:
+            reason = "Game is full"
+        elif self.join_code and query.get("joinCode", [None])[0] != self.join_code:
+            reason = "Invalid join code"
+        elif "teamName" not in query:
+            reason = "Missing team name"
+        elif tank_type is None:
+            reason = "Invalid tank type"
+        if reason is not None:
+            payload = {"reason": reason}
+            await websocket.send(self._encode(PacketType.CONNECTION_REJECTED, payload))
+            await websocket.close(reason=reason)
+            return
+
+        player = LocalPlayer(str(uuid.uuid4()), query["teamName"][0], tank_type, websocket)
+        player.outbound = _DelayedLink(websocket.send, self.conditions, self._rng)
+        player.inbound = _DelayedLink(
+            lambda message: self._handle_packet(player, message), self.conditions, self._rng
+        )
+        links = [self._spawn(player.outbound.run()), self._spawn(player.inbound.run())]
+        self.players.append(player)
+        _logger.info("Player of team %s connected.", player.team_name)
+
+        player.send(self._encode(PacketType.CONNECTION_ACCEPTED))
+        for other in self.players:
+            other.send(self._lobby_data(other))
+        if len(self.players) == self.number_of_players:
+            self._started = True
+            self._spawn(self._run_game())
+
+        try:
+            async for message in websocket:
+                player.inbound.put(message)
+        except websockets.exceptions.ConnectionClosedError:
+            pass
+        finally:
+            for link in links:
+                link.cancel()
+            # The players who leave during the game are kept in the summary
+            if not self._started:
+                self.players.remove(player)
+            _logger.info("Player of team %s disconnected.", player.team_name)
+
+    async def _handle_packet(self, player: LocalPlayer, message: websockets.Data) -> None:
+        data = self._codec.loads(message)
+        packet_type = data.get("type")
+        if packet_type is None:
+            return
+        if packet_type & 0xF0 == PacketType.PLAYER_RESPONSE_ACTION_GROUP:
+            self._handle_action(player, data.get("payload") or {})
+            return
+        handler = self._packet_handlers.get(packet_type)
+        if handler is not None:
+            handler(player, data)
+        else:
+            _logger.debug("Ignored packet %s from %s.", hex(packet_type), player.team_name)
+
+    def _handle_action(self, player: LocalPlayer, payload: dict[str, Any]) -> None:
+        now = asyncio.get_running_loop().time()
+        game_state_id = payload.get("gameStateId")
+        if game_state_id is not None and game_state_id == player.game_state_id:
+            if player.responded:
+                player.repeated_responses += 1
+                player.send(self._encode(PacketType.PLAYER_ALREADY_MADE_ACTION_WARNING))
+                return
+            player.responded = True
+            player.responses += 1
+            player.latency.record(now - player.game_state_sent_at)
+            assert self._all_responded is not None
+            if all(p.responded for p in self.players):
+                self._all_responded.set()
+            return
+
+        sent_at = player.previous_game_states.pop(game_state_id, None)  # type: ignore[arg-type]
+        if sent_at is not None:
+            # The response arrived after the next game state was sent
+            player.slow_responses += 1
+            player.latency.record(now - sent_at)
+            player.send(self._encode(PacketType.SLOW_RESPONSE_WARNING))
+        else:
+            message = f"Unknown game state ID: {game_state_id}"
+            player.send(self._encode(PacketType.CUSTOM_WARNING, message))
+
+    def _handle_pong(self, player: LocalPlayer, _data: dict[str, Any]) -> None:
+        if player.ping_sent_at is not None:
+            elapsed = asyncio.get_running_loop().time() - player.ping_sent_at
+            player.ping = round(elapsed * 1000)
+            player.ping_sent_at = None
+
+    def _handle_game_status_request(self, player: LocalPlayer, _data: dict[str, Any]) -> None:
+        if not self._started:
+            player.send(self._encode(PacketType.GAME_NOT_STARTED))
+        elif self.tick > 0:
+            player.send(self._encode(PacketType.GAME_IN_PROGRESS))
+
+    def _handle_lobby_data_request(self, player: LocalPlayer, _data: dict[str, Any]) -> None:
+        player.send(self._lobby_data(player))
+
+    def _handle_ready(self, player: LocalPlayer, _data: dict[str, Any]) -> None:
+        player.ready = True
+        assert self._all_ready is not None
+        if all(p.ready for p in self.players):
+            self._all_ready.set()
+
+    def _lobby_data(self, player: LocalPlayer) -> str:
+        teams: dict[str, dict[str, Any]] = {}
+        for other in self.players:
+            team = teams.setdefault(
+                other.team_name,
+                {"name": other.team_name, "color": _team_color(len(teams)), "players": []},
+            )
+            team["players"].append({"id": other.id, "tankType": other.tank_type.value})
+        payload = {
+            "playerId": player.id,
+            "teamName": player.team_name,
+            "teams": list(teams.values()),
+            "serverSettings": {
+                "gridDimension": self.source.grid_dimension,
+                "numberOfPlayers": self.number_of_players,
+                "seed": 0,
+                "ticks": self.ticks,
+                "broadcastInterval": self.broadcast_interval,
+                "sandboxMode": False,
+                "eagerBroadcast": self.eager_broadcast,
+                "matchName": None,
+                "version": "local",
+            },
+        }
+        return self._encode(PacketType.LOBBY_DATA, payload)
+
+    async def _run_game(self) -> None:
+        assert self._all_ready is not None and self._all_responded is not None
+        assert self._game_over is not None
+        try:
+            self.source.start(self.players)
+            self._broadcast(PacketType.GAME_STARTING)
+            try:
+                await asyncio.wait_for(self._all_ready.wait(), _READY_TIMEOUT)
+            except asyncio.TimeoutError:
+                _logger.warning("Not all players are ready, starting anyway.")
+            self._broadcast(PacketType.GAME_STARTED)
+            await self._broadcast_game_states()
+            # The last game states must not be held back behind the end of the game
+            for player in self.players:
+                if player.outbound is not None:
+                    player.outbound.flush()
+            self._broadcast(PacketType.GAME_ENDED, {"teams": self._game_end_teams()})
+            # Leaves time for the last frames to pass the degraded network
+            await asyncio.sleep(self.conditions.latency + self.conditions.jitter + 0.1)
+            for player in self.players:
+                await player.websocket.close(reason="Game ended")
+        except Exception:  # pylint: disable=broad-except
+            _logger.exception("The game failed.")
+        finally:
+            self._game_over.set()
+
+    async def _broadcast_game_states(self) -> None:
+        assert self._all_responded is not None
+        loop = asyncio.get_running_loop()
+        interval = self.broadcast_interval / 1000
+        next_tick = loop.time()
+        while self.ticks is None or self.tick < self.ticks:
+            payloads = [(p, self.source.game_state(self.tick, p)) for p in self.players]
+            if any(payload is None for _, payload in payloads):
+                break
+            self._all_responded.clear()
+            now = loop.time()
+            for player, payload in payloads:
+                self._send_game_state(player, payload, now)  # type: ignore[arg-type]
+            if self.tick % max(round(1 / interval), 1) == 0:
+                self._send_pings(now)
+
+            next_tick += interval
+            timeout = next_tick - loop.time()
+            if self.eager_broadcast:
+                try:
+                    await asyncio.wait_for(self._all_responded.wait(), max(timeout, 0.0))
+                    next_tick = loop.time()
+                except asyncio.TimeoutError:
+                    pass
+            elif timeout > 0.0:
+                await asyncio.sleep(timeout)
+            self.tick += 1
+
+        # The responses to the last game state are slow from now on
+        for player in self.players:
+            self._supersede_game_state(player)
+
+    def _supersede_game_state(self, player: LocalPlayer) -> None:
+        if player.game_state_id is None:
+            return
+        if not player.responded:
+            player.missed += 1
+        previous = player.previous_game_states
+        previous[player.game_state_id] = player.game_state_sent_at
+        if len(previous) > _PREVIOUS_GAME_STATES:
+            del previous[next(iter(previous))]
+        player.game_state_id = None
+
+    def _send_game_state(self, player: LocalPlayer, payload: dict[str, Any], now: float) -> None:
+        self._supersede_game_state(player)
+        payload["id"] = str(uuid.uuid4())
+        payload["tick"] = self.tick
+        for team in payload.get("teams", ()):
+            for other in team.get("players", ()):
+                if "ping" in other:
+                    other["ping"] = self._player_ping(other["id"])
+        player.game_state_id = payload["id"]
+        player.game_state_sent_at = now
+        player.responded = False
+        player.send(self._encode(PacketType.GAME_STATE, payload), game_state=True)
+
+    def _send_pings(self, now: float) -> None:
+        frame = self._encode(PacketType.PING)
+        for player in self.players:
+            player.ping_sent_at = now
+            player.send(frame)
+
+    def _player_ping(self, player_id: str) -> int:
+        for player in self.players:
+            if player.id == player_id:
+                return player.ping
+        return 0
+
+    def _game_end_teams(self) -> list[dict[str, Any]]:
+        teams: dict[str, dict[str, Any]] = {}
+        for player in self.players:
+            team = teams.setdefault(
+                player.team_name,
+                {
+                    "name": player.team_name,
+                    "color": _team_color(len(teams)),
+                    "score": 0,
+                    "players": [],
+                },
+            )
+            team["players"].append({"id": player.id, "kills": 0})
+        return list(teams.values())
+
+
+def _team_color(index: int) -> int:
+    return _TEAM_COLORS[index % len(_TEAM_COLORS)]
+
+
+def _parse_tank_type(value: str) -> TankType | None:
+    """Returns the tank type given by its value or name, or `None` if it is invalid."""
+    try:
+        return TankType(int(value)) if value.isdigit() else TankType[value.upper()]
+    except (KeyError, ValueError):
+        return None
+
+
+def _game_state_teams(players: Sequence[LocalPlayer]) -> list[dict[str, Any]]:
+    teams: dict[str, dict[str, Any]] = {}
+    for player in players:
+        team = teams.setdefault(
+            player.team_name,
+            {"name": player.team_name, "color": _team_color(len(teams)), "players": []},
+        )
+        team["players"].append({"id": player.id, "ping": 0, "ticksToRegen": None})
+    return list(teams.values())
+
+
+def main() -> None:
+    """Runs the local server from the command line."""
+
+    parser = argparse.ArgumentParser(description="Local stand-in for the game server")
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="localhost",
+        help="Host address (default: localhost)",
+    )
+
+    parser.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        default=5000,
+        help="Port to listen on (default: 5000)",
+    )
+
+    parser.add_argument(
+        "--players",
+        type=int,
+        default=1,
+        help="Number of players (default: 1)",
+    )
+
+    parser.add_argument(
+        "--ticks",
+        type=int,
+        default=None,
+        help="Number of game states (default: 100, or the whole recording)",
+    )
+
+    parser.add_argument(
+        "--broadcast-interval",
+        type=int,
+        default=100,
+        metavar="MS",
+        help="Interval between the game states in milliseconds (default: 100)",
+    )
+
+    parser.add_argument(
+        "--eager-broadcast",
+        action="store_true",
+        help="Send the next game state as soon as all players responded",
+    )
+
+    parser.add_argument(
+        "-c",
+        "--code",
+        type=str,
+        default=None,
+        help="Join code required from the players",
+    )
+
+    parser.add_argument(
+        "--grid-dimension",
+        type=int,
+        default=20,
+        help="Dimension of the synthetic map (default: 20)",
+    )
+
+    parser.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Serve the game states of a recorded match",
+    )
+
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        metavar="MS",
+        help="One-way delay of the frames in milliseconds (default: 0)",
+    )
+
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.0,
+        metavar="MS",
+        help="Largest random delay added to the frames in milliseconds (default: 0)",
+    )
+
+    parser.add_argument(
+        "--drop-rate",
+        type=float,
+        default=0.0,
+        help="Probability that a game state is dropped (default: 0)",
+    )
+
+    parser.add_argument(
+        "--burst-rate",
+        type=float,
+        default=0.0,
+        help="Probability that a burst of game states starts (default: 0)",
+    )
+
+    parser.add_argument(
+        "--burst-size",
+        type=int,
+        default=3,
+        help="Number of game states in a burst (default: 3)",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed of the map and of the network degradation",
+    )
+
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+        default="INFO",
+        help="Lowest level of the logged messages (default: INFO)",
+    )
+    args = parser.parse_args()
+
+    setup_logging(args.log_level)
+    ticks = args.ticks
+    source: GameStateSource
+    if args.replay is not None:
+        source = RecordedGameStates(args.replay)
+    else:
+        source = SyntheticGameStates(args.grid_dimension, args.seed or 0)
+        ticks = 100 if ticks is None else ticks
+
+    server = LocalServer(
+        source,
+        host=args.host,
+        port=args.port,
+        players=args.players,
+        broadcast_interval=args.broadcast_interval,
+        ticks=ticks,
+        eager_broadcast=args.eager_broadcast,
+        join_code=args.code,
+        conditions=NetworkConditions(
+            args.latency / 1000,
+            args.jitter / 1000,
+            args.drop_rate,
+            args.burst_rate,
+            args.burst_size,
+        ),
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    print(f"Served {server.tick} game states. Response times (ms):\n{server.summary()}")
+
+
+if __name__ == "__main__":
+    main()
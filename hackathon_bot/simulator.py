@@ -0,0 +1,1147 @@
+"""A headless simulator of the game for self-play.
+
+The simulator runs the game in the same process as the bots, without
+a server or sockets. Each tick, it builds a :class:`GameStateModel`
+for every player from their own perspective, calls `next_move`
+of the bots directly and applies their response actions.
+
+The rules follow what the client knows about the game: the tanks move
+and rotate one step per tick, the turret fires bullets (basic, double,
+healing and stun), the light tanks use the radar, the heavy tanks use
+the laser and drop mines, and the teams capture the zones by sharing
+them. The exact values (health, damage, cooldowns, view distances)
+are not sent by the server, so they are configurable in
+:class:`SimulationRules` and only approximate the real server.
+
+Examples
+--------
+Play ten games between two bots and print the scores:
+
+::
+
+    python -m hackathon_bot.simulator main:MyBot example:ExampleBot --games 10
+
+Play a game from Python:
+
+::
+
+    from hackathon_bot.simulator import play_match
+
+    result = play_match(MyBot, OtherBot, ticks=2000, seed=1)
+    for team in result.teams:
+        print(team.name, team.score)
+
+Classes
+-------
+SimulationRules
+    Represents the rules of a simulated game.
+Simulation
+    Simulates a game between teams of tanks.
+
+Functions
+---------
+play_match
+    Plays a game between two bot classes and returns its result.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Sequence
+
+from .actions import (
+    AbilityUse,
+    CaptureZone,
+    GoTo,
+    Movement,
+    Pass,
+    ResponseAction,
+    Rotation,
+)
+from .enums import (
+    Ability,
+    BulletType,
+    Direction,
+    MovementDirection,
+    Orientation,
+    RotationDirection,
+    TankType,
+    WallType,
+    WarningType,
+)
+from .hackathon_bot import StereoTanksBot
+from .log import get_logger, setup_logging
+from .models import (
+    BulletModel,
+    EntityIndex,
+    GameResultModel,
+    GameStateModel,
+    LaserModel,
+    LobbyDataModel,
+    MapModel,
+    MineModel,
+    PlayerModel,
+    TankModel,
+    TeamModel,
+    TileModel,
+    TurretModel,
+    VisibilityMask,
+    WallModel,
+    ZoneGrid,
+    ZoneModel,
+)
+from .payloads import ServerSettings
+from .replay import load_bot_class
+
+__all__ = ("SimulationRules", "Simulation", "play_match")
+
+# Named explicitly, because the module is also run as __main__
+_logger = get_logger("simulator")
+
+# The (dx, dy) step of each direction, indexed by its value
+_STEPS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+_TEAM_COLORS = (0xFFE57373, 0xFF64B5F6)
+
+_NEUTRAL = "neutral"
+
+
+@dataclass(slots=True, frozen=True)
+class SimulationRules:  # pylint: disable=too-many-instance-attributes
+    """Represents the rules of a simulated game.
+
+    The durations are in ticks. A cooldown starts when the ability
+    is used, and the ability can be used again when it reaches zero.
+
+    Attributes
+    ----------
+    light_health: :class:`int`
+        The health of a light tank.
+    heavy_health: :class:`int`
+        The health of a heavy tank.
+    light_view_distance: :class:`int`
+        How far a light tank sees in front of its turret.
+    heavy_view_distance: :class:`int`
+        How far a heavy tank sees in front of its turret.
+    max_bullets: :class:`int`
+        The number of bullets a turret holds.
+    bullet_regen_ticks: :class:`int`
+        The time to load one bullet into the turret.
+    bullet_speed: :class:`int`
+        The number of tiles a bullet travels per tick.
+    bullet_damage: :class:`int`
+        The damage of a basic bullet.
+    double_bullet_damage: :class:`int`
+        The damage of a double bullet.
+    healing_bullet_heal: :class:`int`
+        The health restored by a healing bullet.
+    stun_ticks: :class:`int`
+        How long a tank hit by a stun bullet cannot act.
+    laser_damage: :class:`int`
+        The damage of a laser to each tank in it, per tick.
+    laser_ticks: :class:`int`
+        How long a laser lasts.
+    mine_damage: :class:`int`
+        The damage of a mine to the tank that drives onto it.
+    mine_explosion_ticks: :class:`int`
+        How long an exploded mine stays on the map.
+    double_bullet_cooldown: :class:`int`
+        The cooldown of the double bullet of the light tank.
+    radar_cooldown: :class:`int`
+        The cooldown of the radar of the light tank.
+    laser_cooldown: :class:`int`
+        The cooldown of the laser of the heavy tank.
+    mine_cooldown: :class:`int`
+        The cooldown of the mines of the heavy tank.
+    healing_bullet_cooldown: :class:`int`
+        The cooldown of the healing bullet.
+    stun_bullet_cooldown: :class:`int`
+        The cooldown of the stun bullet.
+    regen_ticks: :class:`int`
+        The time a destroyed tank waits before it respawns.
+    capture_rate: :class:`float`
+        The share of a zone taken by a team capturing it alone, per tick.
+    kill_points: :class:`int`
+        The points of a team for destroying an enemy tank.
+    zone_points: :class:`float`
+        The points of a team for owning a whole zone, per tick.
+    wall_density: :class:`float`
+        The probability that a tile of the generated map has a wall.
+    """
+
+    light_health: int = 80
+    heavy_health: int = 120
+    light_view_distance: int = 10
+    heavy_view_distance: int = 7
+    max_bullets: int = 3
+    bullet_regen_ticks: int = 10
+    bullet_speed: int = 2
+    bullet_damage: int = 20
+    double_bullet_damage: int = 40
+    healing_bullet_heal: int = 20
+    stun_ticks: int = 10
+    laser_damage: int = 40
+    laser_ticks: int = 3
+    mine_damage: int = 50
+    mine_explosion_ticks: int = 5
+    double_bullet_cooldown: int = 40
+    radar_cooldown: int = 80
+    laser_cooldown: int = 100
+    mine_cooldown: int = 50
+    healing_bullet_cooldown: int = 50
+    stun_bullet_cooldown: int = 50
+    regen_ticks: int = 50
+    capture_rate: float = 0.02
+    kill_points: int = 25
+    zone_points: float = 1.0
+    wall_density: float = 0.15
+
+    def health(self, tank_type: TankType) -> int:
+        """Returns the full health of a tank type."""
+        return self.light_health if tank_type == TankType.LIGHT else self.heavy_health
+
+    def view_distance(self, tank_type: TankType) -> int:
+        """Returns the view distance of a tank type."""
+        if tank_type == TankType.LIGHT:
+            return self.light_view_distance
+        return self.heavy_view_distance
+
+
+@dataclass(slots=True, eq=False)
+class _Player:  # pylint: disable=too-many-instance-attributes
+    id: str
+    team: str
+    tank_type: TankType
+    spawn: tuple[int, int, int]
+    kills: int = 0
+    ticks_to_regen: int = 0
+    tank: _Tank | None = None
+
+
+@dataclass(slots=True, eq=False)
+class _Tank:  # pylint: disable=too-many-instance-attributes
+    player: _Player
+    x: int
+    y: int
+    direction: int
+    turret_direction: int
+    health: int
+    bullet_count: int
+    ticks_to_bullet: int = 0
+    ticks_to_double_bullet: int = 0
+    ticks_to_healing_bullet: int = 0
+    ticks_to_stun_bullet: int = 0
+    ticks_to_laser: int = 0
+    ticks_to_radar: int = 0
+    ticks_to_mine: int = 0
+    stunned_ticks: int = 0
+    is_using_radar: bool = False
+
+
+@dataclass(slots=True, eq=False)
+class _Bullet:
+    id: int
+    x: int
+    y: int
+    direction: int
+    type: BulletType
+    owner: _Player
+
+
+@dataclass(slots=True, eq=False)
+class _Laser:
+    id: int
+    cells: list[tuple[int, int]]
+    orientation: Orientation
+    remaining: int
+    owner: _Player
+
+
+@dataclass(slots=True, eq=False)
+class _Mine:
+    id: int
+    x: int
+    y: int
+    owner: _Player
+    explosion_remaining_ticks: int | None = None
+
+
+@dataclass(slots=True, eq=False)
+class _Zone:
+    x: int
+    y: int
+    width: int
+    height: int
+    index: int
+    shares: dict[str, float] = field(default_factory=lambda: {_NEUTRAL: 1.0})
+
+    def contains(self, x: int, y: int) -> bool:
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+
+class Simulation:  # pylint: disable=too-many-instance-attributes
+    """Simulates a game between teams of tanks.
+
+    The map is generated from the seed and is point symmetric,
+    so both teams start in the same situation. The game states
+    are built as models, without encoding them to JSON.
+
+    Each player sees the tiles in front of its turret, up to its
+    view distance and not behind the solid walls, and the tiles
+    around its tank. The walls and the zones are always visible.
+    The radar shows the whole map in the next game state.
+    A destroyed tank sees only the walls and the zones.
+
+    The tiles with only a wall or nothing are shared between
+    the game states, so their `entities` are tuples, which a bot
+    cannot change for the other bots. The other models of a game
+    state are either frozen or built for each player.
+
+    Parameters
+    ----------
+    teams: Mapping[:class:`str`, Sequence[:class:`TankType`]]
+        The tank types of the players of each team, by the team name.
+    grid_dimension: :class:`int`
+        The dimension of the map.
+    ticks: :class:`int`
+        The number of ticks of the game.
+    seed: :class:`int`
+        The seed of the map.
+    rules: :class:`SimulationRules`
+        The rules of the game.
+
+    Attributes
+    ----------
+    tick: :class:`int`
+        The current tick.
+    player_ids: list[:class:`str`]
+        The IDs of the players, team by team.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        teams: Mapping[str, Sequence[TankType]],
+        grid_dimension: int = 20,
+        ticks: int = 1000,
+        seed: int = 0,
+        rules: SimulationRules = SimulationRules(),
+    ) -> None:
+        if len(teams) > 2:
+            raise ValueError("The simulator supports at most two teams")
+        self.grid_dimension = grid_dimension
+        self.ticks = ticks
+        self.seed = seed
+        self.rules = rules
+        self.tick = 0
+        self._rng = random.Random(seed)
+        self._next_id = 0
+        self._bullets: list[_Bullet] = []
+        self._lasers: list[_Laser] = []
+        self._mines: list[_Mine] = []
+        self._points: dict[str, float] = {team: 0.0 for team in teams}
+        self._colors = {team: _TEAM_COLORS[i % 2] for i, team in enumerate(teams)}
+        self._walls = self._generate_walls()
+        self._zones = self._generate_zones()
+        self._players: dict[str, _Player] = {}
+        self._place_players(teams)
+        self.player_ids = list(self._players)
+        self._visibility_cache: dict[tuple[int, int, int, int], int] = {}
+        self._distance_cache: dict[tuple[int, int], list[int]] = {}
+
+        size = grid_dimension
+        zone_models = tuple(self._zone_model(z) for z in self._zones)
+        self._zone_grid = ZoneGrid.from_zones(zone_models, size, size)
+        self._wall_entries = [
+            (x, y, WallModel(WallType(self._walls[y * size + x])))
+            for y in range(size)
+            for x in range(size)
+            if self._walls[y * size + x] >= 0
+        ]
+        # The tiles outside the zones never change, so they are built once
+        walls = {(x, y): wall for x, y, wall in self._wall_entries}
+        self._static_tiles = [
+            TileModel((walls[x, y],) if (x, y) in walls else (), None)
+            for y in range(size)
+            for x in range(size)
+        ]
+        self._static_rows = [
+            self._static_tiles[y * size : (y + 1) * size] for y in range(size)
+        ]
+        self._frame: _Frame | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether all ticks of the game were played."""
+        return self.tick >= self.ticks
+
+    def team_of(self, player_id: str) -> str:
+        """Returns the name of the team of a player."""
+        return self._players[player_id].team
+
+    def lobby_data(self, player_id: str, broadcast_interval: int = 0) -> LobbyDataModel:
+        """Returns the lobby data sent to a player."""
+        player = self._players[player_id]
+        teams = tuple(
+            TeamModel(
+                team,
+                self._colors[team],
+                [PlayerModel(p.id, p.tank_type) for p in self._team_players(team)],
+            )
+            for team in self._points
+        )
+        settings = ServerSettings(
+            self.grid_dimension,
+            len(self._players),
+            self.seed,
+            self.ticks,
+            broadcast_interval,
+            False,
+            True,
+            "simulation",
+            "simulator",
+        )
+        return LobbyDataModel(player.id, player.team, teams, settings)
+
+    def game_state(self, player_id: str) -> GameStateModel:
+        """Returns the game state of the current tick seen by a player."""
+        frame = self._frame
+        if frame is None or frame.tick != self.tick:
+            frame = self._frame = self._build_frame()
+
+        player = self._players[player_id]
+        tank = player.tank
+        size = self.grid_dimension
+        if tank is None:
+            mask = 0
+        elif tank.is_using_radar:
+            mask = (1 << size * size) - 1
+        else:
+            mask = self._visibility(tank.x, tank.y, tank.turret_direction, player.tank_type)
+
+        dynamic: dict[int, list[Any]] = {}
+        index = EntityIndex()
+        for cell, entity in frame.entities:
+            if mask >> cell & 1:
+                dynamic.setdefault(cell, []).append(entity)
+        if tank is not None:
+            cell = tank.y * size + tank.x
+            own = self._own_tank_model(tank, mask)
+            entities = dynamic.setdefault(cell, [])
+            public = frame.tanks[player.id]
+            if public in entities:
+                entities[entities.index(public)] = own
+            else:
+                entities.append(own)
+
+        # The zones are built for each player, because their shares are a dict
+        zones = tuple(self._zone_model(z) for z in self._zones)
+        rows = [list(row) for row in self._static_rows]
+        for position, tiles in enumerate(self._zone_grid.zone_tiles):
+            zone = zones[position]
+            for x, y in tiles:
+                rows[y][x] = TileModel(self._static_tiles[y * size + x].entities, zone)
+
+        cells = self._zone_grid.cells
+        for cell, entities in dynamic.items():
+            y, x = divmod(cell, size)
+            position = cells[cell]
+            wall = self._walls[cell]
+            if wall >= 0:
+                entities.insert(0, WallModel(WallType(wall)))
+            rows[y][x] = TileModel(entities, zones[position] if position >= 0 else None)
+            index.add(x, y, entities)
+
+        return GameStateModel(
+            f"sim-{self.tick}",
+            self.tick,
+            player.id,
+            self._team_models(with_kills=False),
+            MapModel(tuple(tuple(row) for row in rows), zones, self._zone_grid, index),
+        )
+
+    def result(self) -> GameResultModel:
+        """Returns the result of the game, with the current scores."""
+        return GameResultModel(self._team_models(with_kills=True))
+
+    def step(self, actions: Mapping[str, ResponseAction | None]) -> dict[str, WarningType]:
+        """Applies the response actions of the players and advances the game by a tick.
+
+        The actions are applied in a random order. The players missing
+        from `actions` pass.
+
+        Returns
+        -------
+        dict[:class:`str`, :class:`WarningType`]
+            The warnings for the players whose actions were ignored.
+        """
+        warnings: dict[str, WarningType] = {}
+        captures: list[_Tank] = []
+        order = list(self._players.values())
+        self._rng.shuffle(order)
+
+        for player in order:
+            tank = player.tank
+            action = actions.get(player.id)
+            if tank is not None:
+                tank.is_using_radar = False
+            if action is None or isinstance(action, Pass):
+                continue
+            if tank is None:
+                warnings[player.id] = WarningType.ACTION_IGNORED_DUE_TO_DEAD
+                continue
+            if tank.stunned_ticks > 0:
+                continue
+            if isinstance(action, CaptureZone):
+                captures.append(tank)
+            else:
+                self._apply_action(tank, action)
+
+        self._move_bullets()
+        self._update_lasers()
+        self._update_mines()
+        self._update_tanks()
+        self._update_zones(captures)
+        self.tick += 1
+        return warnings
+
+    # The actions
+
+    def _apply_action(self, tank: _Tank, action: ResponseAction) -> None:
+        if isinstance(action, Movement):
+            backward = action.movement_direction == MovementDirection.BACKWARD
+            self._move(tank, (tank.direction + 2) % 4 if backward else tank.direction)
+        elif isinstance(action, Rotation):
+            if action.tank_rotation_direction is not None:
+                tank.direction = _rotate(tank.direction, action.tank_rotation_direction)
+            if action.turret_rotation_direction is not None:
+                turret_rotation = action.turret_rotation_direction
+                tank.turret_direction = _rotate(tank.turret_direction, turret_rotation)
+        elif isinstance(action, AbilityUse):
+            self._use_ability(tank, action.ability)
+        elif isinstance(action, GoTo):
+            self._go_to(tank, action)
+
+    def _move(self, tank: _Tank, direction: int) -> None:
+        dx, dy = _STEPS[direction]
+        x, y = tank.x + dx, tank.y + dy
+        if not self._is_free(x, y):
+            return
+        tank.x, tank.y = x, y
+        for mine in self._mines:
+            if mine.x == x and mine.y == y and mine.explosion_remaining_ticks is None:
+                mine.explosion_remaining_ticks = self.rules.mine_explosion_ticks
+                self._damage(tank, self.rules.mine_damage, mine.owner)
+
+    def _go_to(self, tank: _Tank, action: GoTo) -> None:
+        """Makes the first step of the shortest path to the target.
+
+        The path avoids the walls only. The tank moves backward
+        if the next tile is behind it and it is cheaper than turning.
+        """
+        size = self.grid_dimension
+        if not (0 <= action.x < size and 0 <= action.y < size):
+            return
+        distances = self._distances(action.x, action.y)
+        current = distances[tank.y * size + tank.x]
+        best = None
+        for direction, (dx, dy) in enumerate(_STEPS):
+            x, y = tank.x + dx, tank.y + dy
+            if 0 <= x < size and 0 <= y < size and distances[y * size + x] < current:
+                if best is None or direction == tank.direction:
+                    best = direction
+        if best is None:
+            return
+
+        costs = action.costs
+        if best == tank.direction:
+            self._move(tank, best)
+        elif best == (tank.direction + 2) % 4 and costs.backward <= 2 * costs.rotate:
+            self._move(tank, best)
+        else:
+            clockwise = (best - tank.direction) % 4 == 1
+            rotation = RotationDirection.RIGHT if clockwise else RotationDirection.LEFT
+            tank.direction = _rotate(tank.direction, rotation)
+            if action.turret_rotation is not None:
+                tank.turret_direction = _rotate(tank.turret_direction, action.turret_rotation)
+
+    def _use_ability(  # pylint: disable=too-many-return-statements
+        self, tank: _Tank, ability: Ability
+    ) -> None:
+        rules = self.rules
+        light = tank.player.tank_type == TankType.LIGHT
+        if ability == Ability.FIRE_BULLET:
+            if tank.bullet_count > 0:
+                # The regeneration starts with the first bullet fired from a full turret
+                if tank.bullet_count == rules.max_bullets:
+                    tank.ticks_to_bullet = rules.bullet_regen_ticks
+                tank.bullet_count -= 1
+                self._fire(tank, BulletType.BASIC)
+        elif ability == Ability.FIRE_DOUBLE_BULLET:
+            if light and tank.ticks_to_double_bullet == 0:
+                tank.ticks_to_double_bullet = rules.double_bullet_cooldown
+                self._fire(tank, BulletType.DOUBLE)
+        elif ability == Ability.FIRE_HEALING_BULLET:
+            if tank.ticks_to_healing_bullet == 0:
+                tank.ticks_to_healing_bullet = rules.healing_bullet_cooldown
+                self._fire(tank, BulletType.HEALING)
+        elif ability == Ability.FIRE_STUN_BULLET:
+            if tank.ticks_to_stun_bullet == 0:
+                tank.ticks_to_stun_bullet = rules.stun_bullet_cooldown
+                self._fire(tank, BulletType.STUN)
+        elif ability == Ability.USE_RADAR:
+            if light and tank.ticks_to_radar == 0:
+                tank.ticks_to_radar = rules.radar_cooldown
+                tank.is_using_radar = True
+        elif ability == Ability.USE_LASER:
+            if not light and tank.ticks_to_laser == 0:
+                tank.ticks_to_laser = rules.laser_cooldown
+                self._fire_laser(tank)
+        elif ability == Ability.DROP_MINE:
+            if not light and tank.ticks_to_mine == 0:
+                self._drop_mine(tank)
+
+    def _fire(self, tank: _Tank, bullet_type: BulletType) -> None:
+        # The bullet starts on the tank and moves away with the other bullets
+        bullet = _Bullet(
+            self._new_id(), tank.x, tank.y, tank.turret_direction, bullet_type, tank.player
+        )
+        self._bullets.append(bullet)
+
+    def _fire_laser(self, tank: _Tank) -> None:
+        dx, dy = _STEPS[tank.turret_direction]
+        size = self.grid_dimension
+        cells = []
+        x, y = tank.x + dx, tank.y + dy
+        # The laser goes through the penetrable walls
+        while 0 <= x < size and 0 <= y < size and self._walls[y * size + x] != WallType.SOLID:
+            cells.append((x, y))
+            x, y = x + dx, y + dy
+        if cells:
+            horizontal = tank.turret_direction in (Direction.LEFT, Direction.RIGHT)
+            orientation = Orientation.HORIZONTAL if horizontal else Orientation.VERTICAL
+            laser = _Laser(self._new_id(), cells, orientation, self.rules.laser_ticks, tank.player)
+            self._lasers.append(laser)
+
+    def _drop_mine(self, tank: _Tank) -> None:
+        dx, dy = _STEPS[tank.direction]
+        # The mine is dropped behind the tank
+        x, y = tank.x - dx, tank.y - dy
+        if not self._is_free(x, y) or any(m.x == x and m.y == y for m in self._mines):
+            return
+        tank.ticks_to_mine = self.rules.mine_cooldown
+        self._mines.append(_Mine(self._new_id(), x, y, tank.player))
+
+    # The updates of the tick
+
+    def _move_bullets(self) -> None:
+        size = self.grid_dimension
+        for _ in range(self.rules.bullet_speed):
+            moves: dict[tuple[int, int, int, int], _Bullet] = {}
+            for bullet in self._bullets:
+                dx, dy = _STEPS[bullet.direction]
+                moves[bullet.x, bullet.y, bullet.x + dx, bullet.y + dy] = bullet
+                bullet.x += dx
+                bullet.y += dy
+
+            removed: set[int] = set()
+            cells: dict[tuple[int, int], list[_Bullet]] = {}
+            for bullet in self._bullets:
+                x, y = bullet.x, bullet.y
+                if not (0 <= x < size and 0 <= y < size) or self._walls[y * size + x] >= 0:
+                    removed.add(bullet.id)
+                    continue
+                cells.setdefault((x, y), []).append(bullet)
+                # Two bullets flying through each other destroy each other
+                dx, dy = _STEPS[bullet.direction]
+                other = moves.get((x, y, x - dx, y - dy))
+                if other is not None:
+                    removed.update((bullet.id, other.id))
+
+            tanks = {(p.tank.x, p.tank.y): p.tank for p in self._live_players()}
+            for cell, bullets in cells.items():
+                if len(bullets) > 1:
+                    removed.update(b.id for b in bullets)
+                    continue
+                bullet = bullets[0]
+                tank = tanks.get(cell)
+                if tank is not None and bullet.id not in removed:
+                    self._hit(tank, bullet)
+                    removed.add(bullet.id)
+
+            if removed:
+                self._bullets = [b for b in self._bullets if b.id not in removed]
+
+    def _hit(self, tank: _Tank, bullet: _Bullet) -> None:
+        rules = self.rules
+        if bullet.type == BulletType.HEALING:
+            health = tank.health + rules.healing_bullet_heal
+            tank.health = min(health, rules.health(tank.player.tank_type))
+        elif bullet.type == BulletType.STUN:
+            tank.stunned_ticks = rules.stun_ticks
+        elif bullet.type == BulletType.DOUBLE:
+            self._damage(tank, rules.double_bullet_damage, bullet.owner)
+        else:
+            self._damage(tank, rules.bullet_damage, bullet.owner)
+
+    def _update_lasers(self) -> None:
+        # The tanks in a laser are damaged on every tick it lasts
+        for laser in self._lasers:
+            for player in self._live_players():
+                tank = player.tank
+                if tank is not None and (tank.x, tank.y) in laser.cells:
+                    self._damage(tank, self.rules.laser_damage, laser.owner)
+            laser.remaining -= 1
+        self._lasers = [laser for laser in self._lasers if laser.remaining > 0]
+
+    def _update_mines(self) -> None:
+        for mine in self._mines:
+            if mine.explosion_remaining_ticks is not None:
+                mine.explosion_remaining_ticks -= 1
+        self._mines = [m for m in self._mines if m.explosion_remaining_ticks != 0]
+
+    def _update_tanks(self) -> None:
+        rules = self.rules
+        for player in self._players.values():
+            tank = player.tank
+            if tank is None:
+                player.ticks_to_regen -= 1
+                if player.ticks_to_regen <= 0:
+                    self._respawn(player)
+                continue
+            if tank.bullet_count < rules.max_bullets:
+                if tank.ticks_to_bullet <= 1:
+                    tank.bullet_count += 1
+                    tank.ticks_to_bullet = rules.bullet_regen_ticks
+                else:
+                    tank.ticks_to_bullet -= 1
+            tank.ticks_to_double_bullet = max(tank.ticks_to_double_bullet - 1, 0)
+            tank.ticks_to_healing_bullet = max(tank.ticks_to_healing_bullet - 1, 0)
+            tank.ticks_to_stun_bullet = max(tank.ticks_to_stun_bullet - 1, 0)
+            tank.ticks_to_laser = max(tank.ticks_to_laser - 1, 0)
+            tank.ticks_to_radar = max(tank.ticks_to_radar - 1, 0)
+            tank.ticks_to_mine = max(tank.ticks_to_mine - 1, 0)
+            tank.stunned_ticks = max(tank.stunned_ticks - 1, 0)
+
+    def _update_zones(self, captures: list[_Tank]) -> None:
+        rate = self.rules.capture_rate
+        for zone in self._zones:
+            teams = {
+                tank.player.team
+                for tank in captures
+                if tank.player.tank is tank and zone.contains(tank.x, tank.y)
+            }
+            # A contested zone does not change
+            if len(teams) == 1:
+                team = teams.pop()
+                shares = zone.shares
+                others = [k for k, v in shares.items() if k != team and v > 0.0]
+                if others:
+                    # The neutral share is taken first
+                    source = _NEUTRAL if _NEUTRAL in others else max(others, key=shares.get)
+                    taken = min(rate, shares[source])
+                    shares[source] -= taken
+                    shares[team] = shares.get(team, 0.0) + taken
+            for team, share in zone.shares.items():
+                if team in self._points:
+                    self._points[team] += share * self.rules.zone_points
+
+    def _damage(self, tank: _Tank, damage: int, attacker: _Player) -> None:
+        if tank.player.tank is not tank:
+            return
+        tank.health -= damage
+        if tank.health <= 0:
+            player = tank.player
+            player.tank = None
+            player.ticks_to_regen = self.rules.regen_ticks
+            if attacker.team != player.team:
+                attacker.kills += 1
+
+    def _respawn(self, player: _Player) -> None:
+        x, y, direction = player.spawn
+        if not self._is_free(x, y):
+            return
+        rules = self.rules
+        player.ticks_to_regen = 0
+        health = rules.health(player.tank_type)
+        player.tank = _Tank(player, x, y, direction, direction, health, rules.max_bullets)
+
+    # The map
+
+    def _generate_walls(self) -> list[int]:
+        """Returns the wall type of each tile, or -1, in row-major order."""
+        size = self.grid_dimension
+        density = self.rules.wall_density
+        walls = [-1] * (size * size)
+        for cell in range(size * size // 2 + 1):
+            if self._rng.random() < density:
+                wall = WallType.SOLID if self._rng.random() < 0.7 else WallType.PENETRABLE
+                # The map is point symmetric
+                walls[cell] = walls[size * size - 1 - cell] = wall
+        return walls
+
+    def _generate_zones(self) -> list[_Zone]:
+        size = self.grid_dimension
+        zone_size = max(size // 5, 1)
+        y = (size - zone_size) // 2
+        zones = [
+            _Zone(size // 4 - zone_size // 2, y, zone_size, zone_size, ord("A")),
+            _Zone(size - size // 4 - (zone_size + 1) // 2, y, zone_size, zone_size, ord("B")),
+        ]
+        # The zones are kept free of walls
+        for zone in zones:
+            for zy in range(zone.y, zone.y + zone.height):
+                for zx in range(zone.x, zone.x + zone.width):
+                    self._walls[zy * size + zx] = -1
+        return zones
+
+    def _place_players(self, teams: Mapping[str, Sequence[TankType]]) -> None:
+        size = self.grid_dimension
+        for team_index, (team, tank_types) in enumerate(teams.items()):
+            for index, tank_type in enumerate(tank_types):
+                # The teams start in the opposite corners
+                x, y = 1 + 2 * index, 1
+                direction = Direction.DOWN
+                if team_index == 1:
+                    x, y, direction = size - 1 - x, size - 1 - y, Direction.UP
+                self._walls[y * size + x] = -1
+                player = _Player(f"{team}-{index}", team, TankType(tank_type), (x, y, direction))
+                self._players[player.id] = player
+                self._respawn(player)
+
+    def _is_free(self, x: int, y: int) -> bool:
+        size = self.grid_dimension
+        if not (0 <= x < size and 0 <= y < size) or self._walls[y * size + x] >= 0:
+            return False
+        return all(p.tank.x != x or p.tank.y != y for p in self._live_players())
+
+    def _distances(self, x: int, y: int) -> list[int]:
+        """Returns the number of moves from each tile to the target, avoiding the walls."""
+        distances = self._distance_cache.get((x, y))
+        if distances is not None:
+            return distances
+        size = self.grid_dimension
+        unreachable = size * size
+        distances = [unreachable] * (size * size)
+        if self._walls[y * size + x] < 0:
+            distances[y * size + x] = 0
+            queue = deque([(x, y)])
+            while queue:
+                cx, cy = queue.popleft()
+                distance = distances[cy * size + cx] + 1
+                for dx, dy in _STEPS:
+                    nx, ny = cx + dx, cy + dy
+                    cell = ny * size + nx
+                    if (
+                        0 <= nx < size
+                        and 0 <= ny < size
+                        and self._walls[cell] < 0
+                        and distances[cell] > distance
+                    ):
+                        distances[cell] = distance
+                        queue.append((nx, ny))
+        self._distance_cache[x, y] = distances
+        return distances
+
+    def _visibility(self, x: int, y: int, direction: int, tank_type: TankType) -> int:
+        """Returns the visibility bits of a tank.
+
+        The walls do not move, so the visibility of each position
+        and turret direction is computed once.
+        """
+        distance = self.rules.view_distance(tank_type)
+        key = (x, y, direction, distance)
+        bits = self._visibility_cache.get(key)
+        if bits is not None:
+            return bits
+
+        size = self.grid_dimension
+        dx, dy = _STEPS[direction]
+        bits = 0
+        for ty in range(max(y - distance, 0), min(y + distance + 1, size)):
+            for tx in range(max(x - distance, 0), min(x + distance + 1, size)):
+                near = abs(tx - x) <= 1 and abs(ty - y) <= 1
+                # The tiles in the quarter in front of the turret
+                forward = (tx - x) * dx + (ty - y) * dy
+                side = abs((tx - x) * dy - (ty - y) * dx)
+                in_cone = 0 < forward <= distance and side <= forward
+                if near or (in_cone and self._line_of_sight(x, y, tx, ty)):
+                    bits |= 1 << (ty * size + tx)
+        self._visibility_cache[key] = bits
+        return bits
+
+    def _line_of_sight(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """Whether no solid wall is between the tiles."""
+        size = self.grid_dimension
+        steps = max(abs(x1 - x0), abs(y1 - y0))
+        for step in range(1, steps):
+            x = x0 + round((x1 - x0) * step / steps)
+            y = y0 + round((y1 - y0) * step / steps)
+            if self._walls[y * size + x] == WallType.SOLID:
+                return False
+        return True
+
+    # The models
+
+    def _build_frame(self) -> _Frame:
+        """Builds the models of the tick shared by all players."""
+        size = self.grid_dimension
+        entities: list[tuple[int, Any]] = []
+        tanks: dict[str, TankModel] = {}
+        for player in self._live_players():
+            tank = player.tank
+            model = TankModel(
+                player.id,
+                player.tank_type,
+                Direction(tank.direction),
+                TurretModel(Direction(tank.turret_direction)),
+            )
+            tanks[player.id] = model
+            entities.append((tank.y * size + tank.x, model))
+        for bullet in self._bullets:
+            model = BulletModel(
+                bullet.id, self.rules.bullet_speed, Direction(bullet.direction), bullet.type
+            )
+            entities.append((bullet.y * size + bullet.x, model))
+        for laser in self._lasers:
+            model = LaserModel(laser.id, laser.orientation)
+            entities.extend((y * size + x, model) for x, y in laser.cells)
+        for mine in self._mines:
+            model = MineModel(mine.id, mine.explosion_remaining_ticks)
+            entities.append((mine.y * size + mine.x, model))
+
+        return _Frame(self.tick, entities, tanks)
+
+    def _own_tank_model(self, tank: _Tank, mask: int) -> TankModel:
+        light = tank.player.tank_type == TankType.LIGHT
+        turret = TurretModel(
+            Direction(tank.turret_direction),
+            tank.bullet_count,
+            _ticks(tank.ticks_to_bullet) if tank.bullet_count < self.rules.max_bullets else None,
+            _ticks(tank.ticks_to_double_bullet) if light else None,
+            _ticks(tank.ticks_to_healing_bullet),
+            _ticks(tank.ticks_to_stun_bullet),
+            None if light else _ticks(tank.ticks_to_laser),
+        )
+        size = self.grid_dimension
+        return TankModel(
+            tank.player.id,
+            tank.player.tank_type,
+            Direction(tank.direction),
+            turret,
+            tank.health,
+            None if light else _ticks(tank.ticks_to_mine),
+            _ticks(tank.ticks_to_radar) if light else None,
+            tank.is_using_radar if light else None,
+            VisibilityMask(size, size, mask),
+        )
+
+    def _zone_model(self, zone: _Zone) -> ZoneModel:
+        shares = {team: share for team, share in zone.shares.items() if share > 0.0}
+        return ZoneModel(zone.x, zone.y, zone.width, zone.height, zone.index, shares)
+
+    def _team_models(self, with_kills: bool) -> tuple[TeamModel, ...]:
+        rules = self.rules
+        teams = []
+        for team, points in self._points.items():
+            players = self._team_players(team)
+            kills = sum(p.kills for p in players)
+            teams.append(
+                TeamModel(
+                    team,
+                    self._colors[team],
+                    [
+                        PlayerModel(
+                            p.id,
+                            p.tank_type,
+                            p.kills if with_kills else None,
+                            0,
+                            p.ticks_to_regen if p.tank is None else None,
+                        )
+                        for p in players
+                    ],
+                    int(points) + kills * rules.kill_points,
+                )
+            )
+        return tuple(teams)
+
+    def _team_players(self, team: str) -> list[_Player]:
+        return [p for p in self._players.values() if p.team == team]
+
+    def _live_players(self) -> list[_Player]:
+        return [p for p in self._players.values() if p.tank is not None]
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+
+@dataclass(slots=True)
+class _Frame:
+    """Holds the frozen models of a tick shared by all players."""
+
+    tick: int
+    # The entities other than the walls, with their cells
+    entities: list[tuple[int, Any]]
+    # The tanks as seen by the other players, by their owner
+    tanks: dict[str, TankModel]
+
+
+def _rotate(direction: int, rotation: RotationDirection) -> int:
+    return (direction + (1 if rotation == RotationDirection.RIGHT else -1)) % 4
+
+
+def _ticks(value: int) -> int | None:
+    """Returns the ticks left, or `None` if the ability is ready."""
+    return value if value > 0 else None
+
+
+def _call(loop: asyncio.AbstractEventLoop, result: Any) -> Any:
+    """Returns the result of a callback, awaiting it if needed."""
+    if inspect.isawaitable(result):
+        return loop.run_until_complete(result)
+    return result
+
+
+def play_match(  # pylint: disable=too-many-arguments,too-many-locals
+    team_a: type[StereoTanksBot],
+    team_b: type[StereoTanksBot],
+    ticks: int = 1000,
+    seed: int = 0,
+    grid_dimension: int = 20,
+    rules: SimulationRules = SimulationRules(),
+) -> GameResultModel:
+    """Plays a game between two bot classes and returns its result.
+
+    Each team has a light and a heavy tank, each driven by a new
+    instance of its bot class. The callbacks of the bots are called
+    like during a match, and `next_move` is called every tick
+    without a deadline. An exception raised by `next_move`
+    is logged and the tank passes.
+
+    Parameters
+    ----------
+    team_a: type[:class:`StereoTanksBot`]
+        The bot class of the first team.
+    team_b: type[:class:`StereoTanksBot`]
+        The bot class of the second team.
+    ticks: :class:`int`
+        The number of ticks of the game.
+    seed: :class:`int`
+        The seed of the map.
+    grid_dimension: :class:`int`
+        The dimension of the map.
+    rules: :class:`SimulationRules`
+        The rules of the game.
+    """
+    # pylint: disable=protected-access
+    tank_types = (TankType.LIGHT, TankType.HEAVY)
+    simulation = Simulation(
+        {team_a.__name__ + "-A": tank_types, team_b.__name__ + "-B": tank_types},
+        grid_dimension,
+        ticks,
+        seed,
+        rules,
+    )
+    bot_classes = (team_a, team_a, team_b, team_b)
+    bots = {pid: cls() for pid, cls in zip(simulation.player_ids, bot_classes)}
+    loop = asyncio.new_event_loop()
+
+    try:
+        for player_id, bot in bots.items():
+            lobby_data = simulation.lobby_data(player_id)
+            bot._lobby_data = lobby_data
+            _call(loop, bot.on_lobby_data_received(lobby_data))  # type: ignore[arg-type]
+        for bot in bots.values():
+            if bot.state_diff is not None:
+                bot.state_diff.reset()
+            _call(loop, bot.on_game_starting())
+
+        while not simulation.finished:
+            actions: dict[str, ResponseAction | None] = {}
+            for player_id, bot in bots.items():
+                game_state = simulation.game_state(player_id)
+                bot._deadline = None
+                bot._game_state_id = game_state.id
+                try:
+                    if bot.state_diff is not None:
+                        bot.state_diff.update(game_state)
+                    actions[player_id] = _call(loop, bot.next_move(game_state))
+                except Exception as e:  # pylint: disable=broad-except
+                    _logger.exception("An error occurred during next move: %s", e)
+            for player_id, warning in simulation.step(actions).items():
+                _call(loop, bots[player_id].on_warning_received(warning, None))
+
+        result = simulation.result()
+        for bot in bots.values():
+            _call(loop, bot.on_game_ended(result))  # type: ignore[arg-type]
+        return result
+    finally:
+        loop.close()
+
+
+def main() -> None:
+    """Plays games between two bots from the command line."""
+
+    parser = argparse.ArgumentParser(description="Play games between two bots")
+    parser.add_argument("team_a", help="The bot class of the first team, for example main:MyBot")
+    parser.add_argument("team_b", help="The bot class of the second team")
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=1,
+        help="Number of games, with a different map each (default: 1)",
+    )
+    parser.add_argument(
+        "--ticks",
+        type=int,
+        default=1000,
+        help="Number of ticks of each game (default: 1000)",
+    )
+    parser.add_argument(
+        "--grid-dimension",
+        type=int,
+        default=20,
+        help="Dimension of the map (default: 20)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the map of the first game (default: 0)",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+        default="WARNING",
+        help="Lowest level of the messages logged by the bots (default: WARNING)",
+    )
+    args = parser.parse_args()
+
+    setup_logging(args.log_level)
+    team_a = load_bot_class(args.team_a)
+    team_b = load_bot_class(args.team_b)
+    wins = [0, 0]
+    for game in range(args.games):
+        started = time.perf_counter()
+        result = play_match(team_a, team_b, args.ticks, args.seed + game, args.grid_dimension)
+        seconds = time.perf_counter() - started
+        scores = [team.score or 0 for team in result.teams]
+        if scores[0] != scores[1]:
+            wins[scores[1] > scores[0]] += 1
+        print(
+            f"Game {game + 1}: "
+            + ", ".join(f"{team.name} {team.score}" for team in result.teams)
+            + f" ({args.ticks / seconds:.0f} ticks/s)"
+        )
+    print(f"Wins: {team_a.__name__} {wins[0]}, {team_b.__name__} {wins[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+"""This module contains the diff engine for consecutive game states.
+
+The diff engine compares each game state with the previous one
+and emits typed change events. Bots can subscribe to these events
+to update their own data structures incrementally.
+
+Classes
+-------
+StateDiff
+    Compares consecutive game states and emits change events.
+StateChange
+    Base class for the change events.
+
+Examples
+--------
+Attach a diff engine to the bot and subscribe to the events.
+The library updates it with every game state before calling `next_move`.
+
+::
+
+    class MyBot(StereoTanksBot):
+
+        def __init__(self) -> None:
+            self.state_diff = StateDiff()
+            self.state_diff.subscribe(BulletSpawned, self.on_bullet_spawned)
+            self.state_diff.subscribe(TankMoved, self.on_tank_moved)
+
+        def on_bullet_spawned(self, event: BulletSpawned) -> None:
+            print(f"Bullet {event.id} spawned at {event.position}")
+
+        def on_tank_moved(self, event: TankMoved) -> None:
+            print(f"{event.owner_id} moved to {event.new_position}")
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+if TYPE_CHECKING:
+    from .enums import Direction, Orientation
+    from .models import BulletModel, GameStateModel, MineModel, TankModel
+    from .protocols import Bullet, GameState, Tank
+
+__all__ = (
+    "StateDiff",
+    "StateChange",
+    "TankAppeared",
+    "TankVanished",
+    "TankMoved",
+    "TankRotated",
+    "TankDamaged",
+    "TankHealed",
+    "BulletSpawned",
+    "BulletAdvanced",
+    "BulletVanished",
+    "MinePlaced",
+    "MineExploded",
+    "MineRemoved",
+    "LaserOn",
+    "LaserOff",
+    "ZoneShareChanged",
+)
+
+Position = tuple[int, int]
+
+
+@dataclass(slots=True, frozen=True)
+class StateChange:
+    """Base class for the change events.
+
+    Subscribing to this class receives all events.
+    """
+
+
+@dataclass(slots=True, frozen=True)
+class TankAppeared(StateChange):
+    """A tank has appeared on the map (it spawned or became visible)."""
+
+    owner_id: str
+    position: Position
+    tank: Tank
+
+
+@dataclass(slots=True, frozen=True)
+class TankVanished(StateChange):
+    """A tank has vanished from the map (it died or is no longer visible).
+
+    The `position` is the last known position of the tank.
+    """
+
+    owner_id: str
+    position: Position
+
+
+@dataclass(slots=True, frozen=True)
+class TankMoved(StateChange):
+    """A tank has moved to another tile."""
+
+    owner_id: str
+    old_position: Position
+    new_position: Position
+
+
+@dataclass(slots=True, frozen=True)
+class TankRotated(StateChange):
+    """A tank or its turret has rotated."""
+
+    owner_id: str
+    old_direction: Direction
+    new_direction: Direction
+    old_turret_direction: Direction
+    new_turret_direction: Direction
+
+
+@dataclass(slots=True, frozen=True)
+class TankDamaged(StateChange):
+    """The health of a tank has decreased.
+
+    Only emitted for tanks whose health is known (your team).
+    """
+
+    owner_id: str
+    old_health: int
+    new_health: int
+
+
+@dataclass(slots=True, frozen=True)
+class TankHealed(StateChange):
+    """The health of a tank has increased.
+
+    Only emitted for tanks whose health is known (your team).
+    """
+
+    owner_id: str
+    old_health: int
+    new_health: int
+
+
+@dataclass(slots=True, frozen=True)
+class BulletSpawned(StateChange):
+    """A bullet has appeared on the map."""
+
+    id: int
+    position: Position
+    bullet: Bullet
+
+
+@dataclass(slots=True, frozen=True)
+class BulletAdvanced(StateChange):
+    """A bullet has moved to another tile."""
+
+    id: int
+    old_position: Position
+    new_position: Position
+
+
+@dataclass(slots=True, frozen=True)
+class BulletVanished(StateChange):
+    """A bullet has vanished from the map.
+
+    The `position` is the last known position of the bullet.
+    """
+
+    id: int
+    position: Position
+
+
+@dataclass(slots=True, frozen=True)
+class MinePlaced(StateChange):
+    """A mine has appeared on the map."""
+
+    id: int
+    position: Position
+
+
+@dataclass(slots=True, frozen=True)
+class MineExploded(StateChange):
+    """A mine has exploded."""
+
+    id: int
+    position: Position
+
+
+@dataclass(slots=True, frozen=True)
+class MineRemoved(StateChange):
+    """A mine has vanished from the map."""
+
+    id: int
+    position: Position
+
+
+@dataclass(slots=True, frozen=True)
+class LaserOn(StateChange):
+    """A laser has been turned on.
+
+    The `positions` are all tiles covered by the laser.
+    """
+
+    id: int
+    orientation: Orientation
+    positions: tuple[Position, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class LaserOff(StateChange):
+    """A laser has been turned off."""
+
+    id: int
+    positions: tuple[Position, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class ZoneShareChanged(StateChange):
+    """The share of a team in a zone has changed.
+
+    The `old_share` is `None` if the team had no share before.
+    The `new_share` is `None` if the team has no share anymore.
+    """
+
+    zone_index: int
+    team: str
+    old_share: float | None
+    new_share: float | None
+
+
+@dataclass(slots=True)
+class _Snapshot:
+    """Represents the entities of a game state keyed by their identifiers."""
+
+    tanks: dict[str, tuple[Position, TankModel]]
+    bullets: dict[int, tuple[Position, BulletModel]]
+    mines: dict[int, tuple[Position, MineModel]]
+    lasers: dict[int, tuple[Orientation, tuple[Position, ...]]]
+    shares: dict[int, dict[str, float]]
+
+    @classmethod
+    def from_game_state(cls, game_state: GameStateModel) -> _Snapshot:
+        """Collects the entities of a game state from its entity index."""
+        index = game_state.map.index
+        positions = index.positions
+        lasers: dict[int, tuple[Orientation, list[Position]]] = {}
+        for x, y, laser in index.lasers:
+            lasers.setdefault(laser.id, (laser.orientation, []))[1].append((x, y))
+
+        return cls(
+            {o: (positions[o], t) for o, t in index.tanks.items()},
+            {b.id: ((x, y), b) for x, y, b in index.bullets},
+            {m.id: ((x, y), m) for x, y, m in index.mines},
+            {i: (o, tuple(p)) for i, (o, p) in lasers.items()},
+            {z.index: dict(z.shares) for z in game_state.map.zones},
+        )
+
+
+E = TypeVar("E", bound=StateChange)
+
+
+class StateDiff:
+    """Compares consecutive game states and emits change events.
+
+    The first game state is compared with an empty map,
+    so all its entities are reported as new.
+    """
+
+    def __init__(self) -> None:
+        self._previous: _Snapshot | None = None
+        self._subscribers: dict[type[StateChange], list[Callable[[StateChange], None]]] = {}
+        self._dispatch: dict[type[StateChange], list[Callable[[StateChange], None]]] = {}
+
+    def subscribe(self, event_type: type[E], callback: Callable[[E], None]) -> None:
+        """Subscribes a callback to the events of the given type.
+
+        Subscribing to a base class receives the events of all its subclasses.
+        """
+        self._subscribers.setdefault(event_type, []).append(callback)  # type: ignore[arg-type]
+        self._dispatch.clear()
+
+    def unsubscribe(self, event_type: type[E], callback: Callable[[E], None]) -> None:
+        """Unsubscribes a callback from the events of the given type."""
+        self._subscribers.get(event_type, []).remove(callback)  # type: ignore[arg-type]
+        self._dispatch.clear()
+
+    def reset(self) -> None:
+        """Forgets the previous game state, for example when a new game starts."""
+        self._previous = None
+
+    def update(self, game_state: GameState) -> list[StateChange]:
+        """Compares the game state with the previous one.
+
+        The events are passed to the subscribers and returned.
+        """
+        current = _Snapshot.from_game_state(game_state)  # type: ignore[arg-type]
+        previous = self._previous or _Snapshot({}, {}, {}, {}, {})
+        self._previous = current
+
+        events: list[StateChange] = []
+        self._diff_tanks(previous, current, events)
+        self._diff_bullets(previous, current, events)
+        self._diff_mines(previous, current, events)
+        self._diff_lasers(previous, current, events)
+        self._diff_shares(previous, current, events)
+
+        for event in events:
+            for callback in self._callbacks_for(type(event)):
+                callback(event)
+
+        return events
+
+    def _callbacks_for(
+        self, event_type: type[StateChange]
+    ) -> list[Callable[[StateChange], None]]:
+        callbacks = self._dispatch.get(event_type)
+        if callbacks is None:
+            callbacks = [
+                callback
+                for cls in event_type.__mro__
+                for callback in self._subscribers.get(cls, ())
+            ]
+            self._dispatch[event_type] = callbacks
+        return callbacks
+
+    @staticmethod
+    def _diff_tanks(
+        previous: _Snapshot, current: _Snapshot, events: list[StateChange]
+    ) -> None:
+        for owner_id, (position, tank) in current.tanks.items():
+            old = previous.tanks.get(owner_id)
+            if old is None:
+                events.append(TankAppeared(owner_id, position, tank))
+                continue
+
+            old_position, old_tank = old
+            if old_position != position:
+                events.append(TankMoved(owner_id, old_position, position))
+            if (
+                old_tank.direction != tank.direction
+                or old_tank.turret.direction != tank.turret.direction
+            ):
+                events.append(
+                    TankRotated(
+                        owner_id,
+                        old_tank.direction,
+                        tank.direction,
+                        old_tank.turret.direction,
+                        tank.turret.direction,
+                    )
+                )
+            if old_tank.health is not None and tank.health is not None:
+                if tank.health < old_tank.health:
+                    events.append(TankDamaged(owner_id, old_tank.health, tank.health))
+                elif tank.health > old_tank.health:
+                    events.append(TankHealed(owner_id, old_tank.health, tank.health))
+
+        for owner_id, (position, _) in previous.tanks.items():
+            if owner_id not in current.tanks:
+                events.append(TankVanished(owner_id, position))
+
+    @staticmethod
+    def _diff_bullets(
+        previous: _Snapshot, current: _Snapshot, events: list[StateChange]
+    ) -> None:
+        for bullet_id, (position, bullet) in current.bullets.items():
+            old = previous.bullets.get(bullet_id)
+            if old is None:
+                events.append(BulletSpawned(bullet_id, position, bullet))
+            elif old[0] != position:
+                events.append(BulletAdvanced(bullet_id, old[0], position))
+
+        for bullet_id, (position, _) in previous.bullets.items():
+            if bullet_id not in current.bullets:
+                events.append(BulletVanished(bullet_id, position))
+
+    @staticmethod
+    def _diff_mines(
+        previous: _Snapshot, current: _Snapshot, events: list[StateChange]
+    ) -> None:
+        for mine_id, (position, mine) in current.mines.items():
+            old = previous.mines.get(mine_id)
+            if old is None:
+                events.append(MinePlaced(mine_id, position))
+                if mine.exploded:
+                    events.append(MineExploded(mine_id, position))
+            elif mine.exploded and not old[1].exploded:
+                events.append(MineExploded(mine_id, position))
+
+        for mine_id, (position, _) in previous.mines.items():
+            if mine_id not in current.mines:
+                events.append(MineRemoved(mine_id, position))
+
+    @staticmethod
+    def _diff_lasers(
+        previous: _Snapshot, current: _Snapshot, events: list[StateChange]
+    ) -> None:
+        for laser_id, (orientation, positions) in current.lasers.items():
+            if laser_id not in previous.lasers:
+                events.append(LaserOn(laser_id, orientation, positions))
+
+        for laser_id, (_, positions) in previous.lasers.items():
+            if laser_id not in current.lasers:
+                events.append(LaserOff(laser_id, positions))
+
+    @staticmethod
+    def _diff_shares(
+        previous: _Snapshot, current: _Snapshot, events: list[StateChange]
+    ) -> None:
+        for zone_index, shares in current.shares.items():
+            old_shares = previous.shares.get(zone_index, {})
+            for team, share in shares.items():
+                old_share = old_shares.get(team)
+                if old_share != share:
+                    events.append(ZoneShareChanged(zone_index, team, old_share, share))
+            for team, old_share in old_shares.items():
+                if team not in shares:
+                    events.append(ZoneShareChanged(zone_index, team, old_share, None))
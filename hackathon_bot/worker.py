@@ -0,0 +1,227 @@
+"""This module contains the decision workers of the bot.
+
+A decision worker processes the game states one at a time,
+so the receive loop never waits for the decisions.
+The game states that arrive in the meantime wait in a mailbox.
+
+Classes
+-------
+DecisionWorker
+    Processes the submitted items on a long-lived thread.
+AsyncDecisionWorker
+    Processes the submitted items in a task on the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from .enums import MailboxPolicy
+
+__all__ = ("DecisionWorker", "AsyncDecisionWorker")
+
+_logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Mailbox(Generic[T]):
+    """Holds the items waiting for the worker according to the policy.
+
+    The functions passed to `call` wait in a separate queue,
+    which the policy does not apply to, and run before the next item.
+
+    Attributes
+    ----------
+    policy: :class:`MailboxPolicy`
+        The policy of the mailbox.
+    processed: :class:`int`
+        The number of processed items.
+    superseded: :class:`int`
+        The number of waiting items replaced by a newer one
+        (:attr:`MailboxPolicy.LATEST_WINS`).
+    dropped: :class:`int`
+        The number of items dropped because the worker was busy
+        (:attr:`MailboxPolicy.DROP_IF_BUSY`).
+    """
+
+    def __init__(self, policy: MailboxPolicy) -> None:
+        self.policy = policy
+        self.processed = 0
+        self.superseded = 0
+        self.dropped = 0
+        self._mailbox: deque[T] = deque()
+        self._calls: deque[Callable[[], None]] = deque()
+        self._busy = False
+
+    def reset_counters(self) -> None:
+        """Resets the counters, for example when a new game starts."""
+        self.processed = self.superseded = self.dropped = 0
+
+    def _offer(self, item: T) -> bool:
+        """Puts an item into the mailbox, returns whether it was accepted."""
+        if self.policy == MailboxPolicy.DROP_IF_BUSY:
+            if self._busy or self._mailbox:
+                self.dropped += 1
+                return False
+        elif self.policy == MailboxPolicy.LATEST_WINS and self._mailbox:
+            self.superseded += len(self._mailbox)
+            self._mailbox.clear()
+        self._mailbox.append(item)
+        return True
+
+    def _take_calls(self) -> list[Callable[[], None]]:
+        calls = list(self._calls)
+        self._calls.clear()
+        return calls
+
+
+def _run_calls(calls: list[Callable[[], None]]) -> None:
+    for call in calls:
+        try:
+            call()
+        except Exception:  # pylint: disable=broad-except
+            _logger.exception("The decision worker failed to run a call")
+
+
+class DecisionWorker(_Mailbox[T]):
+    """Processes the submitted items on a long-lived thread.
+
+    The items wait in a mailbox until the worker is free.
+    What happens to an item submitted while the worker is busy
+    depends on the :class:`MailboxPolicy`.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[T], None],
+        policy: MailboxPolicy = MailboxPolicy.LATEST_WINS,
+        name: str = "decision-worker",
+    ) -> None:
+        super().__init__(policy)
+        self._handler = handler
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        """Starts the worker thread."""
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stops the worker thread after the current item.
+
+        The waiting items are discarded.
+        """
+        with self._condition:
+            self._stopped = True
+            self._mailbox.clear()
+            self._condition.notify()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def submit(self, item: T) -> None:
+        """Puts an item into the mailbox according to the policy."""
+        with self._condition:
+            if self._offer(item):
+                self._condition.notify()
+
+    def call(self, function: Callable[[], None]) -> None:
+        """Runs the function on the worker thread before the next item."""
+        with self._condition:
+            self._calls.append(function)
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._mailbox and not self._calls and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                calls = self._take_calls()
+                has_item = bool(self._mailbox)
+                if has_item:
+                    item = self._mailbox.popleft()
+                    self._busy = True
+
+            _run_calls(calls)
+            if not has_item:
+                continue
+            try:
+                self._handler(item)
+            except Exception:  # pylint: disable=broad-except
+                _logger.exception("The decision worker failed to process an item")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self.processed += 1
+
+
+class AsyncDecisionWorker(_Mailbox[T]):
+    """Processes the submitted items in a task on the event loop.
+
+    It is used for the `async def` handlers, which then run
+    on the event loop without a thread. The mailbox works
+    the same as in :class:`DecisionWorker`.
+
+    The worker must be started and fed from the event loop.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[T], Awaitable[None]],
+        policy: MailboxPolicy = MailboxPolicy.LATEST_WINS,
+        name: str = "decision-worker",
+    ) -> None:
+        super().__init__(policy)
+        self._handler = handler
+        self._name = name
+        self._event = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Starts the worker task."""
+        self._task = asyncio.get_running_loop().create_task(self._run(), name=self._name)
+
+    def stop(self, timeout: float | None = None) -> None:  # pylint: disable=unused-argument
+        """Cancels the worker task.
+
+        The waiting items are discarded.
+        """
+        self._mailbox.clear()
+        if self._task is not None:
+            self._task.cancel()
+
+    def submit(self, item: T) -> None:
+        """Puts an item into the mailbox according to the policy."""
+        if self._offer(item):
+            self._event.set()
+
+    def call(self, function: Callable[[], None]) -> None:
+        """Runs the function in the worker task before the next item."""
+        self._calls.append(function)
+        self._event.set()
+
+    async def _run(self) -> None:
+        while True:
+            while not self._mailbox and not self._calls:
+                self._event.clear()
+                await self._event.wait()
+            _run_calls(self._take_calls())
+            if not self._mailbox:
+                continue
+            item = self._mailbox.popleft()
+            self._busy = True
+
+            try:
+                await self._handler(item)
+            except Exception:  # pylint: disable=broad-except
+                _logger.exception("The decision worker failed to process an item")
+            finally:
+                self._busy = False
+                self.processed += 1
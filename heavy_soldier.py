@@ -65,7 +65,7 @@ class HeavySoldier(Soldier):
                             tile = game_state.map.tiles[pos_y][pos_x]
                             
                             # Check if tile is empty (no walls)
-                            if not any(isinstance(entity, Wall) for entity in tile.entities):
+                            if not tile.has_wall:
                                 strategy.where_to_escape = (pos_x, pos_y)
                                 
                                 return GoTo(pos_x, pos_y, penalties=strategy.get_penalties())
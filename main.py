@@ -33,14 +33,9 @@ class MyBot(StereoTanksBot):
                 raise ValueError(f"Unknown tank type: {found_type}")
             
         if not self.teammate_found:
-            team = next(
-            t
-            for t in game_state.teams
-            if any(map(lambda x: x.id == game_state.my_id, t.players))
-            )
-            teammate = next((p for p in team.players if p.id != game_state.my_id), None)
-            if teammate is not None:
-                self.my_teammate_id = teammate.id
+            teammate_id = game_state.teammate_id
+            if teammate_id is not None:
+                self.my_teammate_id = teammate_id
                 self.teammate_found = True
             
         # Find my tank on the map, if dead return Pass
@@ -112,30 +107,20 @@ class MyBot(StereoTanksBot):
     def on_warning_received(
         self, warning: WarningType, message: str | None
     ) -> None: 
-        print(f"Warning received: {warning} - {message}")
+        self.logger.warning("Warning received: %s - %s", warning, message)
         return None
 
-    def _find_my_tank(self, game_state: GameState) -> Tank | None:  # from example.py
-        for row in game_state.map.tiles:
-            for tile in row:
-                if tile.entities:
-                    entity = tile.entities[0]
-                    if isinstance(entity, Tank) and entity.owner_id == game_state.my_id:
-                        return entity
-        return None
+    def _find_my_tank(self, game_state: GameState) -> Tank | None:
+        return game_state.my_tank
     
     # FIRST FOUND ENEMY FROM TOP LEFT - MAYBE WE NEED CLOSEST TO ZONE?
     def _find_enemy(self, game_state: GameState) -> tuple[int, int] | None:
-        for y in range(20):
-            for x in range(20):
-                for entity in game_state.map.tiles[y][x].entities:
-                    if isinstance(entity, Tank) and entity.owner_id != game_state.my_id and self.teammate_found and entity.owner_id != self.my_teammate_id:
-                        return (x, y)
+        for owner_id in game_state.tank_by_owner:
+            if owner_id != game_state.my_id and self.teammate_found and owner_id != self.my_teammate_id:
+                return game_state.position_of(owner_id)
         return None
     
     def _find_friendly_soldiers_in_zone(self, game_state: GameState) -> tuple[TankType]:
-        y_zone: int = game_state.map.zones[0].y
-        x_zone: int = game_state.map.zones[0].x
         zone_height: int = game_state.map.zones[0].height
         zone_width: int = game_state.map.zones[0].width
         
@@ -144,13 +129,12 @@ class MyBot(StereoTanksBot):
 
         friendly_soldiers: list[TankType] = []
 
-        for y in range(y_zone, y_zone + zone_height):
-            for x in range(x_zone, x_zone + zone_width):
-                tile = game_state.map.tiles[y][x]
-                if tile.entities:
-                    entity = tile.entities[0]
-                    if isinstance(entity, Tank) and (entity.owner_id == game_state.my_id or (self.teammate_found and entity.owner_id == self.my_teammate_id)):
-                        friendly_soldiers.append(entity.type)
+        for x, y in game_state.map.zone_tiles(0):
+            tile = game_state.map.tiles[y][x]
+            if tile.entities:
+                entity = tile.entities[0]
+                if isinstance(entity, Tank) and (entity.owner_id == game_state.my_id or (self.teammate_found and entity.owner_id == self.my_teammate_id)):
+                    friendly_soldiers.append(entity.type)
 
         return tuple(friendly_soldiers)
     
@@ -197,21 +181,10 @@ class MyBot(StereoTanksBot):
         my_coords: tuple[int, int] | None = self._find_my_coordinates(game_state)
         if my_coords is None:
             return False
-        if (my_coords[0] >= game_state.map.zones[0].x
-             and my_coords[0] < game_state.map.zones[0].x + game_state.map.zones[0].width
-             and my_coords[1] >= game_state.map.zones[0].y
-             and my_coords[1] < game_state.map.zones[0].y + game_state.map.zones[0].height):
-            return True
+        return game_state.map.in_zone(*my_coords)
     
     def _find_my_coordinates(self, game_state: GameState) -> tuple[int, int] | None:
-        for y_coord, row in enumerate(game_state.map.tiles):
-            for x_coord, tile in enumerate(row):
-                if tile.entities:
-                    entity = tile.entities[0]
-                    if isinstance(entity, Tank) and entity.owner_id == game_state.my_id:
-                        return (x_coord, y_coord) 
-                    
-        return None
+        return game_state.position_of(game_state.my_id)
 
 if __name__ == "__main__":
     bot = MyBot()
@@ -2,48 +2,23 @@ from typing import Tuple
 from hackathon_bot import *
 from strategy import Strategy
 import random 
+
+logger = get_logger("bot.soldier")
+
 class Soldier:
     def _find_my_coordinates(self, game_state: GameState) -> tuple[int, int] | None:
-        for y_coord, row in enumerate(game_state.map.tiles):
-            for x_coord, tile in enumerate(row):
-                if tile.entities:
-                    entity = tile.entities[0]
-                    if isinstance(entity, Tank) and entity.owner_id == game_state.my_id:
-                        return (x_coord, y_coord) 
-                    
-        return None
+        return game_state.position_of(game_state.my_id)
     
     def _find_my_tank(self, game_state: GameState) -> Tank | None:
         """Finds the agent in the game state."""
-        for row in game_state.map.tiles:
-            for tile in row:
-                if tile.entities:
-                    entity = tile.entities[0]
-                    if isinstance(entity, Tank) and entity.owner_id == game_state.my_id:
-                        return entity
-        return None
+        return game_state.my_tank
     
     def _find_teammate_tank(self, game_state: GameState) -> Tank | None:
         """Finds the agent in the game state."""
-
-        team = next(
-            t
-            for t in game_state.teams
-            if any(map(lambda x: x.id == game_state.my_id, t.players))
-        )
-
-        teammate = next((p for p in team.players if p.id != game_state.my_id), None)
-
-        if teammate is None:
+        teammate_id = game_state.teammate_id
+        if teammate_id is None:
             return None
-
-        for row in game_state.map.tiles:
-            for tile in row:
-                if tile.entities:
-                    entity = tile.entities[0]
-                    if isinstance(entity, Tank) and entity.owner_id == teammate.id:
-                        return entity
-        return None
+        return game_state.tank_by_owner.get(teammate_id)
 
     def go_to_zone(self, game_state: GameState, strategy: Strategy) -> ResponseAction:
         """ Goes to the nearest unoccupied tile in the zone to the given position using Manhattan distance.
@@ -52,7 +27,7 @@ class Soldier:
 
         maybe_coords = self._find_my_coordinates(game_state)
         if maybe_coords is None:
-            print("Tank not found ?!?")
+            logger.warning("Tank not found ?!?")
             return Pass()
         x: int = maybe_coords[0]
         y: int = maybe_coords[1] 
@@ -159,17 +134,13 @@ class Soldier:
         my_coords: tuple[int, int] | None = self._find_my_coordinates(game_state)
         if my_coords is None:
             return False
-        if (my_coords[0] >= game_state.map.zones[0].x
-             and my_coords[0] < game_state.map.zones[0].x + game_state.map.zones[0].width
-             and my_coords[1] >= game_state.map.zones[0].y
-             and my_coords[1] < game_state.map.zones[0].y + game_state.map.zones[0].height):
-            return True
+        return game_state.map.in_zone(*my_coords)
     
     def defend_area(self, game_state: GameState, strategy: Strategy) -> ResponseAction:
         """Defends the area by first going to it and then randomly moving to a non-wall tile within it."""
         maybe_coords = self._find_my_coordinates(game_state)
         if maybe_coords is None:
-            print("Tank not found ?!?")
+            logger.warning("Tank not found ?!?")
             return Pass()
         x: int = maybe_coords[0]
         y: int = maybe_coords[1] 
@@ -203,12 +174,7 @@ class Soldier:
                     if 0 <= tile_x_in_area < grid_dim_x and 0 <= tile_y_in_area < grid_dim_y:
                         tile = game_state.map.tiles[tile_y_in_area][tile_x_in_area]
                         
-                        is_wall_tile = False
-                        if tile.entities:
-                            for entity in tile.entities:
-                                if isinstance(entity, Wall):
-                                    is_wall_tile = True
-                                    break
+                        is_wall_tile = tile.has_wall
                         # If it's not a wall, and we're not on it already add it
                         if not is_wall_tile and (tile_x_in_area != x or tile_y_in_area != y):
                             non_wall_tiles_in_area.append((tile_x_in_area, tile_y_in_area))
@@ -0,0 +1,97 @@
+# pylint: disable=missing-function-docstring,protected-access
+"""Tests of the recording and the reading of matches."""
+
+import os
+
+import pytest
+
+from hackathon_bot.enums import FrameDirection, PacketType
+from hackathon_bot.recorder import _FOOTER, MatchReader, MatchRecorder
+
+_STARTING = f'{{"type":{PacketType.GAME_STARTING}}}'
+
+
+def _game_state(tick: int) -> str:
+    return f'{{"type":{PacketType.GAME_STATE},"payload":{{"tick":{tick}}}}}'
+
+
+def _record(
+    path: str, games: int = 1, ticks: int = 5
+) -> list[tuple[FrameDirection, str]]:
+    """Records the games and returns the (direction, frame) recorded."""
+    frames: list[tuple[FrameDirection, str]] = []
+    for _ in range(games):
+        frames.append((FrameDirection.RECEIVED, _STARTING))
+        for tick in range(ticks):
+            frames.append((FrameDirection.RECEIVED, _game_state(tick)))
+            frames.append((FrameDirection.SENT, f'{{"type":0,"tick":{tick}}}'))
+
+    # Small segments, so the frames are split between several of them
+    recorder = MatchRecorder(path, segment_size=64)
+    recorder.start()
+    for timestamp, (direction, frame) in enumerate(frames):
+        if direction == FrameDirection.RECEIVED:
+            recorder.record_received(frame, float(timestamp))
+        else:
+            recorder.record_sent(frame, float(timestamp))
+    recorder.close()
+    return frames
+
+
+def test_frames_round_trip(tmp_path) -> None:
+    path = str(tmp_path / "match.rec")
+    frames = _record(path)
+
+    with MatchReader(path) as reader:
+        read = list(reader)
+
+    assert [(f.direction, f.data.decode()) for f in read] == frames
+    assert [f.timestamp for f in read] == [float(i) for i in range(len(frames))]
+
+
+def test_frames_start_at_the_game_state_of_a_tick(tmp_path) -> None:
+    path = str(tmp_path / "match.rec")
+    _record(path)
+
+    with MatchReader(path) as reader:
+        assert reader.ticks == [(0, tick) for tick in range(5)]
+        first = next(reader.frames(from_tick=3))
+        assert list(reader.frames(from_tick=5)) == []
+
+    assert first.data.decode() == _game_state(3)
+
+
+def test_games_are_indexed_separately(tmp_path) -> None:
+    path = str(tmp_path / "match.rec")
+    _record(path, games=2, ticks=3)
+
+    with MatchReader(path) as reader:
+        assert reader.ticks == [(game, tick) for game in range(2) for tick in range(3)]
+        frames = list(reader.frames(from_tick=1, game=1))
+
+    assert frames[0].data.decode() == _game_state(1)
+    assert len(frames) == 4
+
+
+@pytest.mark.parametrize("cut", [_FOOTER.size, 1])
+def test_index_is_rebuilt_without_the_footer(tmp_path, cut: int) -> None:
+    path = str(tmp_path / "match.rec")
+    _record(path, games=2, ticks=3)
+    with MatchReader(path) as reader:
+        ticks = reader.ticks
+        expected = list(reader.frames(from_tick=1, game=1))
+
+    with open(path, "rb+") as file:
+        file.truncate(os.path.getsize(path) - cut)
+
+    with MatchReader(path) as reader:
+        assert reader.ticks == ticks
+        assert list(reader.frames(from_tick=1, game=1)) == expected
+
+
+@pytest.mark.parametrize("data", [b"", b"STREC", b"STRECORD" + bytes(32)])
+def test_invalid_recording_raises_value_error(tmp_path, data: bytes) -> None:
+    path = tmp_path / "match.rec"
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        MatchReader(str(path))
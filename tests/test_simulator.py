@@ -0,0 +1,109 @@
+# pylint: disable=missing-function-docstring,protected-access
+"""Tests of the rules of the headless simulator."""
+
+from hackathon_bot.actions import AbilityUse, Movement
+from hackathon_bot.enums import Ability, MovementDirection, TankType, WallType
+from hackathon_bot.models import TurretModel
+from hackathon_bot.simulator import Simulation, SimulationRules
+
+_RULES = SimulationRules(wall_density=0.0)
+
+
+def _simulation(rules: SimulationRules = _RULES) -> Simulation:
+    # A-0 starts at (1, 1) facing down, B-0 at (8, 8) facing up
+    return Simulation({"A": [TankType.LIGHT], "B": [TankType.HEAVY]}, 10, rules=rules)
+
+
+def _forward(simulation: Simulation, player_id: str = "A-0") -> None:
+    simulation.step({player_id: Movement(MovementDirection.FORWARD)})
+
+
+def _position(simulation: Simulation, player_id: str = "A-0") -> tuple[int, int] | None:
+    return simulation.game_state(player_id).position_of(player_id)
+
+
+def _turret(simulation: Simulation, player_id: str = "A-0") -> TurretModel:
+    tank = simulation.game_state(player_id).my_tank
+    assert tank is not None
+    return tank.turret
+
+
+def test_tank_moves_forward_and_backward() -> None:
+    simulation = _simulation()
+    _forward(simulation)
+    assert _position(simulation) == (1, 2)
+    simulation.step({"A-0": Movement(MovementDirection.BACKWARD)})
+    assert _position(simulation) == (1, 1)
+
+
+def test_tank_is_stopped_by_a_wall() -> None:
+    simulation = _simulation()
+    simulation._walls[2 * 10 + 1] = WallType.SOLID
+    _forward(simulation)
+    assert _position(simulation) == (1, 1)
+
+
+def test_tank_is_stopped_by_the_edge_of_the_map() -> None:
+    simulation = _simulation()
+    simulation.step({"A-0": Movement(MovementDirection.BACKWARD)})
+    assert _position(simulation) == (1, 0)
+    simulation.step({"A-0": Movement(MovementDirection.BACKWARD)})
+    assert _position(simulation) == (1, 0)
+
+
+def test_tank_is_stopped_by_another_tank() -> None:
+    simulation = _simulation()
+    other = simulation._players["B-0"].tank
+    assert other is not None
+    other.x, other.y = 1, 2
+    _forward(simulation)
+    assert _position(simulation) == (1, 1)
+    assert _position(simulation, "B-0") == (1, 2)
+
+
+def test_bullet_regenerates_after_firing_from_a_full_turret() -> None:
+    rules = SimulationRules(wall_density=0.0, max_bullets=3, bullet_regen_ticks=4)
+    simulation = _simulation(rules)
+    simulation.step({"A-0": AbilityUse(Ability.FIRE_BULLET)})
+
+    turret = _turret(simulation)
+    assert turret.bullet_count == 2
+    assert turret.ticks_to_bullet == 3
+
+    for _ in range(3):
+        simulation.step({})
+    turret = _turret(simulation)
+    assert turret.bullet_count == 3
+    assert turret.ticks_to_bullet is None
+
+
+def test_bullet_regeneration_is_not_restarted_by_the_next_bullet() -> None:
+    rules = SimulationRules(wall_density=0.0, max_bullets=3, bullet_regen_ticks=4)
+    simulation = _simulation(rules)
+    simulation.step({"A-0": AbilityUse(Ability.FIRE_BULLET)})
+    simulation.step({"A-0": AbilityUse(Ability.FIRE_BULLET)})
+
+    turret = _turret(simulation)
+    assert turret.bullet_count == 1
+    assert turret.ticks_to_bullet == 2
+
+
+def test_game_state_changed_by_a_bot_does_not_leak_to_another() -> None:
+    simulation = Simulation({"A": [TankType.LIGHT], "B": [TankType.HEAVY]}, 10, seed=3)
+    walls = len(simulation._wall_entries)
+
+    changed = simulation.game_state("A-0")
+    for row in changed.map.tiles:
+        for tile in row:
+            if isinstance(tile.entities, list):
+                tile.entities.clear()
+    for zone in changed.map.zones:
+        zone.shares.clear()
+
+    # The game states of the same tick are built from the same frame
+    for player_id, position in (("A-0", (1, 1)), ("B-0", (8, 8))):
+        game_state = simulation.game_state(player_id)
+        tiles = [tile for row in game_state.map.tiles for tile in row]
+        assert sum(tile.wall is not None for tile in tiles) == walls
+        assert game_state.position_of(player_id) == position
+        assert all(zone.shares for zone in game_state.map.zones)